@@ -0,0 +1,239 @@
+"""
+Schema driven codec for the classes packed with `Encoder` and unpacked with `Decoder`.
+
+A class declares its fields once:
+
+    class UsageAccumulator(object):
+        codec = StructCodec([
+            ('last_ordinal', U32),
+            ('value_ex', U64),
+            ('consumed', U64),
+        ])
+
+        def pack(self, enc: Encoder) -> int:
+            return self.codec.pack(enc, self)
+
+        @classmethod
+        def unpack(cls, dec: Decoder):
+            return cls(*cls.codec.unpack(dec))
+
+Consecutive fixed width fields, including the fields of nested fixed width structs, are packed and
+unpacked with one precompiled `struct.Struct`. The pack and unpack functions are generated once
+per class.
+"""
+import struct
+import typing
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import names
+from .packer import Decoder, Encoder
+from .types import (F128, I8, I16, I32, I64, U8, U16, U32, U64, U128, U256, Checksum256, Name,
+                    PublicKey, Signature, TimePointSec)
+
+class FixedType(object):
+    """
+    A fixed width type, `fmt` is a `struct` format, `encode` converts a value to the packed
+    value and `decode` converts it back.
+    """
+    def __init__(self, fmt: str, encode: Optional[Callable] = None, decode: Optional[Callable] = None):
+        self.fmt = fmt
+        self.encode = encode
+        self.decode = decode
+
+def raw_bytes(value) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return value
+    return value.raw
+
+fixed_types: Dict[Any, FixedType] = {
+    bool: FixedType('?'),
+    float: FixedType('d'),
+    I8: FixedType('b'),
+    U8: FixedType('B'),
+    I16: FixedType('h'),
+    U16: FixedType('H'),
+    I32: FixedType('i'),
+    U32: FixedType('I'),
+    I64: FixedType('q'),
+    U64: FixedType('Q'),
+    TimePointSec: FixedType('I'),
+    U128: FixedType('16s', lambda n: n.to_bytes(16, 'little'), lambda raw: int.from_bytes(raw, 'little')),
+    U256: FixedType('32s', lambda n: n.to_bytes(32, 'little'), lambda raw: int.from_bytes(raw, 'little')),
+    Name: FixedType('Q', names.s2n, names.n2s),
+    F128: FixedType('16s', raw_bytes, F128),
+    Checksum256: FixedType('32s', raw_bytes, Checksum256),
+    PublicKey: FixedType('34s', raw_bytes, PublicKey),
+    Signature: FixedType('66s', raw_bytes, Signature),
+}
+
+def register_fixed_type(tp, fmt: str, encode: Optional[Callable] = None, decode: Optional[Callable] = None):
+    fixed_types[tp] = FixedType(fmt, encode, decode)
+
+def pack_string(enc: Encoder, value: str):
+    enc.pack_string(value)
+
+def unpack_string(dec: Decoder):
+    return dec.unpack_string()
+
+def pack_bytes(enc: Encoder, value: bytes):
+    enc.pack_bytes(value)
+
+def unpack_bytes(dec: Decoder):
+    return dec.unpack_bytes()
+
+def pack_object(enc: Encoder, value):
+    value.pack(enc)
+
+class StructCodec(object):
+    """
+    Packs and unpacks the fields of a class in declaration order.
+
+    `prefix` are fields that are unpacked before `fields` but not packed, e.g. the table id of
+    the objects read from the chain database. `unpack` returns the values of `prefix` and `fields`
+    as a list, in order.
+    """
+    def __init__(self, fields: Sequence[Tuple[str, Any]], prefix: Sequence[Tuple[str, Any]] = ()):
+        self.fields = list(fields)
+        self.prefix = list(prefix)
+        self.structs: List[struct.Struct] = []
+        self.namespace: Dict[str, Any] = {}
+        self.pack = self.compile_pack()
+        self.unpack = self.compile_unpack()
+
+    @property
+    def fixed_size(self) -> Optional[int]:
+        """
+        The packed size if all fields are fixed width, otherwise None.
+        """
+        if self.prefix:
+            return None
+        size = 0
+        for _, tp in self.fields:
+            fmt = self.fixed_format(tp)
+            if fmt is None:
+                return None
+            size += struct.calcsize('<' + fmt)
+        return size
+
+    def fixed_format(self, tp) -> Optional[str]:
+        if tp in fixed_types:
+            return fixed_types[tp].fmt
+        if isinstance(tp, FixedType):
+            return tp.fmt
+        codec = getattr(tp, 'codec', None)
+        if isinstance(codec, StructCodec) and codec.fixed_size is not None:
+            return ''.join(codec.fixed_format(t) for _, t in codec.fields)
+        return None
+
+    def add_name(self, prefix: str, value) -> str:
+        name = f'{prefix}{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def flatten(self, expr: str, tp) -> List[Tuple[str, str]]:
+        """
+        Returns (format, pack expression) of the fixed width values of `expr`.
+        """
+        if tp in fixed_types or isinstance(tp, FixedType):
+            fixed = fixed_types[tp] if tp in fixed_types else tp
+            if fixed.encode:
+                return [(fixed.fmt, f'{self.add_name("e", fixed.encode)}({expr})')]
+            return [(fixed.fmt, expr)]
+        ret = []
+        for name, field_tp in tp.codec.fields:
+            ret.extend(self.flatten(f'{expr}.{name}', field_tp))
+        return ret
+
+    def build(self, values: List[str], tp) -> str:
+        """
+        Returns the expression that converts the unpacked values to a value of `tp`,
+        the consumed values are removed from `values`.
+        """
+        if tp in fixed_types or isinstance(tp, FixedType):
+            fixed = fixed_types[tp] if tp in fixed_types else tp
+            value = values.pop(0)
+            if fixed.decode:
+                return f'{self.add_name("d", fixed.decode)}({value})'
+            return value
+        args = [self.build(values, field_tp) for _, field_tp in tp.codec.fields]
+        return f'{self.add_name("c", tp)}({", ".join(args)})'
+
+    def segments(self, fields):
+        """
+        Groups consecutive fixed width fields, yields ('fixed', [(name, type), ...]) and ('var', (name, type)).
+        """
+        run = []
+        for name, tp in fields:
+            if self.fixed_format(tp) is not None:
+                run.append((name, tp))
+                continue
+            if run:
+                yield 'fixed', run
+                run = []
+            yield 'var', (name, tp)
+        if run:
+            yield 'fixed', run
+
+    def var_functions(self, tp):
+        if tp is str:
+            return pack_string, unpack_string
+        if tp is bytes:
+            return pack_bytes, unpack_bytes
+        if typing.get_origin(tp) in (list, List):
+            item_tp = typing.get_args(tp)[0]
+            return (lambda enc, value: enc.pack_list(value)), (lambda dec: dec.unpack_list(item_tp))
+        if hasattr(tp, 'pack') and hasattr(tp, 'unpack'):
+            return pack_object, tp.unpack
+        raise TypeError(f'unsupported field type: {tp}')
+
+    def new_struct(self, fmt: str) -> str:
+        st = struct.Struct('<' + fmt)
+        self.structs.append(st)
+        return self.add_name('s', st)
+
+    def compile(self, name: str, lines: List[str]) -> Callable:
+        source = '\n'.join(lines)
+        exec(source, self.namespace)
+        return self.namespace[name]
+
+    def compile_pack(self) -> Callable:
+        lines = ['def pack(enc, obj):', '    pos = enc.pos']
+        for kind, item in self.segments(self.fields):
+            if kind == 'fixed':
+                values = []
+                for name, tp in item:
+                    values.extend(self.flatten(f'obj.{name}', tp))
+                st = self.new_struct(''.join(fmt for fmt, _ in values))
+                lines.append(f'    enc.pack_struct({st}, {", ".join(expr for _, expr in values)})')
+            else:
+                name, tp = item
+                pack_fn, _ = self.var_functions(tp)
+                lines.append(f'    {self.add_name("p", pack_fn)}(enc, obj.{name})')
+        lines.append('    return enc.pos - pos')
+        return self.compile('pack', lines)
+
+    def compile_unpack(self) -> Callable:
+        lines = ['def unpack(dec):']
+        results = []
+        var_count = 0
+        for kind, item in self.segments(self.prefix + self.fields):
+            if kind == 'fixed':
+                fmt = ''.join(self.fixed_format(tp) for _, tp in item)
+                st = self.new_struct(fmt)
+                values = [f'v{var_count + i}' for i in range(len(self.structs[-1].unpack(bytes(self.structs[-1].size))))]
+                var_count += len(values)
+                if len(values) == 1:
+                    lines.append(f'    {values[0]}, = dec.unpack_struct({st})')
+                else:
+                    lines.append(f'    {", ".join(values)} = dec.unpack_struct({st})')
+                for _, tp in item:
+                    results.append(self.build(values, tp))
+            else:
+                name, tp = item
+                _, unpack_fn = self.var_functions(tp)
+                value = f'v{var_count}'
+                var_count += 1
+                lines.append(f'    {value} = {self.add_name("u", unpack_fn)}(dec)')
+                results.append(value)
+        lines.append(f'    return [{", ".join(results)}]')
+        return self.compile('unpack', lines)
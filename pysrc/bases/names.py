@@ -0,0 +1,127 @@
+"""
+Cached and bulk conversion of EOSIO names.
+
+`n2s`, `s2n`, `b2s` and `s2b` have the signatures of the functions in `eos`, the results of the
+hottest names are kept in an LRU cache and the strings are interned, so decoding the same accounts
+over and over does not call into the chain library again.
+
+`n2s_array` and `s2n_array` convert many names in one call, with numpy the names are encoded and
+decoded with vectorized bit operations over a uint64 array, each distinct name is converted once:
+
+    owners = ResourceUsageObjectIndex(db).scan_columns(['owner'])['owner']
+    names = n2s_array(owners)
+
+numpy is optional, without it the bulk functions convert the names one by one through the cache.
+"""
+import functools
+import sys
+from typing import List, Sequence, Union
+
+from .. import eos
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NAME_CACHE_SIZE = 64 * 1024
+
+NAME_CHARS = b'.12345abcdefghijklmnopqrstuvwxyz'
+MAX_NAME_LENGTH = 13
+
+@functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+def n2s(n: int) -> str:
+    '''
+    Convert int to a EOSIO name
+    '''
+    return sys.intern(eos.n2s(n))
+
+@functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+def s2n(s: str) -> int:
+    '''
+    Convert a EOSIO name to uint64_t, raises Exception if the name is invalid
+    '''
+    return eos.s2n(s)
+
+def b2s(b: bytes) -> str:
+    return n2s(int.from_bytes(b, 'little'))
+
+def s2b(s: str) -> bytes:
+    return int.to_bytes(s2n(s), 8, 'little')
+
+def clear_cache():
+    n2s.cache_clear()
+    s2n.cache_clear()
+
+if np is not None:
+    # character of each 5 bits value
+    _char_table = np.frombuffer(NAME_CHARS, dtype=np.uint8)
+    # 5 bits value of each character, 0xff for invalid characters
+    _value_table = np.full(256, 0xff, dtype=np.uint8)
+    _value_table[_char_table] = np.arange(len(NAME_CHARS), dtype=np.uint8)
+
+def _n2s_vectorized(values: 'np.ndarray') -> List[str]:
+    chars = np.empty((len(values), MAX_NAME_LENGTH), dtype=np.uint8)
+    # the last character has 4 bits, the others 5 bits from the highest bits
+    chars[:, 12] = _char_table[values & np.uint64(0x0f)]
+    tmp = values >> np.uint64(4)
+    for i in range(11, -1, -1):
+        chars[:, i] = _char_table[tmp & np.uint64(0x1f)]
+        tmp = tmp >> np.uint64(5)
+    raw = chars.view(f'S{MAX_NAME_LENGTH}').ravel()
+    return [sys.intern(s.decode().rstrip('.')) for s in raw.tolist()]
+
+def n2s_array(values: Union['np.ndarray', Sequence[int]]) -> List[str]:
+    """
+    Converts a uint64 array or a sequence of ints to a list of names.
+    """
+    if np is None:
+        return [n2s(n) for n in values]
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return []
+    unique, inverse = np.unique(values, return_inverse=True)
+    names = _n2s_vectorized(unique)
+    return [names[i] for i in inverse.ravel().tolist()]
+
+def _s2n_vectorized(names: Sequence[str]) -> 'np.ndarray':
+    try:
+        raw = np.array([s.encode('ascii') for s in names], dtype=f'S{MAX_NAME_LENGTH + 1}')
+    except UnicodeEncodeError as e:
+        raise Exception(f'invalid name: {e}')
+    chars = raw.view(np.uint8).reshape(len(names), MAX_NAME_LENGTH + 1)
+    lengths = np.char.str_len(raw)
+    # the padding of shorter names is zero
+    in_name = np.arange(MAX_NAME_LENGTH + 1) < lengths[:, None]
+    values = np.where(in_name, _value_table[chars], 0)
+    invalid = (lengths > MAX_NAME_LENGTH) | (values == 0xff).any(axis=1)
+    # the last character has only 4 bits
+    invalid |= values[:, MAX_NAME_LENGTH - 1] > 0x0f
+    # a name with trailing dots is the same name without them
+    last = np.where(lengths > 0, lengths - 1, 0)
+    invalid |= (lengths > 0) & (chars[np.arange(len(names)), last] == ord('.'))
+    if invalid.any():
+        raise Exception(f'invalid name: {names[int(np.argmax(invalid))]!r}')
+
+    values = values.astype(np.uint64)
+    ret = np.zeros(len(names), dtype=np.uint64)
+    for i in range(MAX_NAME_LENGTH - 1):
+        ret |= values[:, i] << np.uint64(64 - 5 * (i + 1))
+    ret |= values[:, MAX_NAME_LENGTH - 1]
+    return ret
+
+def s2n_array(names: Sequence[str]) -> Union['np.ndarray', List[int]]:
+    """
+    Converts a sequence of names to a uint64 array, or to a list of ints without numpy.
+    Raises Exception if a name is invalid.
+    """
+    if np is None:
+        return [s2n(s) for s in names]
+    if not len(names):
+        return np.zeros(0, dtype=np.uint64)
+    unique = {}
+    for s in names:
+        if s not in unique:
+            unique[s] = len(unique)
+    values = _s2n_vectorized(list(unique))
+    return values[[unique[s] for s in names]]
@@ -1,7 +1,7 @@
 import struct
 from typing import Any, List, Type, Union
 
-from .. import eos
+from . import names
 from .types import (I16, I64, U8, U16, U32, U64, U128, U256, Checksum256, Name,
                     PublicKey)
 
@@ -51,13 +51,28 @@ class Packer(object):
 
 class Encoder(object):
 
-    def __init__(self):
-        self.data = []
+    def __init__(self, size: int = 256):
+        # preallocated buffer, grows by doubling, only the first `pos` bytes are valid
+        self.data = bytearray(size)
         self.pos = 0
 
+    def reserve(self, size: int):
+        end = self.pos + size
+        if end > len(self.data):
+            self.data.extend(bytes(max(end - len(self.data), len(self.data))))
+
     def write_bytes(self, raw: bytes):
-        self.data.append(raw)
-        self.pos += len(raw)
+        end = self.pos + len(raw)
+        if end > len(self.data):
+            self.reserve(len(raw))
+        self.data[self.pos:end] = raw
+        self.pos = end
+
+    def pack_struct(self, st: struct.Struct, *values) -> int:
+        self.reserve(st.size)
+        st.pack_into(self.data, self.pos, *values)
+        self.pos += st.size
+        return st.size
 
     def pack(self, obj: Any) -> int:
         return obj.pack(self)
@@ -129,7 +144,7 @@ class Encoder(object):
 
     def pack_name(self, s: Union[str, Name]):
         if isinstance(s, str):
-            raw = eos.s2b(s)
+            raw = names.s2b(s)
         else:
             raw = s.to_bytes()
         self.write_bytes(raw)
@@ -194,7 +209,7 @@ class Encoder(object):
         return self.pos
 
     def get_bytes(self):
-        return b''.join(self.data)
+        return bytes(memoryview(self.data)[:self.pos])
 
 class Decoder(object):
     def __init__(self, raw_data: bytes):
@@ -210,9 +225,14 @@ class Decoder(object):
     def unpack(self, unpacker):
         return unpacker.unpack(self)
 
+    def unpack_struct(self, st: struct.Struct):
+        ret = st.unpack_from(self.raw_data, self._pos)
+        self._pos += st.size
+        return ret
+
     def unpack_name(self):
         name = self.read_bytes(8)
-        return eos.b2s(name)
+        return names.b2s(name)
 
     def unpack_bool(self):
         ret = self.read_bytes(1)[0]
@@ -278,7 +298,7 @@ class Decoder(object):
     def unpack_string(self):
         length = self.unpack_length()
         data = self.read_bytes(length)
-        return data.decode()
+        return str(data, 'utf-8')
     
     def unpack_list(self, tp: Type):
         length = self.unpack_length()
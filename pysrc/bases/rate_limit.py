@@ -1,10 +1,11 @@
 import asyncio
+import collections
+import functools
 import ipaddress
 import time
+from typing import Dict, Optional, Union
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import PlainTextResponse
-from aiocache import cached, Cache
-from aiocache.serializers import PickleSerializer
 from queue import PriorityQueue
 
 from . import log
@@ -12,11 +13,13 @@ from .multi_index import key_u64_value_double_index, secondary_double_index
 
 from .. import eos
 
-cache = Cache(Cache.MEMORY, serializer=PickleSerializer())
-
 MAX_CONNECTIONS = 1000
 REQUESTS_PER_MINUTE = 100
 BLOCK_INTERVAL = 60 # Block for 1 minute if the limit is exceeded
+SWEEP_INTERVAL = 60 # Remove idle clients from the rate limiter every minute
+MAX_CONCURRENT_TASKS = 8 # Requests processed at the same time by the scheduler
+DEFAULT_TASK_TIME = 0.001 # Estimated duration of a running task of a connection that has not been served yet
+IDLE_TIMEOUT = 1.0 # Check for exit and inactive connections at least every second
 
 logger = log.get_logger(__name__)
 
@@ -44,9 +47,11 @@ class Connection:
     def __init__(self, id, host, weight=1, clear_expired_served_time=False):
         self.id = id
         self.host = host
-        self.tasks = []
+        self.tasks = collections.deque()
         self.weight = weight
         self.served_time = 0
+        self.served_count = 0
+        self.running = 0
         self.served_times = key_u64_value_double_index()
         self.clear_expired_served_time = clear_expired_served_time
 
@@ -56,16 +61,28 @@ class Connection:
     def __str__(self):
         return repr(self)
 
-    async def process(self):
+    def next_task(self) -> Optional[Task]:
         if not self.tasks:
             return None
-        task = self.tasks.pop(0)
+        self.running += 1
+        return self.tasks.popleft()
+
+    async def process_task(self, task: Task):
         #logger.debug(f"Processing task {task.task} for {self.host} {task.url}")
         start = time.monotonic()
-        ret = await task.run()
-        duration = time.monotonic() - start
-        self.served_time += duration
-        return ret
+        try:
+            return await task.run()
+        finally:
+            duration = time.monotonic() - start
+            self.served_time += duration
+            self.served_count += 1
+            self.running -= 1
+
+    async def process(self):
+        task = self.next_task()
+        if not task:
+            return None
+        return await self.process_task(task)
 
     def add_task(self, url, task):
         _task = Task(url, task)
@@ -90,20 +107,63 @@ class Connection:
     def relative_priority(self):
         if not self.tasks:
             return 0.0
-        if self.served_time > 0:
-            return self.weight / self.served_time
+        # running tasks are charged with the average served time of the connection
+        cost = self.served_time
+        if self.running:
+            if self.served_count:
+                cost += self.running * self.served_time / self.served_count
+            else:
+                cost += self.running * DEFAULT_TASK_TIME
+        if cost > 0:
+            return self.weight / cost
         else:
             return float('inf')
 
 class WeightedFairScheduler:
-    def __init__(self, window_time = 30):
+    """
+    Runs the tasks of the connection with the highest relative priority first, up to
+    `max_concurrent_tasks` tasks at the same time.
+    """
+    def __init__(self, window_time = 30, max_concurrent_tasks = MAX_CONCURRENT_TASKS):
         self.connections = {}
         self.priority_index = secondary_double_index()
         self.last_task_time_index = secondary_double_index()
         self.window_time = window_time #60*10
         self.clear_inactive_connections_time = time.monotonic()
+        self.max_concurrent_tasks = max(max_concurrent_tasks, 1)
+        self.running = 0
+        self.running_tasks = set()
+        # set when a task is added or finished, created in the loop the scheduler is used in
+        self.event: Optional[asyncio.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def reset(self):
+        """
+        Drops the connections and the running tasks, called when the scheduler is used in another
+        loop, e.g. in a worker process forked from a process that runs the scheduler.
+        """
+        self.connections = {}
+        self.priority_index = secondary_double_index()
+        self.last_task_time_index = secondary_double_index()
+        self.clear_inactive_connections_time = time.monotonic()
+        self.running = 0
+        self.running_tasks = set()
+
+    def bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is loop:
+            return
+        if self.loop:
+            self.reset()
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def wake_up(self):
+        if self.event:
+            self.event.set()
 
     def add_task(self, host, url, task):
+        self.bind_loop()
         if len(self.connections) >= MAX_CONNECTIONS:
             return None
         int_address = int(ipaddress.ip_address(host))
@@ -116,6 +176,7 @@ class WeightedFairScheduler:
         task = conn.add_task(url, task)
         self.priority_index.set(int_address, conn.relative_priority())
         self.last_task_time_index.set(int_address, time.monotonic())
+        self.wake_up()
         return task
 
     def clear_inactive_connections(self):
@@ -136,27 +197,71 @@ class WeightedFairScheduler:
             conn = self.connections[id]
             del self.connections[id]
 
-    async def _process_task(self):
-        self.clear_inactive_connections()
+    def next_connection(self) -> Optional[Connection]:
         ret = self.priority_index.last()
         if not ret:
-            await asyncio.sleep(0.001)
-            return
+            return None
         id, priority = ret
         conn = self.connections[id]
         if not conn.tasks:
-            await asyncio.sleep(0.001)
-            return
-        ret = await conn.process()
-        if not ret:
-            return
-        self.priority_index.set(id, conn.relative_priority())
-        return ret
+            return None
+        return conn
+
+    def start_task(self, conn: Connection) -> Task:
+        task = conn.next_task()
+        self.running += 1
+        self.priority_index.set(conn.id, conn.relative_priority())
+        return task
+
+    async def run_task(self, conn: Connection, task: Task):
+        try:
+            return await conn.process_task(task)
+        finally:
+            self.running -= 1
+            # the connection may have been removed as inactive while the task was running
+            if self.connections.get(conn.id) is conn:
+                self.priority_index.set(conn.id, conn.relative_priority())
+            self.wake_up()
+
+    def dispatch(self) -> int:
+        """
+        Starts tasks until `max_concurrent_tasks` tasks are running, returns the number of started tasks.
+        """
+        count = 0
+        while self.running < self.max_concurrent_tasks:
+            conn = self.next_connection()
+            if not conn:
+                break
+            task = asyncio.create_task(self.run_task(conn, self.start_task(conn)))
+            self.running_tasks.add(task)
+            task.add_done_callback(self.running_tasks.discard)
+            count += 1
+        return count
+
+    async def _process_task(self):
+        """
+        Runs the next task in the calling coroutine and returns its result.
+        """
+        self.clear_inactive_connections()
+        conn = self.next_connection()
+        if not conn:
+            return None
+        return await self.run_task(conn, self.start_task(conn))
 
     async def process_task(self):
+        loop = asyncio.get_running_loop()
+        self.bind_loop()
         while not eos.should_exit():
             try:
-                await self._process_task()
+                self.clear_inactive_connections()
+                self.dispatch()
+                self.event.clear()
+                # wake up for a new or finished task, or after IDLE_TIMEOUT
+                timer = loop.call_later(IDLE_TIMEOUT, self.event.set)
+                try:
+                    await self.event.wait()
+                finally:
+                    timer.cancel()
             except asyncio.exceptions.CancelledError:
                 logger.info("Scheduler task cancelled")
                 return
@@ -164,47 +269,103 @@ class WeightedFairScheduler:
                 logger.exception(e)
                 return
 
+class ClientBucket(object):
+    __slots__ = ('tokens', 'updated', 'block_until')
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.block_until = 0.0
+
+class TokenBucketLimiter(object):
+    """
+    Per client token bucket, a client can send a burst of `requests_per_minute` requests and then
+    `requests_per_minute` requests per minute, it is blocked for `block_interval` seconds once the
+    bucket is empty. Tokens are refilled when the client sends a request, clients with a full bucket
+    are removed by `sweep`.
+    """
+    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE, block_interval: float = BLOCK_INTERVAL):
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.block_interval = block_interval
+        self.buckets: Dict[Union[int, str], ClientBucket] = {}
+
+    def acquire(self, client: Union[int, str], now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.monotonic()
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            self.buckets[client] = ClientBucket(self.capacity - 1.0, now)
+            return True
+        if now < bucket.block_until:
+            return False
+        tokens = bucket.tokens + (now - bucket.updated) * self.rate
+        if tokens > self.capacity:
+            tokens = self.capacity
+        bucket.updated = now
+        if tokens < 1.0:
+            bucket.tokens = tokens
+            bucket.block_until = now + self.block_interval
+            return False
+        bucket.tokens = tokens - 1.0
+        return True
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Removes the clients that are not blocked and have refilled their bucket, returns the number of removed clients.
+        """
+        if now is None:
+            now = time.monotonic()
+        idle = [client for client, bucket in self.buckets.items()
+                if now >= bucket.block_until and bucket.tokens + (now - bucket.updated) * self.rate >= self.capacity]
+        for client in idle:
+            del self.buckets[client]
+        return len(idle)
+
+    async def sweep_task(self, interval: float = SWEEP_INTERVAL):
+        while not eos.should_exit():
+            try:
+                await asyncio.sleep(interval)
+                self.sweep()
+            except asyncio.exceptions.CancelledError:
+                logger.info("Rate limiter sweep task cancelled")
+                return
+            except Exception as e:
+                logger.exception(e)
+                return
+
+@functools.lru_cache(maxsize=MAX_CONNECTIONS*4)
+def client_key(host: str) -> Union[int, str]:
+    try:
+        return int(ipaddress.ip_address(host))
+    except ValueError:
+        return host
+
 scheduler = WeightedFairScheduler()
+limiter = TokenBucketLimiter()
+
+too_many_requests_error = '{"code":400, "message":"Too Many Requests, try again later.","error":{"code":0,"name":"","what":"","details":[]}}'
+too_many_connections_error = '{"code":400, "message":"Too Many Connections, try again later.","error":{"code":0,"name":"","what":"","details":[]}}'
+
+def reset():
+    """
+    Replaces the scheduler and the limiter, a forked worker process does not serve the connections
+    of its parent.
+    """
+    global scheduler, limiter
+    scheduler = WeightedFairScheduler()
+    limiter = TokenBucketLimiter()
 
 def create_schedule_task():
+    asyncio.create_task(limiter.sweep_task())
     return asyncio.create_task(scheduler.process_task())
 
 async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    current_time = time.time()
-    
-    client_data = await cache.get(client_ip)
-    if client_data is None:
-        # New client, start tracking
-        client_data = {
-            'request_count': 1,
-            'start_time': current_time,
-            'block_until': 0
-        }
-    else:
-        if current_time < client_data['block_until']:
-            # Client is currently blocked, raise an error
-            error = '{"code":400, "message":"Too Many Requests, try again later.","error":{"code":0,"name":"","what":"","details":[]}}'
-            return PlainTextResponse(error, status_code=400)
-        elif current_time - client_data['start_time'] < 60:
-            # Less than a minute has passed since first request
-            client_data['request_count'] += 1
-            if client_data['request_count'] > REQUESTS_PER_MINUTE:
-                # Rate limit exceeded, block the client
-                client_data['block_until'] = current_time + BLOCK_INTERVAL
-                error = '{"code":400, "message":"Too Many Requests, try again later.","error":{"code":0,"name":"","what":"","details":[]}}'
-                return PlainTextResponse(error, status_code=400)
-        else:
-            # More than a minute has passed since first request, reset the counter
-            client_data['request_count'] = 1
-            client_data['start_time'] = current_time
-    # Store the updated client data
-    await cache.set(client_ip, client_data)
-    # return await call_next(request)
+    if not limiter.acquire(client_key(request.client.host)):
+        return PlainTextResponse(too_many_requests_error, status_code=400)
 
     task = scheduler.add_task(request.client.host, request.url, call_next(request))
     if not task:
-        error = '{"code":400, "message":"Too Many Connections, try again later.","error":{"code":0,"name":"","what":"","details":[]}}'
-        return PlainTextResponse(error, status_code=400)
+        return PlainTextResponse(too_many_connections_error, status_code=400)
     response = await task.wait()
     return response
@@ -1,3 +1,7 @@
+import os
+from multiprocessing import shared_memory
+from typing import Optional
+
 from ..native_modules import _read_write_lock
 
 class ReadWriteLock(object):
@@ -24,3 +28,88 @@ class ReadWriteLock(object):
     
     def release_write_lock(self):
         _read_write_lock.release_write_lock(self._lock)
+
+class SharedReadWriteLock(object):
+    """
+    Writer preferring reader-writer lock in shared memory, readers and writers only enter the kernel
+    when they have to wait. The lock can be passed to child processes, `rlock` and `wlock` return
+    context managers.
+    """
+    class _RLock(object):
+        def __init__(self, lock):
+            self._ptr = lock._ptr
+
+        def __enter__(self):
+            _read_write_lock.shared_acquire_read_lock(self._ptr)
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            _read_write_lock.shared_release_read_lock(self._ptr)
+
+    class _WLock(object):
+        def __init__(self, lock):
+            self._ptr = lock._ptr
+
+        def __enter__(self):
+            _read_write_lock.shared_acquire_write_lock(self._ptr)
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            _read_write_lock.shared_release_write_lock(self._ptr)
+
+    def __init__(self, name: Optional[str] = None):
+        if name:
+            self._shm = shared_memory.SharedMemory(name)
+            self._ptr = _read_write_lock.shared_lock_attach(self._shm.buf)
+            self._owner_pid = 0
+        else:
+            self._shm = shared_memory.SharedMemory(create=True, size=_read_write_lock.shared_lock_size())
+            self._ptr = _read_write_lock.shared_lock_init(self._shm.buf)
+            # forked children inherit the lock but must not unlink it
+            self._owner_pid = os.getpid()
+        self._rlock = self._RLock(self)
+        self._wlock = self._WLock(self)
+
+    def __getstate__(self):
+        return {'name': self._shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'])
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def free(self):
+        if not getattr(self, '_shm', None):
+            return
+        self._ptr = 0
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+        self._shm = None
+
+    def __del__(self):
+        self.free()
+
+    def acquire_read_lock(self):
+        _read_write_lock.shared_acquire_read_lock(self._ptr)
+
+    def release_read_lock(self):
+        _read_write_lock.shared_release_read_lock(self._ptr)
+
+    def acquire_write_lock(self):
+        _read_write_lock.shared_acquire_write_lock(self._ptr)
+
+    def release_write_lock(self):
+        _read_write_lock.shared_release_write_lock(self._ptr)
+
+    def rlock(self):
+        return self._rlock
+
+    def wlock(self):
+        return self._wlock
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the number of acquires, of acquires that had to wait and the total wait time in nanoseconds for readers and writers.
+        """
+        return _read_write_lock.shared_lock_statistics(self._ptr)
@@ -0,0 +1,65 @@
+import os
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+from ..native_modules import _read_write_lock
+
+default_snapshot_capacity = 4096
+
+class SharedSnapshot(object):
+    """
+    Bytes published by one process and read by other processes without locks or messages.
+
+    The data is guarded by a sequence lock, `read` copies the data and retries if `publish` replaced it
+    in the meantime, so readers never block the writer. Only one process may call `publish`.
+    The snapshot can be passed to child processes.
+    """
+    def __init__(self, capacity: int = default_snapshot_capacity, name: Optional[str] = None):
+        if name:
+            self._shm = shared_memory.SharedMemory(name)
+            self._ptr = _read_write_lock.seqlock_attach(self._shm.buf)
+            self._owner_pid = 0
+        else:
+            size = _read_write_lock.seqlock_header_size() + capacity
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._ptr = _read_write_lock.seqlock_init(self._shm.buf)
+            # forked children inherit the snapshot but must not unlink it
+            self._owner_pid = os.getpid()
+
+    def __getstate__(self):
+        return {'name': self._shm.name}
+
+    def __setstate__(self, state):
+        self.__init__(name=state['name'])
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return _read_write_lock.seqlock_capacity(self._ptr)
+
+    def free(self):
+        if not getattr(self, '_shm', None):
+            return
+        self._ptr = 0
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+        self._shm = None
+
+    def __del__(self):
+        self.free()
+
+    def publish(self, data: bytes) -> int:
+        """
+        Replaces the data, returns its version. Raises ValueError if data does not fit in the snapshot.
+        """
+        return _read_write_lock.seqlock_write(self._ptr, data)
+
+    def read(self) -> Tuple[int, bytes]:
+        """
+        Returns the version and the data, version 0 means that nothing has been published yet.
+        """
+        return _read_write_lock.seqlock_read(self._ptr)
@@ -1,5 +1,6 @@
 from typing import Generic, List, Type, TypeVar
 
+from .codec import StructCodec
 from .packer import Decoder, Encoder, Packer
 from .types import I64, U8, U16, U32, U64, Name, PublicKey
 
@@ -8,6 +9,11 @@ T = TypeVar('T')
 class KeyWeight(Packer):
     #           shared_public_key key;
     #           weight_type       weight;
+    codec = StructCodec([
+        ('key', PublicKey),
+        ('weight', U16),
+    ])
+
     def __init__(self, key: PublicKey, weight: U16):
         self.key = key
         self.weight = weight
@@ -19,15 +25,11 @@ class KeyWeight(Packer):
         return self.key == other.key and self.weight == other.weight
 
     def pack(self, enc: Encoder):
-        enc.pack(self.key)
-        enc.pack_u16(self.weight)
-        return 34 + 2
+        return self.codec.pack(enc, self)
 
     @classmethod
-    def unpack(self, dec: Decoder):
-        key = dec.unpack_public_key()
-        weight = dec.unpack_u16()
-        return KeyWeight(key, weight)
+    def unpack(cls, dec: Decoder):
+        return cls(*cls.codec.unpack(dec))
 
 class PermissionLevel(Packer):
 
@@ -76,6 +78,11 @@ class PermissionLevelWeight(Packer):
 class WaitWeight(Packer):
     #           uint32_t     wait_sec;
     #           weight_type  weight;
+    codec = StructCodec([
+        ('wait_sec', U32),
+        ('weight', U16),
+    ])
+
     def __init__(self, wait_sec: U32, weight: U16):
         self.wait_sec = wait_sec
         self.weight = weight
@@ -87,15 +94,11 @@ class WaitWeight(Packer):
         return self.wait_sec == other.wait_sec and self.weight == other.weight
 
     def pack(self, enc: Encoder):
-        enc.pack_u32(self.wait_sec)
-        enc.pack_u16(self.weight)
-        return 4 + 2
+        return self.codec.pack(enc, self)
 
     @classmethod
-    def unpack(cls, dec):
-        wait_sec = dec.unpack_u32()
-        weight = dec.unpack_u16()
-        return WaitWeight(wait_sec, weight)
+    def unpack(cls, dec: Decoder):
+        return cls(*cls.codec.unpack(dec))
 
 class Authority(Packer):
 #       uint32_t                                   threshold = 0;
@@ -180,6 +183,10 @@ class Variant(Generic[T]):
 
 
 class TimePoint(Packer):
+    codec = StructCodec([
+        ('time', I64),
+    ])
+
     def __init__(self, time: I64):
         self.time = time
 
@@ -190,12 +197,11 @@ class TimePoint(Packer):
         return self.time == other.time
 
     def pack(self, enc: Encoder):
-        enc.pack_i64(self.time)
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        time = dec.unpack_i64()
-        return TimePoint(time)
+        return cls(*cls.codec.unpack(dec))
 
 # class TimePointSec(object):
 #     def __init__(self, utc_seconds: U32):
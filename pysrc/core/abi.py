@@ -0,0 +1,545 @@
+"""
+Compiles contract ABIs to Python decode and encode functions built on `Decoder` and `Encoder`.
+
+    abi = CompiledAbi(abi_json)
+    args = abi.decode_action('transfer', raw_args)
+    raw_args = abi.encode_action('transfer', args)
+
+Values have the JSON form of the native ABI serializer except that integers are always Python
+ints: names, symbols, assets, time points, keys and signatures are strings, checksums, `bytes`
+and float128 are hex strings, variants are `[type, value]`.
+
+Every struct of an ABI becomes one generated function, consecutive fixed width fields of a struct
+are unpacked and packed with one precompiled `struct.Struct`. `AbiCache` keeps the compiled ABI
+of each account until its `abi_sequence` changes.
+"""
+import json
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..bases import names
+from ..bases.packer import Decoder, Encoder
+from ..bases.types import Name, PublicKey, Signature
+from .database import Database, AccountMetadataObjectIndex, AccountObjectIndex
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+BLOCK_TIMESTAMP_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+def format_time(t: datetime, milliseconds: bool) -> str:
+    return t.isoformat(timespec='milliseconds' if milliseconds else 'seconds')[:-6]
+
+def parse_time(s: str) -> datetime:
+    return datetime.fromisoformat(s.rstrip('Z')).replace(tzinfo=timezone.utc)
+
+def decode_time_point(us: int) -> str:
+    return format_time(EPOCH + timedelta(microseconds=us), True)
+
+def encode_time_point(s: str) -> int:
+    return (parse_time(s) - EPOCH) // timedelta(microseconds=1)
+
+def decode_time_point_sec(sec: int) -> str:
+    return format_time(EPOCH + timedelta(seconds=sec), False)
+
+def encode_time_point_sec(s: str) -> int:
+    return int((parse_time(s) - EPOCH).total_seconds())
+
+def decode_block_timestamp(slot: int) -> str:
+    return format_time(BLOCK_TIMESTAMP_EPOCH + timedelta(milliseconds=slot * 500), True)
+
+def encode_block_timestamp(s: str) -> int:
+    return (parse_time(s) - BLOCK_TIMESTAMP_EPOCH) // timedelta(milliseconds=500)
+
+def decode_symbol_code(value: int) -> str:
+    return value.to_bytes(8, 'little').rstrip(b'\x00').decode()
+
+def encode_symbol_code(code: str) -> int:
+    return int.from_bytes(code.encode().ljust(8, b'\x00'), 'little')
+
+def decode_symbol(value: int) -> str:
+    return f'{value & 0xff},{decode_symbol_code(value >> 8)}'
+
+def encode_symbol(s: str) -> int:
+    precision, code = s.split(',')
+    return int(precision) | encode_symbol_code(code) << 8
+
+def decode_asset(raw: bytes) -> str:
+    amount, symbol = struct.unpack('<qQ', raw)
+    precision = symbol & 0xff
+    sign = '-' if amount < 0 else ''
+    amount = abs(amount)
+    if precision:
+        number = f'{amount // 10 ** precision}.{amount % 10 ** precision:0{precision}d}'
+    else:
+        number = str(amount)
+    return f'{sign}{number} {decode_symbol_code(symbol >> 8)}'
+
+def encode_asset(s: str) -> bytes:
+    number, code = s.split()
+    sign = -1 if number.startswith('-') else 1
+    number = number.lstrip('-')
+    integer, _, fraction = number.partition('.')
+    precision = len(fraction)
+    amount = sign * int(integer + fraction)
+    return struct.pack('<qQ', amount, precision | encode_symbol_code(code) << 8)
+
+def decode_public_key(raw: bytes) -> str:
+    if raw[0] != 0:
+        raise ValueError(f'unsupported public key type: {raw[0]}')
+    return PublicKey(raw).to_base58()
+
+def encode_public_key(s: str) -> bytes:
+    return PublicKey.from_base58(s).raw
+
+def decode_signature(raw: bytes) -> str:
+    if raw[0] != 0:
+        raise ValueError(f'unsupported signature type: {raw[0]}')
+    return Signature(raw).to_base58()
+
+def encode_signature(s: str) -> bytes:
+    return Signature.from_base58(s).raw
+
+def decode_int(raw: bytes, signed: bool) -> int:
+    return int.from_bytes(raw, 'little', signed=signed)
+
+def decode_hex(raw: bytes) -> str:
+    return raw.hex()
+
+# fixed width builtin types: struct format, decode, encode
+FIXED_TYPES: Dict[str, Tuple[str, Optional[Callable], Optional[Callable]]] = {
+    'bool': ('?', None, None),
+    'int8': ('b', None, None),
+    'uint8': ('B', None, None),
+    'int16': ('h', None, None),
+    'uint16': ('H', None, None),
+    'int32': ('i', None, None),
+    'uint32': ('I', None, None),
+    'int64': ('q', None, None),
+    'uint64': ('Q', None, None),
+    'int128': ('16s', lambda raw: decode_int(raw, True), lambda n: int(n).to_bytes(16, 'little', signed=True)),
+    'uint128': ('16s', lambda raw: decode_int(raw, False), lambda n: int(n).to_bytes(16, 'little')),
+    'float32': ('f', None, None),
+    'float64': ('d', None, None),
+    'float128': ('16s', decode_hex, bytes.fromhex),
+    'name': ('Q', names.n2s, names.s2n),
+    'time_point': ('q', decode_time_point, encode_time_point),
+    'time_point_sec': ('I', decode_time_point_sec, encode_time_point_sec),
+    'block_timestamp_type': ('I', decode_block_timestamp, encode_block_timestamp),
+    'symbol': ('Q', decode_symbol, encode_symbol),
+    'symbol_code': ('Q', decode_symbol_code, encode_symbol_code),
+    'asset': ('16s', decode_asset, encode_asset),
+    'checksum160': ('20s', decode_hex, bytes.fromhex),
+    'checksum256': ('32s', decode_hex, bytes.fromhex),
+    'checksum512': ('64s', decode_hex, bytes.fromhex),
+    'public_key': ('34s', decode_public_key, encode_public_key),
+    'signature': ('66s', decode_signature, encode_signature),
+}
+
+def unpack_varint32(dec: Decoder) -> int:
+    n = dec.unpack_length()
+    return (n >> 1) ^ -(n & 1)
+
+def pack_varint32(enc: Encoder, n: int):
+    enc.pack_length(((n << 1) ^ (n >> 31)) & 0xffffffff)
+
+def unpack_bytes_hex(dec: Decoder) -> str:
+    return bytes(dec.unpack_bytes()).hex()
+
+def pack_bytes_hex(enc: Encoder, value: str):
+    enc.pack_bytes(bytes.fromhex(value))
+
+# variable width builtin types: decode, encode
+VAR_TYPES: Dict[str, Tuple[Callable, Callable]] = {
+    'string': (lambda dec: dec.unpack_string(), lambda enc, value: enc.pack_string(value)),
+    'bytes': (unpack_bytes_hex, pack_bytes_hex),
+    'varuint32': (lambda dec: dec.unpack_length(), lambda enc, value: enc.pack_length(value)),
+    'varint32': (unpack_varint32, pack_varint32),
+}
+
+# structs every ABI can use
+BUILTIN_STRUCTS = [
+    {'name': 'extended_asset', 'base': '', 'fields': [{'name': 'quantity', 'type': 'asset'}, {'name': 'contract', 'type': 'name'}]},
+]
+
+class CompiledAbi(object):
+    """
+    Decode and encode functions of the types of an ABI, `abi` is a JSON ABI as text or dict.
+    Raises ValueError if a type can not be resolved.
+    """
+    def __init__(self, abi: Union[str, Dict]):
+        if isinstance(abi, str):
+            abi = json.loads(abi)
+        self.abi = abi
+        self.typedefs = {t['new_type_name']: t['type'] for t in abi.get('types', [])}
+        self.structs = {s['name']: s for s in BUILTIN_STRUCTS + abi.get('structs', [])}
+        self.variants = {v['name']: v['types'] for v in abi.get('variants', [])}
+        self.actions = {a['name']: a['type'] for a in abi.get('actions', [])}
+        self.tables = {t['name']: t['type'] for t in abi.get('tables', [])}
+        self.action_results = {a['name']: a['result_type'] for a in abi.get('action_results', [])}
+
+        self.namespace: Dict[str, Any] = {'struct': struct}
+        self.decoders: Dict[str, Callable] = {}
+        self.encoders: Dict[str, Callable] = {}
+        self.compile_structs()
+
+    def resolve(self, tp: str) -> str:
+        seen = set()
+        while tp in self.typedefs:
+            if tp in seen:
+                raise ValueError(f'circular typedef: {tp}')
+            seen.add(tp)
+            tp = self.typedefs[tp]
+        return tp
+
+    def fixed_type(self, tp: str):
+        return FIXED_TYPES.get(self.resolve(tp))
+
+    def add_name(self, prefix: str, value) -> str:
+        name = f'{prefix}{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def struct_fields(self, name: str) -> List[Dict]:
+        s = self.structs[name]
+        fields = []
+        if s.get('base'):
+            base = self.resolve(s['base'])
+            if base not in self.structs:
+                raise ValueError(f'unknown base struct {base} of {name}')
+            fields.extend(self.struct_fields(base))
+        fields.extend(s['fields'])
+        return fields
+
+    def segments(self, fields: List[Dict]):
+        """
+        Groups consecutive fixed width fields, yields ('fixed', [field, ...]) and ('var', field).
+        """
+        run = []
+        for field in fields:
+            if not field['type'].endswith('$') and self.fixed_type(field['type']):
+                run.append(field)
+                continue
+            if run:
+                yield 'fixed', run
+                run = []
+            yield 'var', field
+        if run:
+            yield 'fixed', run
+
+    def compile_structs(self):
+        # the functions of all structs share one namespace, a field refers to the function of its
+        # type by name so that structs can refer to structs that are compiled later
+        lines = []
+        self.field_decoders: List[Tuple[str, str]] = []
+        self.field_encoders: List[Tuple[str, str]] = []
+        for i, name in enumerate(self.structs):
+            lines.extend(self.struct_decoder_source(i, name))
+            lines.extend(self.struct_encoder_source(i, name))
+        exec('\n'.join(lines), self.namespace)
+        for i, name in enumerate(self.structs):
+            self.decoders[name] = self.namespace[f'decode_struct{i}']
+            self.encoders[name] = self.namespace[f'encode_struct{i}']
+        for name, tp in self.field_decoders:
+            self.namespace[name] = self.get_decoder(tp)
+        for name, tp in self.field_encoders:
+            self.namespace[name] = self.get_encoder(tp)
+
+    def struct_decoder_source(self, index: int, name: str) -> List[str]:
+        lines = [f'def decode_struct{index}(dec):', '    r = {}']
+        for kind, item in self.segments(self.struct_fields(name)):
+            if kind == 'fixed':
+                fixed = [self.fixed_type(field['type']) for field in item]
+                st = self.add_name('s', struct.Struct('<' + ''.join(fmt for fmt, _, _ in fixed)))
+                values = [f'v{i}' for i in range(len(item))]
+                lines.append(f'    {", ".join(values)}{"," if len(values) == 1 else ""} = dec.unpack_struct({st})')
+                for field, (_, decode, _), value in zip(item, fixed, values):
+                    if decode:
+                        value = f'{self.add_name("d", decode)}({value})'
+                    lines.append(f'    r[{field["name"]!r}] = {value}')
+            else:
+                tp = item['type']
+                if tp.endswith('$'):
+                    # binary extension, absent at the end of old data
+                    tp = tp[:-1]
+                    lines.append('    if dec.pos >= len(dec.raw_data): return r')
+                decoder = self.add_name('t', None)
+                self.field_decoders.append((decoder, tp))
+                lines.append(f'    r[{item["name"]!r}] = {decoder}(dec)')
+        lines.append('    return r')
+        return lines
+
+    def struct_encoder_source(self, index: int, name: str) -> List[str]:
+        lines = [f'def encode_struct{index}(enc, v):']
+        fields = self.struct_fields(name)
+        for kind, item in self.segments(fields):
+            if kind == 'fixed':
+                fixed = [self.fixed_type(field['type']) for field in item]
+                st = self.add_name('s', struct.Struct('<' + ''.join(fmt for fmt, _, _ in fixed)))
+                values = []
+                for field, (_, _, encode) in zip(item, fixed):
+                    value = f'v[{field["name"]!r}]'
+                    if encode:
+                        value = f'{self.add_name("e", encode)}({value})'
+                    values.append(value)
+                lines.append(f'    enc.pack_struct({st}, {", ".join(values)})')
+            else:
+                tp = item['type']
+                if tp.endswith('$'):
+                    tp = tp[:-1]
+                    lines.extend(self.missing_extension_source(name, item, fields))
+                encoder = self.add_name('t', None)
+                self.field_encoders.append((encoder, tp))
+                lines.append(f'    {encoder}(enc, v[{item["name"]!r}])')
+        lines.append('    return')
+        return lines
+
+    def missing_extension_source(self, name: str, field: Dict, fields: List[Dict]) -> List[str]:
+        """
+        A missing binary extension field ends the struct, the fields after it, of a derived struct too,
+        have to be missing binary extensions as well, otherwise encoding raises ValueError.
+        """
+        later = fields[next(i for i, f in enumerate(fields) if f is field) + 1:]
+        required = [f['name'] for f in later if not f['type'].endswith('$')]
+        if required:
+            error = f'missing binary extension field {field["name"]} of {name} followed by field {required[0]}'
+            return [f'    if {field["name"]!r} not in v: raise ValueError({error!r})']
+        lines = [f'    if {field["name"]!r} not in v:']
+        if later:
+            names = self.add_name('f', tuple(f['name'] for f in later))
+            error = f'field after missing binary extension field {field["name"]} of {name}: '
+            lines.append(f'        for name in {names}:')
+            lines.append(f'            if name in v: raise ValueError({error!r} + name)')
+        lines.append('        return')
+        return lines
+
+    def get_decoder(self, tp: str) -> Callable:
+        decoder = self.decoders.get(tp)
+        if decoder:
+            return decoder
+        decoder = self.new_decoder(tp)
+        self.decoders[tp] = decoder
+        return decoder
+
+    def get_encoder(self, tp: str) -> Callable:
+        encoder = self.encoders.get(tp)
+        if encoder:
+            return encoder
+        encoder = self.new_encoder(tp)
+        self.encoders[tp] = encoder
+        return encoder
+
+    def new_decoder(self, tp: str) -> Callable:
+        if tp.endswith('[]'):
+            item_tp = tp[:-2]
+            fixed = self.fixed_type(item_tp)
+            if fixed and not fixed[1] and len(fixed[0]) == 1:
+                # numbers are unpacked with one struct call
+                fmt = fixed[0]
+                def decode_numbers(dec):
+                    n = dec.unpack_length()
+                    return list(dec.unpack_struct(struct.Struct(f'<{n}{fmt}')))
+                return decode_numbers
+            item = self.get_decoder(item_tp)
+            return lambda dec: [item(dec) for _ in range(dec.unpack_length())]
+        if tp.endswith('?'):
+            item = self.get_decoder(tp[:-1])
+            return lambda dec: item(dec) if dec.unpack_u8() else None
+
+        resolved = self.resolve(tp)
+        if resolved != tp:
+            return self.get_decoder(resolved)
+        if tp in self.decoders:
+            return self.decoders[tp]
+        fixed = FIXED_TYPES.get(tp)
+        if fixed:
+            st = struct.Struct('<' + fixed[0])
+            decode = fixed[1]
+            if decode:
+                return lambda dec: decode(dec.unpack_struct(st)[0])
+            return lambda dec: dec.unpack_struct(st)[0]
+        if tp in VAR_TYPES:
+            return VAR_TYPES[tp][0]
+        if tp in self.variants:
+            types = self.variants[tp]
+            def decode_variant(dec):
+                index = dec.unpack_length()
+                if index >= len(types):
+                    raise ValueError(f'invalid index {index} of variant {tp}')
+                return [types[index], self.get_decoder(types[index])(dec)]
+            return decode_variant
+        raise ValueError(f'unknown type: {tp}')
+
+    def new_encoder(self, tp: str) -> Callable:
+        if tp.endswith('[]'):
+            item = self.get_encoder(tp[:-2])
+            def encode_array(enc, values):
+                enc.pack_length(len(values))
+                for value in values:
+                    item(enc, value)
+            return encode_array
+        if tp.endswith('?'):
+            item = self.get_encoder(tp[:-1])
+            def encode_optional(enc, value):
+                if value is None:
+                    enc.pack_u8(0)
+                else:
+                    enc.pack_u8(1)
+                    item(enc, value)
+            return encode_optional
+
+        resolved = self.resolve(tp)
+        if resolved != tp:
+            return self.get_encoder(resolved)
+        if tp in self.encoders:
+            return self.encoders[tp]
+        fixed = FIXED_TYPES.get(tp)
+        if fixed:
+            st = struct.Struct('<' + fixed[0])
+            encode = fixed[2]
+            if encode:
+                return lambda enc, value: enc.pack_struct(st, encode(value))
+            return lambda enc, value: enc.pack_struct(st, value)
+        if tp in VAR_TYPES:
+            return VAR_TYPES[tp][1]
+        if tp in self.variants:
+            types = self.variants[tp]
+            def encode_variant(enc, value):
+                name, value = value
+                enc.pack_length(types.index(name))
+                self.get_encoder(name)(enc, value)
+            return encode_variant
+        raise ValueError(f'unknown type: {tp}')
+
+    def decode(self, tp: str, raw: Union[bytes, Decoder]):
+        dec = raw if isinstance(raw, Decoder) else Decoder(raw)
+        return self.get_decoder(tp)(dec)
+
+    def encode(self, tp: str, value) -> bytes:
+        enc = Encoder()
+        self.get_encoder(tp)(enc, value)
+        return enc.get_bytes()
+
+    def get_action_type(self, action: Name) -> str:
+        if action not in self.actions:
+            raise ValueError(f'unknown action: {action}')
+        return self.actions[action]
+
+    def get_table_type(self, table: Name) -> str:
+        if table not in self.tables:
+            raise ValueError(f'unknown table: {table}')
+        return self.tables[table]
+
+    def decode_action(self, action: Name, raw_args: bytes) -> Dict:
+        return self.decode(self.get_action_type(action), raw_args)
+
+    def encode_action(self, action: Name, args: Dict) -> bytes:
+        return self.encode(self.get_action_type(action), args)
+
+    def decode_table_row(self, table: Name, raw: bytes) -> Dict:
+        return self.decode(self.get_table_type(table), raw)
+
+    def encode_table_row(self, table: Name, row: Dict) -> bytes:
+        return self.encode(self.get_table_type(table), row)
+
+    def decode_action_result(self, action: Name, raw: bytes):
+        if action not in self.action_results:
+            raise ValueError(f'no result type of action: {action}')
+        return self.decode(self.action_results[action], raw)
+
+# the ABI of abi_def, the binary ABI stored in account_object
+ABI_DEF_ABI = {
+    'structs': [
+        {'name': 'type_def', 'base': '', 'fields': [{'name': 'new_type_name', 'type': 'string'}, {'name': 'type', 'type': 'string'}]},
+        {'name': 'field_def', 'base': '', 'fields': [{'name': 'name', 'type': 'string'}, {'name': 'type', 'type': 'string'}]},
+        {'name': 'struct_def', 'base': '', 'fields': [{'name': 'name', 'type': 'string'}, {'name': 'base', 'type': 'string'}, {'name': 'fields', 'type': 'field_def[]'}]},
+        {'name': 'action_def', 'base': '', 'fields': [{'name': 'name', 'type': 'name'}, {'name': 'type', 'type': 'string'}, {'name': 'ricardian_contract', 'type': 'string'}]},
+        {'name': 'table_def', 'base': '', 'fields': [
+            {'name': 'name', 'type': 'name'}, {'name': 'index_type', 'type': 'string'}, {'name': 'key_names', 'type': 'string[]'},
+            {'name': 'key_types', 'type': 'string[]'}, {'name': 'type', 'type': 'string'}]},
+        {'name': 'clause_pair', 'base': '', 'fields': [{'name': 'id', 'type': 'string'}, {'name': 'body', 'type': 'string'}]},
+        {'name': 'error_message', 'base': '', 'fields': [{'name': 'error_code', 'type': 'uint64'}, {'name': 'error_msg', 'type': 'string'}]},
+        {'name': 'extension', 'base': '', 'fields': [{'name': 'tag', 'type': 'uint16'}, {'name': 'value', 'type': 'bytes'}]},
+        {'name': 'variant_def', 'base': '', 'fields': [{'name': 'name', 'type': 'string'}, {'name': 'types', 'type': 'string[]'}]},
+        {'name': 'action_result_def', 'base': '', 'fields': [{'name': 'name', 'type': 'name'}, {'name': 'result_type', 'type': 'string'}]},
+        {'name': 'abi_def', 'base': '', 'fields': [
+            {'name': 'version', 'type': 'string'}, {'name': 'types', 'type': 'type_def[]'}, {'name': 'structs', 'type': 'struct_def[]'},
+            {'name': 'actions', 'type': 'action_def[]'}, {'name': 'tables', 'type': 'table_def[]'},
+            {'name': 'ricardian_clauses', 'type': 'clause_pair[]'}, {'name': 'error_messages', 'type': 'error_message[]'},
+            {'name': 'abi_extensions', 'type': 'extension[]'}, {'name': 'variants', 'type': 'variant_def[]$'},
+            {'name': 'action_results', 'type': 'action_result_def[]$'}]},
+    ],
+}
+
+_abi_def_abi: Optional[CompiledAbi] = None
+
+def unpack_abi(raw_abi: bytes) -> Dict:
+    """
+    Unpacks a binary ABI to the JSON form.
+    """
+    global _abi_def_abi
+    if not _abi_def_abi:
+        _abi_def_abi = CompiledAbi(ABI_DEF_ABI)
+    return _abi_def_abi.decode('abi_def', raw_abi)
+
+def pack_abi(abi: Dict) -> bytes:
+    global _abi_def_abi
+    if not _abi_def_abi:
+        _abi_def_abi = CompiledAbi(ABI_DEF_ABI)
+    return _abi_def_abi.encode('abi_def', abi)
+
+class AbiCache(object):
+    """
+    Compiled ABIs of the accounts of a chain database, an ABI is compiled again only after
+    `abi_sequence` of the account has changed, that is after `setabi`.
+    """
+    def __init__(self, db: Database):
+        self.db = db
+        self.entries: Dict[str, Tuple[int, Optional[CompiledAbi]]] = {}
+        self.compiled = 0
+        self.lock = threading.Lock()
+
+    def get(self, account: Name) -> Optional[CompiledAbi]:
+        """
+        Returns the compiled ABI of `account`, None if the account does not exist or has no ABI.
+        """
+        metadata = AccountMetadataObjectIndex(self.db).find_by_name(account)
+        if not metadata:
+            return None
+        entry = self.entries.get(account)
+        if entry and entry[0] == metadata.abi_sequence:
+            return entry[1]
+
+        obj = AccountObjectIndex(self.db).find_by_name(account)
+        abi = None
+        if obj and obj.abi:
+            abi = CompiledAbi(unpack_abi(obj.abi))
+        with self.lock:
+            self.entries[account] = (metadata.abi_sequence, abi)
+            self.compiled += 1
+        return abi
+
+    def invalidate(self, account: Optional[Name] = None):
+        with self.lock:
+            if account is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(account, None)
+
+    def decode_action(self, account: Name, action: Name, raw_args: bytes) -> Dict:
+        abi = self.get(account)
+        if not abi:
+            raise ValueError(f'account {account} has no ABI')
+        return abi.decode_action(action, raw_args)
+
+    def encode_action(self, account: Name, action: Name, args: Dict) -> bytes:
+        abi = self.get(account)
+        if not abi:
+            raise ValueError(f'account {account} has no ABI')
+        return abi.encode_action(action, args)
+
+    def decode_table_row(self, account: Name, table: Name, raw: bytes) -> Dict:
+        abi = self.get(account)
+        if not abi:
+            raise ValueError(f'account {account} has no ABI')
+        return abi.decode_table_row(table, raw)
@@ -1,13 +1,170 @@
+import mmap
+import os
+import threading
+from typing import Iterator, Optional, Tuple, Union
+
 from .chain_exceptions import get_last_exception
 from .signed_block import SignedBlock
 
 from ..native_modules import _block_log, _eos
 
+# block entries start with a u32 entry size and a u8 compression type since version 4
+block_log_entry_prefix_version = 4
+default_block_log_prefetch = 4*1024*1024
+
+def map_file(file_name: str) -> Optional[mmap.mmap]:
+    try:
+        with open(file_name, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+
+class RawBlockLog(object):
+    """
+    Reads packed blocks straight from blocks.log, the position of a block is looked up in
+    blocks.index. Both files are memory mapped and mapped again when the node has appended
+    blocks to them.
+
+    The block server threads read blocks concurrently, the mapped files are replaced as a whole
+    under a lock and readers use the mapping they started with.
+    """
+    def __init__(self, block_log_dir: str):
+        self.log_file = os.path.join(block_log_dir, 'blocks.log')
+        self.index_file = os.path.join(block_log_dir, 'blocks.index')
+        # (version, first_block_num, log_data, index_data)
+        self.mapping: Optional[Tuple[int, int, mmap.mmap, mmap.mmap]] = None
+        self.lock = threading.Lock()
+        self.remap()
+
+    @property
+    def version(self) -> int:
+        return self.mapping[0] if self.mapping else 0
+
+    @property
+    def first_block_num(self) -> int:
+        return self.mapping[1] if self.mapping else 0
+
+    @property
+    def log_data(self) -> Optional[mmap.mmap]:
+        return self.mapping[2] if self.mapping else None
+
+    @property
+    def index_data(self) -> Optional[mmap.mmap]:
+        return self.mapping[3] if self.mapping else None
+
+    def has_grown(self) -> bool:
+        mapping = self.mapping
+        if not mapping:
+            return True
+        try:
+            return os.path.getsize(self.index_file) > len(mapping[3])
+        except OSError:
+            return False
+
+    def remap(self) -> bool:
+        """
+        Maps the files again if blocks.index has grown, returns False if nothing was mapped.
+        """
+        with self.lock:
+            if not self.has_grown():
+                return False
+            log_data = map_file(self.log_file)
+            index_data = map_file(self.index_file)
+            if log_data is None or index_data is None or len(log_data) < 8:
+                return False
+            version = int.from_bytes(log_data[0:4], 'little')
+            if version == 1:
+                first_block_num = 1
+            else:
+                first_block_num = int.from_bytes(log_data[4:8], 'little')
+            self.mapping = (version, first_block_num, log_data, index_data)
+            return True
+
+    def head_block_num(self) -> int:
+        mapping = self.mapping
+        if not mapping:
+            return 0
+        return mapping[1] + len(mapping[3]) // 8 - 1
+
+    def block_position(self, block_num: int, mapping: Optional[Tuple] = None):
+        """
+        Returns the start and end offsets of a block in the log data of `mapping`, or None if the
+        block is not in the mapped files or is compressed.
+        """
+        if mapping is None:
+            mapping = self.mapping
+        if not mapping:
+            return None
+        version, first_block_num, log_data, index_data = mapping
+        i = block_num - first_block_num
+        if i < 0 or (i + 1) * 8 > len(index_data):
+            return None
+        start = int.from_bytes(index_data[i*8:i*8+8], 'little')
+        if (i + 2) * 8 <= len(index_data):
+            end = int.from_bytes(index_data[i*8+8:i*8+16], 'little') - 8
+        else:
+            end = len(log_data) - 8
+        # every entry is followed by its start position
+        if end <= start or int.from_bytes(log_data[end:end+8], 'little') != start:
+            return None
+        if version >= block_log_entry_prefix_version:
+            # compressed blocks are read by the chain
+            if log_data[start+4] != 0:
+                return None
+            start += 5
+        return start, end
+
+    def iter_blocks(self, start_block: int, end_block: int, stride: int = 1, prefetch: int = 0) -> Iterator[bytes]:
+        """
+        Yields the packed blocks from `start_block` to `end_block`, stops at the first block that is not in blocks.log.
+        `prefetch` is the number of bytes ahead of the current block that the kernel is asked to read in.
+        """
+        if stride < 1:
+            raise ValueError(f"invalid stride: {stride}")
+        if end_block > self.head_block_num():
+            self.remap()
+        mapping = self.mapping
+        if not mapping:
+            return
+        log_data = mapping[2]
+        prefetched = 0
+        for block_num in range(start_block, end_block + 1, stride):
+            position = self.block_position(block_num, mapping)
+            if position is None:
+                return
+            start, end = position
+            if prefetch > 0 and end > prefetched and hasattr(log_data, 'madvise'):
+                offset = start - start % mmap.PAGESIZE
+                length = min(max(prefetch, end - offset), len(log_data) - offset)
+                log_data.madvise(mmap.MADV_WILLNEED, offset, length)
+                prefetched = offset + length
+            yield log_data[start:end]
+
+    def read_block(self, block_num: int) -> Optional[bytes]:
+        """
+        Returns the packed signed block, or None if the block is not in blocks.log or is compressed.
+        """
+        mapping = self.mapping
+        position = self.block_position(block_num, mapping)
+        if position is None:
+            if block_num < self.first_block_num or block_num <= self.head_block_num() or not self.remap():
+                return None
+            mapping = self.mapping
+            position = self.block_position(block_num, mapping)
+            if position is None:
+                return None
+        start, end = position
+        return mapping[2][start:end]
+
 class BlockLog(object):
     def __init__(self, block_log_dir: str):
         self.ptr = _block_log.new(block_log_dir)
         if not self.ptr:
             raise Exception(_eos.get_last_error())
+        self.block_log_dir = block_log_dir
+        self.raw_block_log: Optional[RawBlockLog] = None
     
     def get_block_log_ptr(self) -> int:
         return _block_log.get_block_log_ptr(self.ptr)
@@ -18,6 +175,47 @@ class BlockLog(object):
         signed_block_proxy_ptr = _block_log.read_block_by_num(self.ptr, block_num)
         return self.new_signed_block(signed_block_proxy_ptr)
 
+    def read_raw_block_by_num(self, block_num: int) -> bytes:
+        """
+        Returns the packed block stored in blocks.log, without unpacking and packing it again.
+        """
+        if block_num > self.head_block_num() or block_num < self.first_block_num():
+            raise Exception("invalid block number, block_num: %d, head_block_num: %d, first_block_num: %d" % (block_num, self.head_block_num(), self.first_block_num()))
+        if not self.raw_block_log:
+            self.raw_block_log = RawBlockLog(self.block_log_dir)
+        raw_block = self.raw_block_log.read_block(block_num)
+        if raw_block is None:
+            return self.read_block_by_num(block_num).pack()
+        return raw_block
+
+    def iter_range(self, start_block: int, end_block: int, raw: bool = True, stride: int = 1, prefetch: int = default_block_log_prefetch) -> Iterator[Union[bytes, SignedBlock]]:
+        """
+        Reads blocks from `start_block` to `end_block` (inclusive) sequentially from the memory mapped blocks.log.
+        Yields packed blocks if `raw` is True, otherwise each block is unpacked to a SignedBlock when it is yielded.
+        """
+        first_block_num = self.first_block_num()
+        head_block_num = self.head_block_num()
+        if start_block < first_block_num:
+            raise Exception("invalid block number, block_num: %d, head_block_num: %d, first_block_num: %d" % (start_block, head_block_num, first_block_num))
+        end_block = min(end_block, head_block_num)
+        if not self.raw_block_log:
+            self.raw_block_log = RawBlockLog(self.block_log_dir)
+
+        block_num = start_block
+        for raw_block in self.raw_block_log.iter_blocks(start_block, end_block, stride, prefetch):
+            if raw:
+                yield raw_block
+            else:
+                yield SignedBlock.unpack(raw_block)
+            block_num += stride
+
+        # blocks that can not be read from the mapped file
+        for block_num in range(block_num, end_block + 1, stride):
+            if raw:
+                yield self.read_block_by_num(block_num).pack()
+            else:
+                yield self.read_block_by_num(block_num)
+
     def read_block_header_by_num(self, block_num: int) -> str:
         if block_num > self.head_block_num() or block_num < self.first_block_num():
             raise Exception("invalid block number, block_num: %d, head_block_num: %d, first_block_num: %d" % (block_num, self.head_block_num(), self.first_block_num()))
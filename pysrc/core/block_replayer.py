@@ -0,0 +1,57 @@
+import collections
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .block_log import BlockLog
+from .signed_block import SignedBlock
+
+from ..bases import log
+
+default_replay_read_ahead = 64
+
+logger = log.get_logger(__name__)
+
+def default_replay_workers():
+    return max((os.cpu_count() or 1) - 1, 1)
+
+def decode_block(raw_block: bytes) -> SignedBlock:
+    return SignedBlock.unpack(raw_block)
+
+class BlockReplayer(object):
+    """
+    Replays blocks from a block log. Upcoming blocks are read from the memory mapped blocks.log and
+    decoded on a thread pool up to `read_ahead` blocks ahead of the chain, so the calling thread only
+    applies blocks.
+
+    Only decoding is parallelized: the native block has no call to compute transaction ids or recover
+    signing keys ahead of time and hand them to the controller, the controller does both while it
+    applies the block. push_block releases the GIL meanwhile so the decoder threads keep running.
+    """
+    def __init__(self, chain, blog: BlockLog, workers: int = 0, read_ahead: int = default_replay_read_ahead):
+        self.chain = chain
+        self.blog = blog
+        self.workers = workers or default_replay_workers()
+        self.read_ahead = max(read_ahead, 1)
+
+    def replay(self, start_block: int, end_block: int, show_statistics: bool = False) -> int:
+        """
+        Applies the blocks from `start_block` to `end_block` in order, returns the number of applied blocks.
+        """
+        applied = 0
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='block-decoder') as executor:
+            try:
+                for raw_block in self.blog.iter_range(start_block, end_block):
+                    pending.append(executor.submit(decode_block, raw_block))
+                    if len(pending) < self.read_ahead:
+                        continue
+                    self.chain.push_block(pending.popleft().result(), show_statistics)
+                    applied += 1
+                while pending:
+                    self.chain.push_block(pending.popleft().result(), show_statistics)
+                    applied += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+        logger.info('+++++replayed %s blocks from %s', applied, start_block)
+        return applied
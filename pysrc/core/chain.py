@@ -2,7 +2,8 @@ import json
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
-from .block_log import BlockLog
+from .block_log import BlockLog, RawBlockLog
+from .block_replayer import BlockReplayer, default_replay_read_ahead
 from .chain_exceptions import get_last_exception, get_transaction_exception
 from .signed_block import SignedBlock
 from .block_state import BlockState
@@ -61,6 +62,9 @@ class Chain(object):
         
         self.chain_config: Optional[Dict] = None
 
+        self.blocks_dir = json.loads(config).get('blocks_dir', '')
+        self.raw_block_log: Optional[RawBlockLog] = None
+
         # self.enable_deep_mind()
     def startup(self, initdb: bool) -> bool:
         """
@@ -292,6 +296,25 @@ class Chain(object):
             raise Exception(f"block_num {block_num} not found")
         return SignedBlock.init(_signed_block_proxy_ptr)
 
+    def fetch_raw_block_by_number(self, block_num) -> bytes:
+        """
+        Returns the packed block. Irreversible blocks are read straight from blocks.log.
+        """
+        raw_block_log = self.get_raw_block_log()
+        if raw_block_log:
+            raw_block = raw_block_log.read_block(block_num)
+            if raw_block is not None:
+                return raw_block
+        return self.fetch_block_by_number(block_num).pack()
+
+    def get_raw_block_log(self) -> Optional[RawBlockLog]:
+        """
+        Returns the memory mapped blocks.log, None if the blocks directory is not known.
+        """
+        if self.blocks_dir and not self.raw_block_log:
+            self.raw_block_log = RawBlockLog(self.blocks_dir)
+        return self.raw_block_log
+
     def fetch_block_by_id(self, block_id) -> bytes:
         ptr = _chain.fetch_block_by_id(self.ptr, block_id)
         if not ptr:
@@ -484,7 +507,15 @@ class Chain(object):
                 raise Exception("invalid block num")
         return True
 
-    def push_raw_block(self, raw_block: bytes, show_statistics: bool = False) -> bool:
+    def replay_block_log(self, blog: BlockLog, start_block: int, end_block: int, workers: int = 0, read_ahead: int = default_replay_read_ahead) -> int:
+        """
+        Applies blocks from `start_block` to `end_block` of a block log, blocks are decoded on a thread pool ahead of the chain,
+        signatures are still recovered by the chain while it applies each block.
+        Returns the number of applied blocks.
+        """
+        return BlockReplayer(self, blog, workers, read_ahead).replay(start_block, end_block)
+
+    def push_raw_block(self, raw_block: Union[bytes, memoryview], show_statistics: bool = False) -> bool:
         ret, block_statistics = _chain.push_raw_block(self.ptr, raw_block, show_statistics)
         if not ret:
             ex = get_last_exception()
@@ -0,0 +1,116 @@
+"""
+Columnar decoding of database rows into NumPy arrays.
+
+The rows of an index are collected in one buffer by `Database.walk_raw`, the leading fixed width
+fields of the object, as declared by its `StructCodec`, are then decoded for all rows at once:
+
+    columns = ResourceUsageObjectIndex(db).scan_columns(['owner', 'cpu_usage.value_ex'])
+    columns['cpu_usage.value_ex'].sum()
+
+Fields of nested structs are named with dots. `Name` columns hold the uint64 value of the name,
+convert them with `names.n2s_array`; 16, 32 bytes values such as `U128` and `Checksum256` are raw bytes.
+
+numpy is optional, it is only needed by the functions in this module.
+"""
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..bases.codec import FixedType, StructCodec, fixed_types
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+numpy_formats = {
+    '?': '?',
+    'b': 'i1',
+    'B': 'u1',
+    'h': '<i2',
+    'H': '<u2',
+    'i': '<i4',
+    'I': '<u4',
+    'q': '<i8',
+    'Q': '<u8',
+    'd': '<f8',
+}
+
+def numpy_format(fmt: str) -> str:
+    if fmt in numpy_formats:
+        return numpy_formats[fmt]
+    # fixed size bytes, e.g. '32s'
+    return f'V{struct.calcsize(fmt)}'
+
+def fixed_columns(codec: StructCodec) -> List[Tuple[str, str, int]]:
+    """
+    Returns (name, struct format, offset) of the leading fixed width fields of `codec`, including the
+    unpack only prefix fields, up to the first variable width field.
+    """
+    columns = []
+
+    def add(name: str, tp, offset: int) -> Optional[int]:
+        fixed = fixed_types.get(tp) if not isinstance(tp, FixedType) else tp
+        if fixed is not None:
+            columns.append((name, fixed.fmt, offset))
+            return offset + struct.calcsize('<' + fixed.fmt)
+        nested = getattr(tp, 'codec', None)
+        if not isinstance(nested, StructCodec) or nested.fixed_size is None:
+            return None
+        for field_name, field_tp in nested.fields:
+            offset = add(f'{name}.{field_name}', field_tp, offset)
+        return offset
+
+    offset = 0
+    for name, tp in codec.prefix + codec.fields:
+        offset = add(name, tp, offset)
+        if offset is None:
+            break
+    return columns
+
+def decode_columns(cls, data: bytes, offsets: bytes, columns: Sequence[str]) -> Dict[str, 'np.ndarray']:
+    """
+    Decodes `columns` of the rows returned by `Database.walk_raw`, `cls` is the database object class.
+    """
+    if np is None:
+        raise ImportError('numpy is required to decode database columns, install it with `pip install numpy`')
+
+    layout = {name: (fmt, offset) for name, fmt, offset in fixed_columns(cls.codec)}
+    for name in columns:
+        if name not in layout:
+            raise ValueError(f'{name} is not a fixed width column of {cls.__name__}, available columns: {list(layout)}')
+
+    starts = np.frombuffer(offsets, dtype=np.uint64)
+    count = len(starts)
+    width = max((layout[name][1] + struct.calcsize('<' + layout[name][0]) for name in columns), default=0)
+    names = list(dict.fromkeys(columns))
+
+    def row_dtype(itemsize: int):
+        return np.dtype({
+            'names': names,
+            'formats': [numpy_format(layout[name][0]) for name in names],
+            'offsets': [layout[name][1] for name in names],
+            'itemsize': itemsize,
+        })
+
+    if count == 0:
+        return {name: np.empty(0, dtype=row_dtype(width)[name]) for name in names}
+
+    stride = len(data) // count
+    if stride * count == len(data) and np.array_equal(starts, np.arange(count, dtype=np.uint64) * stride):
+        # rows of the same size, read the columns in place with a strided view
+        table = np.frombuffer(data, dtype=row_dtype(stride), count=count)
+    else:
+        # variable size rows, gather the leading bytes of every row into a fixed size table first
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        rows = buffer[starts[:, None].astype(np.intp) + np.arange(width, dtype=np.intp)]
+        table = rows.view(row_dtype(width)).reshape(count)
+    return {name: np.ascontiguousarray(table[name]) for name in names}
+
+def scan_columns(db, tp: int, cls, columns: Sequence[str], index_position: int = 0,
+                 lower_bound: Union[int, bytes, None] = None, upper_bound: Union[int, bytes, None] = None) -> Dict[str, 'np.ndarray']:
+    """
+    Walks an index of database object type `tp` and returns the requested columns as NumPy arrays,
+    keyed by column name.
+    """
+    data, offsets = db.walk_raw(tp, index_position, lower_bound, upper_bound)
+    return decode_columns(cls, data, offsets, columns)
@@ -1,7 +1,9 @@
-from typing import Tuple, Union
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from .database_objects import *
 from .chain_exceptions import get_last_exception
+from .columns import scan_columns
+from .object_views import ObjectView, view_class
 
 
 from ..bases import log
@@ -56,6 +58,8 @@ account_ram_correction_object_type = 39
 code_object_type = 40
 database_header_object_type = 41
 
+default_iter_batch_size = 1000 # rows read per call to the database by the iter_by_* methods
+
 def parse_return_value(ret: int):
     if ret == -2:
         raise Exception(_eos.get_last_error())
@@ -141,6 +145,65 @@ class Database:
             raise Exception(_eos.get_last_error())
         return ret
 
+    def walk_raw(self, tp: int, index_position: int, lower_bound: Union[int, bytes, None] = None, upper_bound: Union[int, bytes, None] = None, limit: int = 0) -> Tuple[bytes, bytes]:
+        """
+        Collects the raw rows of an index, or of a range of it if the bounds are given, in one buffer,
+        at most `limit` rows if it is not 0.
+        Returns (data, offsets), `offsets` holds the start of every row in `data` as native uint64 values.
+        Raises MemoryError if the rows do not fit in memory.
+        """
+        if lower_bound is None and upper_bound is None:
+            ret, data, offsets = _database.walk_raw(self.ptr, tp, index_position, limit)
+        else:
+            if index_position == 0:
+                if isinstance(lower_bound, int):
+                    lower_bound = i2b(lower_bound)
+                if isinstance(upper_bound, int):
+                    upper_bound = i2b(upper_bound)
+            ret, data, offsets = _database.walk_range_raw(self.ptr, tp, index_position, lower_bound, upper_bound, limit)
+        if ret == -2:
+            raise Exception(_eos.get_last_error())
+        return data, offsets
+
+    def read_rows(self, tp: int, index_position: int, lower_bound: bytes, upper_bound: bytes, limit: int) -> List[bytes]:
+        data, offsets = self.walk_raw(tp, index_position, lower_bound, upper_bound, limit)
+        starts = memoryview(offsets).cast('Q').tolist()
+        ends = starts[1:] + [len(data)]
+        return [data[start:end] for start, end in zip(starts, ends)]
+
+    def iter_batches(self, tp: int, index_position: int, lower_bound: bytes, upper_bound: bytes, row_key: Callable[[bytes], bytes], batch_size: int) -> Iterator[List[bytes]]:
+        rows = self.read_rows(tp, index_position, lower_bound, upper_bound, batch_size)
+        while rows:
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_key = row_key(rows[-1])
+            rows = self.read_rows(tp, index_position, last_key, upper_bound, batch_size + 1)
+            # the walk starts at the last row read, unless it has been removed
+            if rows and row_key(rows[0]) == last_key:
+                rows = rows[1:]
+
+    def iter_range(self, tp: int, index_position: int, lower_bound: bytes, upper_bound: bytes, row_key: Callable[[bytes], bytes],
+                   reverse: bool = False, batch_size: int = default_iter_batch_size) -> Iterator[bytes]:
+        """
+        Yields the raw rows of an index from `lower_bound` to `upper_bound`, `batch_size` rows are read per call to
+        the database. `row_key` returns the index key of a raw row, the next batch is read from the key of the last row.
+
+        The database has no reverse walk and no way to find the row before a key, in reverse the range is walked
+        forward first, keeping only the first key of each batch, and then the batches are read again from the last
+        one. Reverse iteration reads every row twice and keeps range size / `batch_size` keys in memory, it is not
+        constant memory for huge ranges, a larger `batch_size` keeps fewer keys.
+        """
+        if batch_size <= 0:
+            raise ValueError(f'invalid batch size: {batch_size}')
+        if not reverse:
+            for rows in self.iter_batches(tp, index_position, lower_bound, upper_bound, row_key, batch_size):
+                yield from rows
+            return
+        starts = [row_key(rows[0]) for rows in self.iter_batches(tp, index_position, lower_bound, upper_bound, row_key, batch_size)]
+        for start in reversed(starts):
+            yield from reversed(self.read_rows(tp, index_position, start, upper_bound, batch_size))
+
     def find(self, tp: int, index_position: int, key: Union[int, bytes]):
         if index_position == 0 and isinstance(key, int):
             key = i2b(key)
@@ -178,6 +241,46 @@ class Database:
             raise Exception(f"invalid database object type: {tp}")
         return ret
 
+    def range_stats(self, tp: int, index_position: int, lower_bound: Union[int, bytes], upper_bound: Union[int, bytes]) -> Tuple[int, int]:
+        """
+        Returns (count, packed_size) of the rows of a range of an index, `packed_size` is the total size of the
+        rows as the database packs them. The rows are walked in the database without being passed to Python,
+        the cost is linear in the number of rows of the range.
+        """
+        if index_position == 0:
+            if isinstance(lower_bound, int):
+                lower_bound = i2b(lower_bound)
+            if isinstance(upper_bound, int):
+                upper_bound = i2b(upper_bound)
+        ret, count, packed_size = _database.count_range(self.ptr, tp, index_position, lower_bound, upper_bound)
+        if ret == -2:
+            raise Exception(_eos.get_last_error())
+        return count, packed_size
+
+    def count_range(self, tp: int, index_position: int, lower_bound: Union[int, bytes], upper_bound: Union[int, bytes]) -> int:
+        """
+        Counts the rows of a range of an index, see `range_stats`, the cost is linear in the number of rows.
+        """
+        return self.range_stats(tp, index_position, lower_bound, upper_bound)[0]
+
+def iter_objects(db: Database, tp: int, object_class, index_position: int, lower_bound: bytes, upper_bound: bytes,
+                 object_key: Callable, reverse: bool, batch_size: int, raw_data: bool):
+    """
+    Yields the objects, or the raw rows if `raw_data` is True, of a range of an index.
+    `object_key` returns the index key of an object, it is given a lazy view of the row if the object has a codec.
+    """
+    if issubclass(object_class, ObjectView) or not hasattr(object_class, 'codec'):
+        key_class = object_class
+    else:
+        key_class = view_class(object_class)
+    def row_key(raw: bytes) -> bytes:
+        return object_key(key_class.unpack(Decoder(raw)))
+    for raw in db.iter_range(tp, index_position, lower_bound, upper_bound, row_key, reverse, batch_size):
+        if raw_data:
+            yield raw
+        else:
+            yield object_class.unpack(Decoder(raw))
+
 def call_cb(cb, data, user_data):
     try:
         ret = cb(data, user_data)
@@ -191,8 +294,9 @@ def call_cb(cb, data, user_data):
 
 # account_object_type = 1
 class AccountObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(AccountObject) if lazy else AccountObject
 
     def create(self, obj: AccountObject):
         enc = Encoder()
@@ -209,7 +313,7 @@ class AccountObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_name(self, account: Name):
         key = eos.s2b(account)
@@ -217,14 +321,14 @@ class AccountObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = AccountObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -238,18 +342,58 @@ class AccountObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(account_object_type, AccountObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, account_object_type, self.object_class, AccountObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(account_object_type, AccountObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_name(self, lower_bound: Name, upper_bound: Name, cb, user_data=None, raw_data=False):
         lower_bound = eos.s2b(lower_bound)
         upper_bound = eos.s2b(upper_bound)
         return self.db.walk_range(account_object_type, AccountObject.by_name, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_name(self, lower_bound: Name, upper_bound: Name, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        def row_key(obj):
+            return eos.s2b(obj.name)
+        return iter_objects(self.db, account_object_type, self.object_class, AccountObject.by_name, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_name(self, lower_bound: Name, upper_bound: Name) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        return self.db.count_range(account_object_type, AccountObject.by_name, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(account_object_type, AccountObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_name(self, lower_bound: Name):
         lower_bound = eos.s2b(lower_bound)
@@ -257,7 +401,7 @@ class AccountObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -265,7 +409,7 @@ class AccountObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_name(self, upper_bound: Name):
         upper_bound = eos.s2b(upper_bound)
@@ -273,7 +417,7 @@ class AccountObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: AccountObject):
         key = i2b(perm.table_id)
@@ -286,8 +430,9 @@ class AccountObjectIndex(object):
 
 # account_metadata_object_type = 2
 class AccountMetadataObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(AccountMetadataObject) if lazy else AccountMetadataObject
 
     def create(self, obj: AccountMetadataObject):
         enc = Encoder()
@@ -304,7 +449,7 @@ class AccountMetadataObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_name(self, name: Name):
         key = eos.s2b(name)
@@ -312,14 +457,14 @@ class AccountMetadataObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = AccountMetadataObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -333,18 +478,58 @@ class AccountMetadataObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(account_metadata_object_type, AccountMetadataObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, account_metadata_object_type, self.object_class, AccountMetadataObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(account_metadata_object_type, AccountMetadataObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_name(self, lower_bound: Name, upper_bound: Name, cb, user_data=None, raw_data=False):
         lower_bound = eos.s2b(lower_bound)
         upper_bound = eos.s2b(upper_bound)
         return self.db.walk_range(account_metadata_object_type, AccountMetadataObject.by_name, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_name(self, lower_bound: Name, upper_bound: Name, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        def row_key(obj):
+            return eos.s2b(obj.name)
+        return iter_objects(self.db, account_metadata_object_type, self.object_class, AccountMetadataObject.by_name, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_name(self, lower_bound: Name, upper_bound: Name) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        return self.db.count_range(account_metadata_object_type, AccountMetadataObject.by_name, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(account_metadata_object_type, AccountMetadataObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_name(self, lower_bound: Name):
         lower_bound = eos.s2b(lower_bound)
@@ -352,7 +537,7 @@ class AccountMetadataObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -360,7 +545,7 @@ class AccountMetadataObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_name(self, upper_bound: Name):
         upper_bound = eos.s2b(upper_bound)
@@ -368,7 +553,7 @@ class AccountMetadataObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountMetadataObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: AccountMetadataObject):
         key = i2b(perm.table_id)
@@ -382,8 +567,9 @@ class AccountMetadataObjectIndex(object):
 # permission_object_type = 3
 class PermissionObjectIndex(object):
     
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(PermissionObject) if lazy else PermissionObject
 
     def create(self, obj: PermissionObject):
         enc = Encoder()
@@ -400,7 +586,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_parent(self, parent: I64, table_id: I64):
         """
@@ -411,7 +597,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_owner(self, owner: Name, name: Name):
         key = PermissionObject.generate_key_by_owner(owner, name)
@@ -419,7 +605,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_name(self, name: Name, table_id: I64):
         """
@@ -430,7 +616,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: PermissionObject):
         key = i2b(perm.table_id)
@@ -446,7 +632,7 @@ class PermissionObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = PermissionObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -466,28 +652,108 @@ class PermissionObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(permission_object_type, PermissionObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, permission_object_type, self.object_class, PermissionObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(permission_object_type, PermissionObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_parent(self, lower_bound: Tuple[I64, I64], upper_bound: Tuple[I64, I64], cb, user_data=None, raw_data=False):
         lower_bound = PermissionObject.generate_key_by_parent(*lower_bound)
         upper_bound = PermissionObject.generate_key_by_parent(*upper_bound)
         return self.db.walk_range(permission_object_type, PermissionObject.by_parent, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_parent(self, lower_bound: Tuple[I64, I64], upper_bound: Tuple[I64, I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = PermissionObject.generate_key_by_parent(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_parent(*upper_bound)
+        def row_key(obj):
+            return PermissionObject.generate_key_by_parent(obj.parent, obj.table_id)
+        return iter_objects(self.db, permission_object_type, self.object_class, PermissionObject.by_parent, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_parent(self, lower_bound: Tuple[I64, I64], upper_bound: Tuple[I64, I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = PermissionObject.generate_key_by_parent(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_parent(*upper_bound)
+        return self.db.count_range(permission_object_type, PermissionObject.by_parent, lower_bound, upper_bound)
+
     def walk_range_by_owner(self, lower_bound: Tuple[Name, Name], upper_bound: Tuple[Name, Name], cb, user_data=None, raw_data=False):
         lower_bound = PermissionObject.generate_key_by_owner(*lower_bound)
         upper_bound = PermissionObject.generate_key_by_owner(*upper_bound)
         return self.db.walk_range(permission_object_type, PermissionObject.by_owner, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_owner(self, lower_bound: Tuple[Name, Name], upper_bound: Tuple[Name, Name], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = PermissionObject.generate_key_by_owner(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_owner(*upper_bound)
+        def row_key(obj):
+            return PermissionObject.generate_key_by_owner(obj.owner, obj.name)
+        return iter_objects(self.db, permission_object_type, self.object_class, PermissionObject.by_owner, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_owner(self, lower_bound: Tuple[Name, Name], upper_bound: Tuple[Name, Name]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = PermissionObject.generate_key_by_owner(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_owner(*upper_bound)
+        return self.db.count_range(permission_object_type, PermissionObject.by_owner, lower_bound, upper_bound)
+
     def walk_range_by_name(self, lower_bound: Tuple[Name, I64], upper_bound: Tuple[Name, I64], cb, user_data=None, raw_data=False):
         lower_bound = PermissionObject.generate_key_by_name(*lower_bound)
         upper_bound = PermissionObject.generate_key_by_name(*upper_bound)
         return self.db.walk_range(permission_object_type, PermissionObject.by_name, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_name(self, lower_bound: Tuple[Name, I64], upper_bound: Tuple[Name, I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = PermissionObject.generate_key_by_name(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_name(*upper_bound)
+        def row_key(obj):
+            return PermissionObject.generate_key_by_name(obj.name, obj.table_id)
+        return iter_objects(self.db, permission_object_type, self.object_class, PermissionObject.by_name, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_name(self, lower_bound: Tuple[Name, I64], upper_bound: Tuple[Name, I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = PermissionObject.generate_key_by_name(*lower_bound)
+        upper_bound = PermissionObject.generate_key_by_name(*upper_bound)
+        return self.db.count_range(permission_object_type, PermissionObject.by_name, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, table_id: I64):
         key = i2b(table_id)
         data = self.db.lower_bound(permission_object_type, PermissionObject.by_id, key)
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_parent(self, parent: I64, table_id: I64):
         key = PermissionObject.generate_key_by_parent(parent, table_id)
@@ -495,7 +761,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def lower_bound_by_owner(self, owner: Name, name: Name):
         key = PermissionObject.generate_key_by_owner(owner, name)
@@ -503,7 +769,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_name(self, name: Name, table_id: I64):
         key = PermissionObject.generate_key_by_name(name, table_id)
@@ -511,7 +777,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, table_id: I64):
         key = i2b(table_id)
@@ -519,7 +785,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_parent(self, parent: I64, table_id: I64):
         key = PermissionObject.generate_key_by_parent(parent, table_id)
@@ -527,7 +793,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_owner(self, owner: Name, name: Name):
         key = PermissionObject.generate_key_by_owner(owner, name)
@@ -535,7 +801,7 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_name(self, name: Name, table_id: I64):
         key = PermissionObject.generate_key_by_name(name, table_id)
@@ -543,12 +809,13 @@ class PermissionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # permission_usage_object_type = 4
 class PermissionUsageObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(PermissionUsageObject) if lazy else PermissionUsageObject
 
     def create(self, perm: PermissionUsageObject):
         enc = Encoder()
@@ -565,7 +832,7 @@ class PermissionUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: PermissionUsageObject):
         key = i2b(perm.table_id)
@@ -581,7 +848,7 @@ class PermissionUsageObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = PermissionUsageObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -592,13 +859,33 @@ class PermissionUsageObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(permission_usage_object_type, PermissionUsageObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, permission_usage_object_type, self.object_class, PermissionUsageObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(permission_usage_object_type, PermissionUsageObject.by_id, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(permission_usage_object_type, PermissionUsageObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -606,12 +893,13 @@ class PermissionUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # permission_link_object_type = 5
 class PermissionLinkObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(PermissionLinkObject) if lazy else PermissionLinkObject
 
     def create(self, perm: PermissionLinkObject):
         enc = Encoder()
@@ -628,7 +916,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_action_name(self, action: Name, code: Name, message_type: Name):
         key = PermissionLinkObject.generate_key_by_action_name(action, code, message_type)
@@ -636,7 +924,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_permission_name(self, account: Name, required_permission: Name, table_id: I64):
         key = PermissionLinkObject.generate_key_by_permission_name(account, required_permission, table_id)
@@ -644,7 +932,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: PermissionLinkObject):
         key = i2b(perm.table_id)
@@ -660,7 +948,7 @@ class PermissionLinkObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = PermissionLinkObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -677,23 +965,83 @@ class PermissionLinkObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(permission_link_object_type, PermissionLinkObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, permission_link_object_type, self.object_class, PermissionLinkObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(permission_link_object_type, PermissionLinkObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_action_name(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name], cb, user_data=None, raw_data=False):
         lower_bound = PermissionLinkObject.generate_key_by_action_name(*lower_bound)
         upper_bound = PermissionLinkObject.generate_key_by_action_name(*upper_bound)
         return self.db.walk_range(permission_link_object_type, PermissionLinkObject.by_action_name, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_action_name(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = PermissionLinkObject.generate_key_by_action_name(*lower_bound)
+        upper_bound = PermissionLinkObject.generate_key_by_action_name(*upper_bound)
+        def row_key(obj):
+            return PermissionLinkObject.generate_key_by_action_name(obj.account, obj.code, obj.message_type)
+        return iter_objects(self.db, permission_link_object_type, self.object_class, PermissionLinkObject.by_action_name, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_action_name(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = PermissionLinkObject.generate_key_by_action_name(*lower_bound)
+        upper_bound = PermissionLinkObject.generate_key_by_action_name(*upper_bound)
+        return self.db.count_range(permission_link_object_type, PermissionLinkObject.by_action_name, lower_bound, upper_bound)
+
     def walk_range_by_permission_name(self, lower_bound: Tuple[Name, Name, I64], upper_bound: Tuple[Name, Name, I64], cb, user_data=None, raw_data=False):
         lower_bound = PermissionLinkObject.generate_key_by_permission_name(*lower_bound)
         upper_bound = PermissionLinkObject.generate_key_by_permission_name(*upper_bound)
         return self.db.walk_range(permission_link_object_type, PermissionLinkObject.by_permission_name, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_permission_name(self, lower_bound: Tuple[Name, Name, I64], upper_bound: Tuple[Name, Name, I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = PermissionLinkObject.generate_key_by_permission_name(*lower_bound)
+        upper_bound = PermissionLinkObject.generate_key_by_permission_name(*upper_bound)
+        def row_key(obj):
+            return PermissionLinkObject.generate_key_by_permission_name(obj.account, obj.required_permission, obj.table_id)
+        return iter_objects(self.db, permission_link_object_type, self.object_class, PermissionLinkObject.by_permission_name, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_permission_name(self, lower_bound: Tuple[Name, Name, I64], upper_bound: Tuple[Name, Name, I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = PermissionLinkObject.generate_key_by_permission_name(*lower_bound)
+        upper_bound = PermissionLinkObject.generate_key_by_permission_name(*upper_bound)
+        return self.db.count_range(permission_link_object_type, PermissionLinkObject.by_permission_name, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(permission_link_object_type, PermissionLinkObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_action_name(self, lower_bound: Tuple[Name, Name, Name]):
         lower_bound = PermissionLinkObject.generate_key_by_action_name(*lower_bound)
@@ -701,7 +1049,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_permission_name(self, lower_bound: Tuple[Name, Name, I64]):
         lower_bound = PermissionLinkObject.generate_key_by_permission_name(*lower_bound)
@@ -709,7 +1057,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -717,7 +1065,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_action_name(self, upper_bound: Tuple[Name, Name, Name]):
         upper_bound = PermissionLinkObject.generate_key_by_action_name(*upper_bound)
@@ -725,7 +1073,7 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_permission_name(self, upper_bound: Tuple[Name, Name, I64]):
         upper_bound = PermissionLinkObject.generate_key_by_permission_name(*upper_bound)
@@ -733,13 +1081,14 @@ class PermissionLinkObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return PermissionLinkObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 
 # key_value_object_type = 7
 class KeyValueObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(KeyValueObject) if lazy else KeyValueObject
 
     def create(self, perm: KeyValueObject):
         enc = Encoder()
@@ -756,7 +1105,7 @@ class KeyValueObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_scope_primary(self, t_id: I64, primary_key: U64):
         key = KeyValueObject.generate_key_by_scope_primary(t_id, primary_key)
@@ -764,7 +1113,7 @@ class KeyValueObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: KeyValueObject):
         key = i2b(perm.table_id)
@@ -775,12 +1124,18 @@ class KeyValueObjectIndex(object):
     def row_count(self):
         return self.db.row_count(key_value_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, key_value_object_type, KeyValueObject, columns, KeyValueObject.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = KeyValueObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -794,18 +1149,72 @@ class KeyValueObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(key_value_object_type, KeyValueObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, key_value_object_type, self.object_class, KeyValueObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(key_value_object_type, KeyValueObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_scope_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = KeyValueObject.generate_key_by_scope_primary(*lower_bound)
         upper_bound = KeyValueObject.generate_key_by_scope_primary(*upper_bound)
         return self.db.walk_range(key_value_object_type, KeyValueObject.by_scope_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_scope_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = KeyValueObject.generate_key_by_scope_primary(*lower_bound)
+        upper_bound = KeyValueObject.generate_key_by_scope_primary(*upper_bound)
+        def row_key(obj):
+            return KeyValueObject.generate_key_by_scope_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, key_value_object_type, self.object_class, KeyValueObject.by_scope_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_scope_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = KeyValueObject.generate_key_by_scope_primary(*lower_bound)
+        upper_bound = KeyValueObject.generate_key_by_scope_primary(*upper_bound)
+        return self.db.count_range(key_value_object_type, KeyValueObject.by_scope_primary, lower_bound, upper_bound)
+
+    def stats_by_table(self, t_id: I64) -> Tuple[int, int]:
+        """
+        Returns (count, packed_size) of the rows of a table, `t_id` is the id of the `TableIdObject` of the code, scope and table.
+        The rows are walked in the database, the cost is linear in the number of rows of the table.
+        `packed_size` includes the id, table id, primary key and payer of each row, it is not the RAM billed to the payers,
+        which is the size of each value plus a fixed overhead per row.
+        """
+        lower_bound = KeyValueObject.generate_key_by_scope_primary(t_id, 0)
+        upper_bound = KeyValueObject.generate_key_by_scope_primary(t_id, 0xffffffffffffffff)
+        return self.db.range_stats(key_value_object_type, KeyValueObject.by_scope_primary, lower_bound, upper_bound)
+
+    def count_by_table(self, t_id: I64) -> int:
+        return self.stats_by_table(t_id)[0]
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(key_value_object_type, KeyValueObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_scope_primary(self, lower_bound: Tuple[I64, U64]):
         lower_bound = KeyValueObject.generate_key_by_scope_primary(*lower_bound)
@@ -813,7 +1222,7 @@ class KeyValueObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -821,7 +1230,7 @@ class KeyValueObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_scope_primary(self, upper_bound: Tuple[I64, U64]):
         upper_bound = KeyValueObject.generate_key_by_scope_primary(*upper_bound)
@@ -829,12 +1238,13 @@ class KeyValueObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return KeyValueObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # index64_object_type = 8
 class Index64ObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(Index64Object) if lazy else Index64Object
 
     def create(self, obj: Index64Object):
         enc = Encoder()
@@ -851,7 +1261,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_primary(self, t_id: I64, primary_key: U64):
         key = i2b(t_id) + u2b(primary_key)
@@ -859,7 +1269,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_secondary(self, t_id: I64, secondary_key: U64, primary_key: U64):
         key = i2b(t_id) + u2b(secondary_key) + u2b(primary_key)
@@ -867,7 +1277,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: Index64Object):
         key = i2b(perm.table_id)
@@ -878,12 +1288,18 @@ class Index64ObjectIndex(object):
     def row_count(self):
         return self.db.row_count(index64_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, index64_object_type, Index64Object, columns, Index64Object.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = Index64Object.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -900,23 +1316,83 @@ class Index64ObjectIndex(object):
         upper_bound = u2b(upper_bound)
         return self.db.walk_range(index64_object_type, Index64Object.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = u2b(lower_bound)
+        upper_bound = u2b(upper_bound)
+        def row_key(obj):
+            return u2b(obj.table_id)
+        return iter_objects(self.db, index64_object_type, self.object_class, Index64Object.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = u2b(lower_bound)
+        upper_bound = u2b(upper_bound)
+        return self.db.count_range(index64_object_type, Index64Object.by_id, lower_bound, upper_bound)
+
     def walk_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index64Object.generate_key_by_primary(*lower_bound)
         upper_bound = Index64Object.generate_key_by_primary(*upper_bound)
         return self.db.walk_range(index64_object_type, Index64Object.by_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index64Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index64Object.generate_key_by_primary(*upper_bound)
+        def row_key(obj):
+            return Index64Object.generate_key_by_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, index64_object_type, self.object_class, Index64Object.by_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index64Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index64Object.generate_key_by_primary(*upper_bound)
+        return self.db.count_range(index64_object_type, Index64Object.by_primary, lower_bound, upper_bound)
+
     def walk_range_by_secondary(self, lower_bound: Tuple[I64, U64, U64], upper_bound: Tuple[I64, U64, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index64Object.generate_key_by_secondary(*lower_bound)
         upper_bound = Index64Object.generate_key_by_secondary(*upper_bound)
         return self.db.walk_range(index64_object_type, Index64Object.by_secondary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_secondary(self, lower_bound: Tuple[I64, U64, U64], upper_bound: Tuple[I64, U64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index64Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index64Object.generate_key_by_secondary(*upper_bound)
+        def row_key(obj):
+            return Index64Object.generate_key_by_secondary(obj.t_id, obj.secondary_key, obj.primary_key)
+        return iter_objects(self.db, index64_object_type, self.object_class, Index64Object.by_secondary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_secondary(self, lower_bound: Tuple[I64, U64, U64], upper_bound: Tuple[I64, U64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index64Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index64Object.generate_key_by_secondary(*upper_bound)
+        return self.db.count_range(index64_object_type, Index64Object.by_secondary, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = u2b(lower_bound)
         data = self.db.lower_bound(index64_object_type, Index64Object.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_primary(self, t_id: I64, primary_key: U64):
         lower_bound = Index64Object.generate_key_by_primary(t_id, primary_key)
@@ -924,7 +1400,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_secondary(self, t_id: I64, secondary_key: U64, primary_key: U64):
         lower_bound = Index64Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -932,7 +1408,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = u2b(upper_bound)
@@ -940,7 +1416,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_primary(self, t_id: I64, primary_key: U64):
         upper_bound = Index64Object.generate_key_by_primary(t_id, primary_key)
@@ -948,7 +1424,7 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_secondary(self, t_id: I64, secondary_key: U64, primary_key: U64):
         upper_bound = Index64Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -956,12 +1432,13 @@ class Index64ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index64Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # index128_object_type = 9
 class Index128ObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(Index128Object) if lazy else Index128Object
 
     def create(self, obj: Index128Object):
         enc = Encoder()
@@ -978,7 +1455,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_primary(self, t_id: I64, primary_key: U64):
         key = i2b(t_id) + u2b(primary_key)
@@ -986,7 +1463,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_secondary(self, t_id: I64, secondary_key: U128, primary_key: U64):
         key = i2b(t_id) + u2b(secondary_key, 16) + u2b(primary_key)
@@ -994,7 +1471,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: Index128Object):
         key = i2b(perm.table_id)
@@ -1005,12 +1482,18 @@ class Index128ObjectIndex(object):
     def row_count(self):
         return self.db.row_count(index128_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, index128_object_type, Index128Object, columns, Index128Object.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = Index128Object.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1027,23 +1510,83 @@ class Index128ObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(index128_object_type, Index128Object.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, index128_object_type, self.object_class, Index128Object.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(index128_object_type, Index128Object.by_id, lower_bound, upper_bound)
+
     def walk_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index128Object.generate_key_by_primary(*lower_bound)
         upper_bound = Index128Object.generate_key_by_primary(*upper_bound)
         return self.db.walk_range(index128_object_type, Index128Object.by_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index128Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index128Object.generate_key_by_primary(*upper_bound)
+        def row_key(obj):
+            return Index128Object.generate_key_by_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, index128_object_type, self.object_class, Index128Object.by_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index128Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index128Object.generate_key_by_primary(*upper_bound)
+        return self.db.count_range(index128_object_type, Index128Object.by_primary, lower_bound, upper_bound)
+
     def walk_range_by_secondary(self, lower_bound: Tuple[I64, U128, U64], upper_bound: Tuple[I64, U128, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index128Object.generate_key_by_secondary(*lower_bound)
         upper_bound = Index128Object.generate_key_by_secondary(*upper_bound)
         return self.db.walk_range(index128_object_type, Index128Object.by_secondary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_secondary(self, lower_bound: Tuple[I64, U128, U64], upper_bound: Tuple[I64, U128, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index128Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index128Object.generate_key_by_secondary(*upper_bound)
+        def row_key(obj):
+            return Index128Object.generate_key_by_secondary(obj.t_id, obj.secondary_key, obj.primary_key)
+        return iter_objects(self.db, index128_object_type, self.object_class, Index128Object.by_secondary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_secondary(self, lower_bound: Tuple[I64, U128, U64], upper_bound: Tuple[I64, U128, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index128Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index128Object.generate_key_by_secondary(*upper_bound)
+        return self.db.count_range(index128_object_type, Index128Object.by_secondary, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(index128_object_type, Index128Object.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_primary(self, t_id: I64, primary_key: U64):
         lower_bound = Index128Object.generate_key_by_primary(t_id, primary_key)
@@ -1051,7 +1594,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_secondary(self, t_id: I64, secondary_key: U128, primary_key: U64):
         lower_bound = Index128Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1059,7 +1602,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1067,7 +1610,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_primary(self, t_id: I64, primary_key: U64):
         upper_bound = Index128Object.generate_key_by_primary(t_id, primary_key)
@@ -1075,7 +1618,7 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_secondary(self, t_id: I64, secondary_key: U128, primary_key: U64):
         upper_bound = Index128Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1083,12 +1626,13 @@ class Index128ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index128Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # index256_object_type = 10
 class Index256ObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(Index256Object) if lazy else Index256Object
 
     def create(self, obj: Index256Object):
         enc = Encoder()
@@ -1105,7 +1649,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_primary(self, t_id: I64, primary_key: U64):
         key = i2b(t_id) + u2b(primary_key)
@@ -1113,7 +1657,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_secondary(self, t_id: I64, secondary_key: U256, primary_key: U64):
         key = i2b(t_id) + u2b(secondary_key, 32) + u2b(primary_key)
@@ -1121,7 +1665,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: Index256Object):
         key = i2b(perm.table_id)
@@ -1132,12 +1676,18 @@ class Index256ObjectIndex(object):
     def row_count(self):
         return self.db.row_count(index256_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, index256_object_type, Index256Object, columns, Index256Object.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = Index256Object.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1154,23 +1704,83 @@ class Index256ObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(index256_object_type, Index256Object.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, index256_object_type, self.object_class, Index256Object.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(index256_object_type, Index256Object.by_id, lower_bound, upper_bound)
+
     def walk_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index256Object.generate_key_by_primary(*lower_bound)
         upper_bound = Index256Object.generate_key_by_primary(*upper_bound)
         return self.db.walk_range(index256_object_type, Index256Object.by_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index256Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index256Object.generate_key_by_primary(*upper_bound)
+        def row_key(obj):
+            return Index256Object.generate_key_by_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, index256_object_type, self.object_class, Index256Object.by_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index256Object.generate_key_by_primary(*lower_bound)
+        upper_bound = Index256Object.generate_key_by_primary(*upper_bound)
+        return self.db.count_range(index256_object_type, Index256Object.by_primary, lower_bound, upper_bound)
+
     def walk_range_by_secondary(self, lower_bound: Tuple[I64, U256, U64], upper_bound: Tuple[I64, U256, U64], cb, user_data=None, raw_data=False):
         lower_bound = Index256Object.generate_key_by_secondary(*lower_bound)
         upper_bound = Index256Object.generate_key_by_secondary(*upper_bound)
         return self.db.walk_range(index256_object_type, Index256Object.by_secondary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_secondary(self, lower_bound: Tuple[I64, U256, U64], upper_bound: Tuple[I64, U256, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = Index256Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index256Object.generate_key_by_secondary(*upper_bound)
+        def row_key(obj):
+            return Index256Object.generate_key_by_secondary(obj.t_id, obj.secondary_key, obj.primary_key)
+        return iter_objects(self.db, index256_object_type, self.object_class, Index256Object.by_secondary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_secondary(self, lower_bound: Tuple[I64, U256, U64], upper_bound: Tuple[I64, U256, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = Index256Object.generate_key_by_secondary(*lower_bound)
+        upper_bound = Index256Object.generate_key_by_secondary(*upper_bound)
+        return self.db.count_range(index256_object_type, Index256Object.by_secondary, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(index256_object_type, Index256Object.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_primary(self, t_id: I64, primary_key: U64):
         lower_bound = Index256Object.generate_key_by_primary(t_id, primary_key)
@@ -1178,7 +1788,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_secondary(self, t_id: I64, secondary_key: U256, primary_key: U64):
         lower_bound = Index256Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1186,7 +1796,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1194,7 +1804,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_primary(self, t_id: I64, primary_key: U64):
         upper_bound = Index256Object.generate_key_by_primary(t_id, primary_key)
@@ -1202,7 +1812,7 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_secondary(self, t_id: I64, secondary_key: U256, primary_key: U64):
         upper_bound = Index256Object.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1210,12 +1820,13 @@ class Index256ObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return Index256Object.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # index_double_object_type = 11
 class IndexDoubleObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(IndexDoubleObject) if lazy else IndexDoubleObject
 
     def create(self, obj: IndexDoubleObject):
         enc = Encoder()
@@ -1232,7 +1843,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_primary(self, t_id: I64, primary_key: U64):
         key = i2b(t_id) + u2b(primary_key)
@@ -1240,7 +1851,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_secondary(self, t_id: I64, secondary_key: F64, primary_key: U64):
         key = i2b(t_id) + f2b(secondary_key) + u2b(primary_key)
@@ -1248,7 +1859,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: IndexDoubleObject):
         key = i2b(perm.table_id)
@@ -1259,12 +1870,18 @@ class IndexDoubleObjectIndex(object):
     def row_count(self):
         return self.db.row_count(index_double_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, index_double_object_type, IndexDoubleObject, columns, IndexDoubleObject.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = IndexDoubleObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1276,28 +1893,88 @@ class IndexDoubleObjectIndex(object):
     def walk_by_secondary(self, cb, user_data=None, raw_data=False):
         return self.db.walk(index_double_object_type, IndexDoubleObject.by_secondary, self.on_object_data, (cb, raw_data, user_data))
 
-    def walk_range_by_id(self, lower_bound: I64, upper_bound: I64, cb, user_data=None, raw_data=False):
+    def walk_range_by_id(self, lower_bound: I64, upper_bound: I64, cb, user_data=None, raw_data=False):
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.walk_range(index_double_object_type, IndexDoubleObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
+
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, index_double_object_type, self.object_class, IndexDoubleObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
         lower_bound = i2b(lower_bound)
         upper_bound = i2b(upper_bound)
-        return self.db.walk_range(index_double_object_type, IndexDoubleObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
+        return self.db.count_range(index_double_object_type, IndexDoubleObject.by_id, lower_bound, upper_bound)
 
     def walk_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = IndexDoubleObject.generate_key_by_primary(*lower_bound)
         upper_bound = IndexDoubleObject.generate_key_by_primary(*upper_bound)
         return self.db.walk_range(index_double_object_type, IndexDoubleObject.by_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = IndexDoubleObject.generate_key_by_primary(*lower_bound)
+        upper_bound = IndexDoubleObject.generate_key_by_primary(*upper_bound)
+        def row_key(obj):
+            return IndexDoubleObject.generate_key_by_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, index_double_object_type, self.object_class, IndexDoubleObject.by_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = IndexDoubleObject.generate_key_by_primary(*lower_bound)
+        upper_bound = IndexDoubleObject.generate_key_by_primary(*upper_bound)
+        return self.db.count_range(index_double_object_type, IndexDoubleObject.by_primary, lower_bound, upper_bound)
+
     def walk_range_by_secondary(self, lower_bound: Tuple[I64, F64, U64], upper_bound: Tuple[I64, F64, U64], cb, user_data=None, raw_data=False):
         lower_bound = IndexDoubleObject.generate_key_by_secondary(*lower_bound)
         upper_bound = IndexDoubleObject.generate_key_by_secondary(*upper_bound)
         return self.db.walk_range(index_double_object_type, IndexDoubleObject.by_secondary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_secondary(self, lower_bound: Tuple[I64, F64, U64], upper_bound: Tuple[I64, F64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = IndexDoubleObject.generate_key_by_secondary(*lower_bound)
+        upper_bound = IndexDoubleObject.generate_key_by_secondary(*upper_bound)
+        def row_key(obj):
+            return IndexDoubleObject.generate_key_by_secondary(obj.t_id, obj.secondary_key, obj.primary_key)
+        return iter_objects(self.db, index_double_object_type, self.object_class, IndexDoubleObject.by_secondary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_secondary(self, lower_bound: Tuple[I64, F64, U64], upper_bound: Tuple[I64, F64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = IndexDoubleObject.generate_key_by_secondary(*lower_bound)
+        upper_bound = IndexDoubleObject.generate_key_by_secondary(*upper_bound)
+        return self.db.count_range(index_double_object_type, IndexDoubleObject.by_secondary, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(index_double_object_type, IndexDoubleObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_primary(self, t_id: I64, primary_key: U64):
         lower_bound = IndexDoubleObject.generate_key_by_primary(t_id, primary_key)
@@ -1305,7 +1982,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def lower_bound_by_secondary(self, t_id: I64, secondary_key: F64, primary_key: U64):
         lower_bound = IndexDoubleObject.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1313,7 +1990,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1321,7 +1998,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_primary(self, t_id: I64, primary_key: U64):
         upper_bound = IndexDoubleObject.generate_key_by_primary(t_id, primary_key)
@@ -1329,7 +2006,7 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_secondary(self, t_id: I64, secondary_key: F64, primary_key: U64):
         upper_bound = IndexDoubleObject.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1337,12 +2014,13 @@ class IndexDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # index_long_double_object_type = 12
 class IndexLongDoubleObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(IndexLongDoubleObject) if lazy else IndexLongDoubleObject
 
     def create(self, obj: IndexLongDoubleObject):
         enc = Encoder()
@@ -1359,7 +2037,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_primary(self, t_id: I64, primary_key: U64):
         key = i2b(t_id) + u2b(primary_key)
@@ -1367,7 +2045,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_secondary(self, t_id: I64, secondary_key: F128, primary_key: U64):
         key = i2b(t_id) + to_bytes(secondary_key) + u2b(primary_key)
@@ -1375,7 +2053,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 
     def modify(self, perm: IndexLongDoubleObject):
@@ -1387,6 +2065,12 @@ class IndexLongDoubleObjectIndex(object):
     def row_count(self):
         return self.db.row_count(index_long_double_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, index_long_double_object_type, IndexLongDoubleObject, columns, IndexLongDoubleObject.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         try:
             cb, raw_data, user_data = custom_data
@@ -1398,7 +2082,7 @@ class IndexLongDoubleObjectIndex(object):
                 return ret
 
             dec = Decoder(data)
-            obj = IndexLongDoubleObject.unpack(dec)
+            obj = self.object_class.unpack(dec)
             return call_cb(cb, obj, user_data)
         except Exception as e:
             logger.exception(e)
@@ -1418,23 +2102,83 @@ class IndexLongDoubleObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(index_long_double_object_type, IndexLongDoubleObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, index_long_double_object_type, self.object_class, IndexLongDoubleObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(index_long_double_object_type, IndexLongDoubleObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], cb, user_data=None, raw_data=False):
         lower_bound = IndexLongDoubleObject.generate_key_by_primary(*lower_bound)
         upper_bound = IndexLongDoubleObject.generate_key_by_primary(*upper_bound)
         return self.db.walk_range(index_long_double_object_type, IndexLongDoubleObject.by_primary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = IndexLongDoubleObject.generate_key_by_primary(*lower_bound)
+        upper_bound = IndexLongDoubleObject.generate_key_by_primary(*upper_bound)
+        def row_key(obj):
+            return IndexLongDoubleObject.generate_key_by_primary(obj.t_id, obj.primary_key)
+        return iter_objects(self.db, index_long_double_object_type, self.object_class, IndexLongDoubleObject.by_primary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_primary(self, lower_bound: Tuple[I64, U64], upper_bound: Tuple[I64, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = IndexLongDoubleObject.generate_key_by_primary(*lower_bound)
+        upper_bound = IndexLongDoubleObject.generate_key_by_primary(*upper_bound)
+        return self.db.count_range(index_long_double_object_type, IndexLongDoubleObject.by_primary, lower_bound, upper_bound)
+
     def walk_range_by_secondary(self, lower_bound: Tuple[I64, F128, U64], upper_bound: Tuple[I64, F128, U64], cb, user_data=None, raw_data=False):
         lower_bound = IndexLongDoubleObject.generate_key_by_secondary(*lower_bound)
         upper_bound = IndexLongDoubleObject.generate_key_by_secondary(*upper_bound)
         return self.db.walk_range(index_long_double_object_type, IndexLongDoubleObject.by_secondary, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_secondary(self, lower_bound: Tuple[I64, F128, U64], upper_bound: Tuple[I64, F128, U64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = IndexLongDoubleObject.generate_key_by_secondary(*lower_bound)
+        upper_bound = IndexLongDoubleObject.generate_key_by_secondary(*upper_bound)
+        def row_key(obj):
+            return IndexLongDoubleObject.generate_key_by_secondary(obj.t_id, obj.secondary_key, obj.primary_key)
+        return iter_objects(self.db, index_long_double_object_type, self.object_class, IndexLongDoubleObject.by_secondary, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_secondary(self, lower_bound: Tuple[I64, F128, U64], upper_bound: Tuple[I64, F128, U64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = IndexLongDoubleObject.generate_key_by_secondary(*lower_bound)
+        upper_bound = IndexLongDoubleObject.generate_key_by_secondary(*upper_bound)
+        return self.db.count_range(index_long_double_object_type, IndexLongDoubleObject.by_secondary, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(index_long_double_object_type, IndexLongDoubleObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_primary(self, t_id: I64, lower_bound: U64):
         lower_bound = IndexLongDoubleObject.generate_key_by_primary(t_id, lower_bound)
@@ -1442,7 +2186,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_secondary(self, t_id: I64, lower_bound: F128, primary_key: U64):
         lower_bound = IndexLongDoubleObject.generate_key_by_secondary(t_id, lower_bound, primary_key)
@@ -1450,7 +2194,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1458,7 +2202,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_primary(self, t_id: I64, primary_key: U64):
         upper_bound = IndexLongDoubleObject.generate_key_by_primary(t_id, primary_key)
@@ -1466,7 +2210,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_secondary(self, t_id: I64, secondary_key: F128, primary_key: U64):
         upper_bound = IndexLongDoubleObject.generate_key_by_secondary(t_id, secondary_key, primary_key)
@@ -1474,7 +2218,7 @@ class IndexLongDoubleObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return IndexLongDoubleObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # global_property_object_type = 13
 class GlobalPropertyObjectIndex(object):
@@ -1515,8 +2259,9 @@ class GlobalPropertyObjectIndex(object):
 
 # dynamic_global_property_object_type = 14
 class DynamicGlobalPropertyObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(DynamicGlobalPropertyObject) if lazy else DynamicGlobalPropertyObject
 
     def create(self, perm: DynamicGlobalPropertyObject):
         enc = Encoder()
@@ -1539,7 +2284,7 @@ class DynamicGlobalPropertyObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return DynamicGlobalPropertyObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: DynamicGlobalPropertyObject):
         key = u2b(0)
@@ -1552,8 +2297,9 @@ class DynamicGlobalPropertyObjectIndex(object):
 
 # block_summary_object_type = 15
 class BlockSummaryObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(BlockSummaryObject) if lazy else BlockSummaryObject
 
     def create(self, perm: BlockSummaryObject):
         enc = Encoder()
@@ -1570,7 +2316,7 @@ class BlockSummaryObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return BlockSummaryObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def modify(self, perm: BlockSummaryObject):
         key = i2b(perm.table_id)
@@ -1586,7 +2332,7 @@ class BlockSummaryObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = BlockSummaryObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1600,6 +2346,26 @@ class BlockSummaryObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(block_summary_object_type, BlockSummaryObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, block_summary_object_type, self.object_class, BlockSummaryObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(block_summary_object_type, BlockSummaryObject.by_id, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         return self.db.lower_bound(block_summary_object_type, BlockSummaryObject.by_id, lower_bound)
@@ -1610,8 +2376,9 @@ class BlockSummaryObjectIndex(object):
 
 # transaction_object_type = 16
 class TransactionObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(TransactionObject) if lazy else TransactionObject
 
     def create(self, perm: TransactionObject):
         enc = Encoder()
@@ -1628,7 +2395,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_trx_id(self, trx_id: Checksum256):
         key = trx_id.to_bytes()
@@ -1636,7 +2403,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_expiration(self, expiration: U32, table_id: I64):
         key = u2b(expiration, 4) + i2b(table_id)
@@ -1644,7 +2411,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: TransactionObject):
         key = i2b(perm.table_id)
@@ -1660,7 +2427,7 @@ class TransactionObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = TransactionObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1677,23 +2444,83 @@ class TransactionObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(transaction_object_type, TransactionObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, transaction_object_type, self.object_class, TransactionObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(transaction_object_type, TransactionObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_trx_id(self, lower_bound: Checksum256, upper_bound: Checksum256, cb, user_data=None, raw_data=False):
         lower_bound = lower_bound.to_bytes()
         upper_bound = upper_bound.to_bytes()
         return self.db.walk_range(transaction_object_type, TransactionObject.by_trx_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_trx_id(self, lower_bound: Checksum256, upper_bound: Checksum256, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = lower_bound.to_bytes()
+        upper_bound = upper_bound.to_bytes()
+        def row_key(obj):
+            return obj.trx_id.to_bytes()
+        return iter_objects(self.db, transaction_object_type, self.object_class, TransactionObject.by_trx_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_trx_id(self, lower_bound: Checksum256, upper_bound: Checksum256) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = lower_bound.to_bytes()
+        upper_bound = upper_bound.to_bytes()
+        return self.db.count_range(transaction_object_type, TransactionObject.by_trx_id, lower_bound, upper_bound)
+
     def walk_range_by_expiration(self, lower_bound: Union[U32, I64], upper_bound: Union[U32, I64], cb, user_data=None, raw_data=False):
         lower_bound = TransactionObject.generate_key_by_expiration(*lower_bound)
         upper_bound = TransactionObject.generate_key_by_expiration(*upper_bound)
         return self.db.walk_range(transaction_object_type, TransactionObject.by_expiration, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_expiration(self, lower_bound: Union[U32, I64], upper_bound: Union[U32, I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = TransactionObject.generate_key_by_expiration(*lower_bound)
+        upper_bound = TransactionObject.generate_key_by_expiration(*upper_bound)
+        def row_key(obj):
+            return TransactionObject.generate_key_by_expiration(obj.expiration, obj.table_id)
+        return iter_objects(self.db, transaction_object_type, self.object_class, TransactionObject.by_expiration, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_expiration(self, lower_bound: Union[U32, I64], upper_bound: Union[U32, I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = TransactionObject.generate_key_by_expiration(*lower_bound)
+        upper_bound = TransactionObject.generate_key_by_expiration(*upper_bound)
+        return self.db.count_range(transaction_object_type, TransactionObject.by_expiration, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(transaction_object_type, TransactionObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_trx_id(self, lower_bound: Checksum256):
         lower_bound = lower_bound.to_bytes()
@@ -1701,7 +2528,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_expiration(self, expiration: U32, table_id: I64):
         lower_bound = TransactionObject.generate_key_by_expiration(expiration, table_id)
@@ -1709,7 +2536,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1717,7 +2544,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_trx_id(self, upper_bound: Checksum256):
         upper_bound = upper_bound.to_bytes()
@@ -1725,7 +2552,7 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_expiration(self, expiration: U32, table_id: I64):
         upper_bound = TransactionObject.generate_key_by_expiration(expiration, table_id)
@@ -1733,12 +2560,13 @@ class TransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # generated_transaction_object_type = 17
 class GeneratedTransactionObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(GeneratedTransactionObject) if lazy else GeneratedTransactionObject
 
     def create(self, obj: GeneratedTransactionObject):
         enc = Encoder()
@@ -1755,7 +2583,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_trx_id(self, trx_id: Union[str, Checksum256]):
         if isinstance(trx_id, str):
@@ -1765,7 +2593,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def find_by_expiration(self, expiration: Union[I64, TimePoint], table_id: I64):
         key = GeneratedTransactionObject.generate_key_by_expiration(expiration, table_id)
@@ -1773,7 +2601,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_delay(self, delay: Union[I64, TimePoint], table_id: I64):
         key = GeneratedTransactionObject.generate_key_by_delay(delay, table_id)
@@ -1781,7 +2609,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_sender_id(self, sender_id: I64, table_id: I64):
         key = GeneratedTransactionObject.generate_key_by_sender_id(sender_id, table_id)
@@ -1789,7 +2617,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: GeneratedTransactionObject):
         key = i2b(perm.table_id)
@@ -1805,7 +2633,7 @@ class GeneratedTransactionObjectIndex(object):
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = GeneratedTransactionObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -1828,6 +2656,26 @@ class GeneratedTransactionObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(generated_transaction_object_type, GeneratedTransactionObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, generated_transaction_object_type, self.object_class, GeneratedTransactionObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(generated_transaction_object_type, GeneratedTransactionObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_trx_id(self, lower_bound: Union[bytes, Checksum256], upper_bound: Union[bytes, Checksum256], cb, user_data=None, raw_data=False):
         if isinstance(lower_bound, Checksum256):
             lower_bound = lower_bound.to_bytes()
@@ -1837,28 +2685,116 @@ class GeneratedTransactionObjectIndex(object):
         assert len(lower_bound) == 32 and len(upper_bound) == 32
         return self.db.walk_range(generated_transaction_object_type, GeneratedTransactionObject.by_trx_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_trx_id(self, lower_bound: Union[bytes, Checksum256], upper_bound: Union[bytes, Checksum256], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        if isinstance(lower_bound, Checksum256):
+            lower_bound = lower_bound.to_bytes()
+        if isinstance(upper_bound, Checksum256):
+            upper_bound = upper_bound.to_bytes()
+        assert isinstance(lower_bound, bytes) and isinstance(upper_bound, bytes)
+        assert len(lower_bound) == 32 and len(upper_bound) == 32
+        def row_key(obj):
+            return obj.trx_id.to_bytes()
+        return iter_objects(self.db, generated_transaction_object_type, self.object_class, GeneratedTransactionObject.by_trx_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_trx_id(self, lower_bound: Union[bytes, Checksum256], upper_bound: Union[bytes, Checksum256]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        if isinstance(lower_bound, Checksum256):
+            lower_bound = lower_bound.to_bytes()
+        if isinstance(upper_bound, Checksum256):
+            upper_bound = upper_bound.to_bytes()
+        assert isinstance(lower_bound, bytes) and isinstance(upper_bound, bytes)
+        assert len(lower_bound) == 32 and len(upper_bound) == 32
+        return self.db.count_range(generated_transaction_object_type, GeneratedTransactionObject.by_trx_id, lower_bound, upper_bound)
+
     def walk_range_by_expiration(self, lower_bound: Union[Union[I64, TimePoint], I64], upper_bound: Union[Union[I64, TimePoint], I64], cb, user_data=None, raw_data=False):
         lower_bound = GeneratedTransactionObject.generate_key_by_expiration(*lower_bound)
         upper_bound = GeneratedTransactionObject.generate_key_by_expiration(*upper_bound)
         return self.db.walk_range(generated_transaction_object_type, GeneratedTransactionObject.by_expiration, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_expiration(self, lower_bound: Union[Union[I64, TimePoint], I64], upper_bound: Union[Union[I64, TimePoint], I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_expiration(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_expiration(*upper_bound)
+        def row_key(obj):
+            return GeneratedTransactionObject.generate_key_by_expiration(obj.expiration, obj.table_id)
+        return iter_objects(self.db, generated_transaction_object_type, self.object_class, GeneratedTransactionObject.by_expiration, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_expiration(self, lower_bound: Union[Union[I64, TimePoint], I64], upper_bound: Union[Union[I64, TimePoint], I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_expiration(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_expiration(*upper_bound)
+        return self.db.count_range(generated_transaction_object_type, GeneratedTransactionObject.by_expiration, lower_bound, upper_bound)
+
     def walk_range_by_delay(self, lower_bound: Tuple[Union[I64, TimePoint], I64], upper_bound: Tuple[Union[I64, TimePoint], I64], cb, user_data=None, raw_data=False):
         lower_bound = GeneratedTransactionObject.generate_key_by_delay(*lower_bound)
         upper_bound = GeneratedTransactionObject.generate_key_by_delay(*upper_bound)
         return self.db.walk_range(generated_transaction_object_type, GeneratedTransactionObject.by_delay, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_delay(self, lower_bound: Tuple[Union[I64, TimePoint], I64], upper_bound: Tuple[Union[I64, TimePoint], I64], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_delay(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_delay(*upper_bound)
+        def row_key(obj):
+            return GeneratedTransactionObject.generate_key_by_delay(obj.delay_until, obj.table_id)
+        return iter_objects(self.db, generated_transaction_object_type, self.object_class, GeneratedTransactionObject.by_delay, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_delay(self, lower_bound: Tuple[Union[I64, TimePoint], I64], upper_bound: Tuple[Union[I64, TimePoint], I64]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_delay(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_delay(*upper_bound)
+        return self.db.count_range(generated_transaction_object_type, GeneratedTransactionObject.by_delay, lower_bound, upper_bound)
+
     def walk_range_by_sender_id(self, lower_bound: Tuple[Name, U128], upper_bound: Tuple[Name, U128], cb, user_data=None, raw_data=False):
         lower_bound = GeneratedTransactionObject.generate_key_by_sender_id(*lower_bound)
         upper_bound = GeneratedTransactionObject.generate_key_by_sender_id(*upper_bound)
         return self.db.walk_range(generated_transaction_object_type, GeneratedTransactionObject.by_sender_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_sender_id(self, lower_bound: Tuple[Name, U128], upper_bound: Tuple[Name, U128], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_sender_id(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_sender_id(*upper_bound)
+        def row_key(obj):
+            return GeneratedTransactionObject.generate_key_by_sender_id(obj.sender, obj.sender_id)
+        return iter_objects(self.db, generated_transaction_object_type, self.object_class, GeneratedTransactionObject.by_sender_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_sender_id(self, lower_bound: Tuple[Name, U128], upper_bound: Tuple[Name, U128]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = GeneratedTransactionObject.generate_key_by_sender_id(*lower_bound)
+        upper_bound = GeneratedTransactionObject.generate_key_by_sender_id(*upper_bound)
+        return self.db.count_range(generated_transaction_object_type, GeneratedTransactionObject.by_sender_id, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(generated_transaction_object_type, GeneratedTransactionObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_trx_id(self, lower_bound: Union[bytes, Checksum256]):
         if isinstance(lower_bound, Checksum256):
@@ -1870,7 +2806,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def lower_bound_by_expiration(self, expiration: Union[I64, TimePoint], table_id: I64):
         lower_bound = GeneratedTransactionObject.generate_key_by_expiration(expiration, table_id)
@@ -1878,7 +2814,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def lower_bound_by_delay(self, delay_until: Union[I64, TimePoint], table_id: I64):
         lower_bound = GeneratedTransactionObject.generate_key_by_delay(delay_until, table_id)
@@ -1886,7 +2822,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_sender_id(self, sender: Name, sender_id: U128):
         lower_bound = GeneratedTransactionObject.generate_key_by_sender_id(sender, sender_id)
@@ -1894,7 +2830,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -1902,7 +2838,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_trx_id(self, upper_bound: Union[bytes, Checksum256]):
         if isinstance(upper_bound, Checksum256):
@@ -1914,7 +2850,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_expiration(self, expiration: Union[I64, TimePoint], table_id: I64):
         upper_bound = GeneratedTransactionObject.generate_key_by_expiration(expiration, table_id)
@@ -1922,7 +2858,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_delay(self, delay_until: Union[I64, TimePoint], table_id: I64):
         upper_bound = GeneratedTransactionObject.generate_key_by_delay(delay_until, table_id)
@@ -1930,7 +2866,7 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_sender_id(self, sender: Name, sender_id: U128):
         upper_bound = GeneratedTransactionObject.generate_key_by_sender_id(sender, sender_id)
@@ -1938,12 +2874,13 @@ class GeneratedTransactionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return GeneratedTransactionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # table_id_object_type = 30
 class TableIdObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(TableIdObject) if lazy else TableIdObject
 
     def create(self, perm: TableIdObject):
         enc = Encoder()
@@ -1960,7 +2897,7 @@ class TableIdObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_code_scope_table(self, code: Name, scope: Name, table: Name):
         key = TableIdObject.generate_key_by_code_scope_table(code, scope, table)
@@ -1968,7 +2905,7 @@ class TableIdObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: TableIdObject):
         key = i2b(perm.table_id)
@@ -1979,6 +2916,12 @@ class TableIdObjectIndex(object):
     def row_count(self):
         return self.db.row_count(table_id_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, table_id_object_type, TableIdObject, columns, TableIdObject.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
@@ -1989,7 +2932,7 @@ class TableIdObjectIndex(object):
             return ret
 
         dec = Decoder(data)
-        obj = TableIdObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         ret = cb(obj, user_data)
         if not isinstance(ret, (bool, int)):
             logger.error(f"{cb} can only return 1 or 0 or True or False")
@@ -2007,18 +2950,58 @@ class TableIdObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(table_id_object_type, TableIdObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, table_id_object_type, self.object_class, TableIdObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(table_id_object_type, TableIdObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_code_scope_table(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name], cb, user_data=None, raw_data=False):
         lower_bound = TableIdObject.generate_key_by_code_scope_table(*lower_bound)
         upper_bound = TableIdObject.generate_key_by_code_scope_table(*upper_bound)
         return self.db.walk_range(table_id_object_type, TableIdObject.by_code_scope_table, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_code_scope_table(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = TableIdObject.generate_key_by_code_scope_table(*lower_bound)
+        upper_bound = TableIdObject.generate_key_by_code_scope_table(*upper_bound)
+        def row_key(obj):
+            return TableIdObject.generate_key_by_code_scope_table(obj.code, obj.scope, obj.table)
+        return iter_objects(self.db, table_id_object_type, self.object_class, TableIdObject.by_code_scope_table, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_code_scope_table(self, lower_bound: Tuple[Name, Name, Name], upper_bound: Tuple[Name, Name, Name]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = TableIdObject.generate_key_by_code_scope_table(*lower_bound)
+        upper_bound = TableIdObject.generate_key_by_code_scope_table(*upper_bound)
+        return self.db.count_range(table_id_object_type, TableIdObject.by_code_scope_table, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(table_id_object_type, TableIdObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def lower_bound_by_code_scope_table(self, code: Name, scope: Name, table: Name):
         lower_bound = TableIdObject.generate_key_by_code_scope_table(code, scope, table)
@@ -2026,7 +3009,7 @@ class TableIdObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -2034,7 +3017,7 @@ class TableIdObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_code_scope_table(self, code: Name, scope: Name, table: Name):
         upper_bound = TableIdObject.generate_key_by_code_scope_table(code, scope, table)
@@ -2042,7 +3025,7 @@ class TableIdObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return TableIdObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # resource_limits_object_type = 31
 class ResourceLimitsObjectIndex(object):
@@ -2102,11 +3085,51 @@ class ResourceLimitsObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(resource_limits_object_type, ResourceLimitsObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, resource_limits_object_type, ResourceLimitsObject, ResourceLimitsObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(resource_limits_object_type, ResourceLimitsObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_owner(self, lower_bound: Tuple[bool, Name], upper_bound: Tuple[bool, Name], cb, user_data=None, raw_data=False):
         lower_bound = ResourceLimitsObject.generate_key_by_owner(*lower_bound)
         upper_bound = ResourceLimitsObject.generate_key_by_owner(*upper_bound)
         return self.db.walk_range(resource_limits_object_type, ResourceLimitsObject.by_owner, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_owner(self, lower_bound: Tuple[bool, Name], upper_bound: Tuple[bool, Name], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = ResourceLimitsObject.generate_key_by_owner(*lower_bound)
+        upper_bound = ResourceLimitsObject.generate_key_by_owner(*upper_bound)
+        def row_key(obj):
+            return ResourceLimitsObject.generate_key_by_owner(obj.pending, obj.owner)
+        return iter_objects(self.db, resource_limits_object_type, ResourceLimitsObject, ResourceLimitsObject.by_owner, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_owner(self, lower_bound: Tuple[bool, Name], upper_bound: Tuple[bool, Name]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = ResourceLimitsObject.generate_key_by_owner(*lower_bound)
+        upper_bound = ResourceLimitsObject.generate_key_by_owner(*upper_bound)
+        return self.db.count_range(resource_limits_object_type, ResourceLimitsObject.by_owner, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(resource_limits_object_type, ResourceLimitsObject.by_id, lower_bound)
@@ -2141,8 +3164,9 @@ class ResourceLimitsObjectIndex(object):
 
 # resource_usage_object_type = 32
 class ResourceUsageObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(ResourceUsageObject) if lazy else ResourceUsageObject
 
     def create(self, obj: ResourceUsageObject):
         enc = Encoder()
@@ -2159,7 +3183,7 @@ class ResourceUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def find_by_owner(self, owner: Name):
         key = eos.s2b(owner)
@@ -2167,7 +3191,7 @@ class ResourceUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: ResourceUsageObject):
         key = i2b(perm.table_id)
@@ -2178,12 +3202,18 @@ class ResourceUsageObjectIndex(object):
     def row_count(self):
         return self.db.row_count(resource_usage_object_type)
 
+    def scan_columns(self, columns: Sequence[str], lower_bound: Optional[I64] = None, upper_bound: Optional[I64] = None):
+        """
+        Returns the fixed width `columns` of the objects in id order, or of the ids from `lower_bound` to `upper_bound`, as NumPy arrays.
+        """
+        return scan_columns(self.db, resource_usage_object_type, ResourceUsageObject, columns, ResourceUsageObject.by_id, lower_bound, upper_bound)
+
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = ResourceUsageObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -2197,18 +3227,58 @@ class ResourceUsageObjectIndex(object):
         upper_bound = i2b(upper_bound)
         return self.db.walk_range(resource_usage_object_type, ResourceUsageObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, lower_bound: I64, upper_bound: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, resource_usage_object_type, self.object_class, ResourceUsageObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, lower_bound: I64, upper_bound: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(lower_bound)
+        upper_bound = i2b(upper_bound)
+        return self.db.count_range(resource_usage_object_type, ResourceUsageObject.by_id, lower_bound, upper_bound)
+
     def walk_range_by_owner(self, lower_bound: Name, upper_bound: Name, cb, user_data=None, raw_data=False):
         lower_bound = eos.s2b(lower_bound)
         upper_bound = eos.s2b(upper_bound)
         return self.db.walk_range(resource_usage_object_type, ResourceUsageObject.by_owner, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_owner(self, lower_bound: Name, upper_bound: Name, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        def row_key(obj):
+            return eos.s2b(obj.owner)
+        return iter_objects(self.db, resource_usage_object_type, self.object_class, ResourceUsageObject.by_owner, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_owner(self, lower_bound: Name, upper_bound: Name) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = eos.s2b(lower_bound)
+        upper_bound = eos.s2b(upper_bound)
+        return self.db.count_range(resource_usage_object_type, ResourceUsageObject.by_owner, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, lower_bound: I64):
         lower_bound = i2b(lower_bound)
         data = self.db.lower_bound(resource_usage_object_type, ResourceUsageObject.by_id, lower_bound)
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_owner(self, lower_bound: Name):
         lower_bound = eos.s2b(lower_bound)
@@ -2216,7 +3286,7 @@ class ResourceUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, upper_bound: I64):
         upper_bound = i2b(upper_bound)
@@ -2224,7 +3294,7 @@ class ResourceUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
     
     def upper_bound_by_owner(self, upper_bound: Name):
         upper_bound = eos.s2b(upper_bound)
@@ -2232,12 +3302,13 @@ class ResourceUsageObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceUsageObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
 # resource_limits_state_object_type = 33
 class ResourceLimitsStateObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(ResourceLimitsStateObject) if lazy else ResourceLimitsStateObject
 
     def create(self, obj: ResourceLimitsStateObject):
         enc = Encoder()
@@ -2260,7 +3331,7 @@ class ResourceLimitsStateObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceLimitsStateObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: ResourceLimitsStateObject):
         key = i2b(perm.table_id)
@@ -2273,8 +3344,9 @@ class ResourceLimitsStateObjectIndex(object):
 
 # resource_limits_config_object_type = 34
 class ResourceLimitsConfigObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(ResourceLimitsConfigObject) if lazy else ResourceLimitsConfigObject
 
     def create(self, obj: ResourceLimitsConfigObject):
         enc = Encoder()
@@ -2297,7 +3369,7 @@ class ResourceLimitsConfigObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return ResourceLimitsConfigObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: ResourceLimitsConfigObject):
         key = i2b(perm.table_id)
@@ -2347,8 +3419,9 @@ class ProtocolStateObjectIndex(object):
 
 # account_ram_correction_object_type = 39
 class AccountRamCorrectionObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(AccountRamCorrectionObject) if lazy else AccountRamCorrectionObject
 
     def create(self, obj: AccountRamCorrectionObject):
         enc = Encoder()
@@ -2365,7 +3438,7 @@ class AccountRamCorrectionObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return AccountRamCorrectionObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: AccountRamCorrectionObject):
         key = i2b(perm.table_id)
@@ -2378,8 +3451,9 @@ class AccountRamCorrectionObjectIndex(object):
 
 # code_object_type = 40
 class CodeObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(CodeObject) if lazy else CodeObject
 
     def create(self, obj: CodeObject):
         enc = Encoder()
@@ -2396,7 +3470,7 @@ class CodeObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def convert_code_hash(self, code_hash: Union[str, bytes, Checksum256]):
         if isinstance(code_hash, str):
@@ -2414,14 +3488,14 @@ class CodeObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def on_object_data(self, tp, data, custom_data):
         cb, raw_data, user_data = custom_data
         if raw_data:
             return call_cb(cb, data, user_data)
         dec = Decoder(data)
-        obj = CodeObject.unpack(dec)
+        obj = self.object_class.unpack(dec)
         return call_cb(cb, obj, user_data)
 
     def walk_by_id(self, cb, user_data=None, raw_data=False):
@@ -2435,6 +3509,26 @@ class CodeObjectIndex(object):
         upper_bound = i2b(end_id)
         return self.db.walk_range(database.code_object_type, CodeObject.by_id, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_id(self, start_id: I64, end_id: I64, reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = i2b(start_id)
+        upper_bound = i2b(end_id)
+        def row_key(obj):
+            return i2b(obj.table_id)
+        return iter_objects(self.db, database.code_object_type, self.object_class, CodeObject.by_id, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_id(self, start_id: I64, end_id: I64) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = i2b(start_id)
+        upper_bound = i2b(end_id)
+        return self.db.count_range(database.code_object_type, CodeObject.by_id, lower_bound, upper_bound)
+
     def convert_by_code_hash_key(self, key: Tuple[Union[str, bytes, Checksum256], U8, U8]):
         code_hash, vm_type, vm_version = key
         return self.convert_code_hash(code_hash) + u2b(vm_type) + u2b(vm_version, 1)
@@ -2444,13 +3538,33 @@ class CodeObjectIndex(object):
         upper_bound = self.convert_by_code_hash_key(upper_bound)
         return self.db.walk_range(database.code_object_type, CodeObject.by_code_hash, lower_bound, upper_bound, self.on_object_data, (cb, raw_data, user_data))
 
+    def iter_by_code_hash(self, lower_bound: Tuple[Union[str, bytes, Checksum256], U8, U8], upper_bound: Tuple[Union[str, bytes, Checksum256], U8, U8], reverse=False, batch_size=default_iter_batch_size, raw_data=False):
+        """
+        Yields the objects of the range in batches of `batch_size` rows. `reverse` reads the rows twice and
+        keeps one key per batch in memory, see `Database.iter_range`.
+        """
+        lower_bound = self.convert_by_code_hash_key(lower_bound)
+        upper_bound = self.convert_by_code_hash_key(upper_bound)
+        def row_key(obj):
+            return self.convert_by_code_hash_key((obj.code_hash, obj.vm_type, obj.vm_version))
+        return iter_objects(self.db, database.code_object_type, self.object_class, CodeObject.by_code_hash, lower_bound, upper_bound, row_key, reverse, batch_size, raw_data)
+
+    def count_range_by_code_hash(self, lower_bound: Tuple[Union[str, bytes, Checksum256], U8, U8], upper_bound: Tuple[Union[str, bytes, Checksum256], U8, U8]) -> int:
+        """
+        Counts the rows by walking the range in the database, the cost is linear in the number of rows
+        of the range, without a Python call per row.
+        """
+        lower_bound = self.convert_by_code_hash_key(lower_bound)
+        upper_bound = self.convert_by_code_hash_key(upper_bound)
+        return self.db.count_range(database.code_object_type, CodeObject.by_code_hash, lower_bound, upper_bound)
+
     def lower_bound_by_id(self, table_id: I64):
         key = i2b(table_id)
         data = self.db.lower_bound(code_object_type, CodeObject.by_id, key)
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def lower_bound_by_code_hash(self, lower_bound: Tuple[Union[str, bytes, Checksum256], U8, U8]):
         key = self.convert_by_code_hash_key(lower_bound)
@@ -2458,7 +3572,7 @@ class CodeObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_id(self, table_id: I64):
         key = i2b(table_id)
@@ -2466,7 +3580,7 @@ class CodeObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def upper_bound_by_code_hash(self, upper_bound: Tuple[Union[str, bytes, Checksum256], U8, U8]):
         key = self.convert_by_code_hash_key(upper_bound)
@@ -2474,7 +3588,7 @@ class CodeObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return CodeObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: CodeObject):
         key = i2b(perm.table_id)
@@ -2487,8 +3601,9 @@ class CodeObjectIndex(object):
 
 # database_header_object_type = 41
 class DatabaseHeaderObjectIndex(object):
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, lazy: bool = False):
         self.db = db
+        self.object_class = view_class(DatabaseHeaderObject) if lazy else DatabaseHeaderObject
 
     def create(self, perm: DatabaseHeaderObject):
         enc = Encoder()
@@ -2511,7 +3626,7 @@ class DatabaseHeaderObjectIndex(object):
         if not data:
             return None
         dec = Decoder(data)
-        return DatabaseHeaderObject.unpack(dec)
+        return self.object_class.unpack(dec)
 
     def modify(self, perm: DatabaseHeaderObject):
         key = u2b(0)
@@ -4,6 +4,7 @@ from typing import Generic, List, NewType, Optional, TypeVar, Union
 from . import database
 
 from .. import eos
+from ..bases.codec import StructCodec
 from ..bases.packer import Decoder, Encoder
 from ..bases.structs import (Authority, KeyWeight, PermissionLevel,
                       PermissionLevelWeight, TimePoint, Variant, WaitWeight)
@@ -37,6 +38,12 @@ class template(object):
 class AccountObject(object):
     by_id = 0
     by_name = 1
+    codec = StructCodec([
+        ('name', Name),
+        ('creation_date', U32),
+        ('abi', bytes),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, name: Name, creation_date: U32, abi: bytes):
         self._table_id = table_id
         self.name = name
@@ -55,20 +62,12 @@ class AccountObject(object):
             and self.creation_date == other.creation_date \
             and self.abi == other.abi
 
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_name(self.name)
-        enc.pack_u32(self.creation_date)
-        enc.pack_bytes(self.abi)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        name = dec.unpack_name()
-        creation_date = dec.unpack_u32()
-        abi = dec.unpack_bytes()
-        return AccountObject(table_id, name, creation_date, abi)
+        return cls(*cls.codec.unpack(dec))
 
 # struct account_metadata_object_
 # {
@@ -87,6 +86,19 @@ class AccountObject(object):
 class AccountMetadataObject(object):
     by_id = 0
     by_name = 1
+    codec = StructCodec([
+        ('name', Name),
+        ('recv_sequence', U64),
+        ('auth_sequence', U64),
+        ('code_sequence', U64),
+        ('abi_sequence', U64),
+        ('code_hash', Checksum256),
+        ('last_code_update', I64),
+        ('flags', U32),
+        ('vm_type', U8),
+        ('vm_version', U8),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, name: Name, recv_sequence: U64, auth_sequence: U64, code_sequence: U64, abi_sequence: U64, \
                 code_hash: Checksum256, last_code_update: I64, flags: U32, vm_type: U8, vm_version: U8):
         self._table_id = table_id
@@ -128,35 +140,12 @@ class AccountMetadataObject(object):
         and self.vm_type == other.vm_type \
         and self.vm_version == other.vm_version
 
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_name(self.name)
-        enc.pack_u64(self.recv_sequence)
-        enc.pack_u64(self.auth_sequence)
-        enc.pack_u64(self.code_sequence)
-        enc.pack_u64(self.abi_sequence)
-        enc.pack_checksum256(self.code_hash)
-        enc.pack_i64(self.last_code_update)
-        enc.pack_u32(self.flags)
-        enc.pack_u8(self.vm_type)
-        enc.pack_u8(self.vm_version)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        name = dec.unpack_name()
-        recv_sequence = dec.unpack_u64()
-        auth_sequence = dec.unpack_u64()
-        code_sequence = dec.unpack_u64()
-        abi_sequence = dec.unpack_u64()
-        code_hash = dec.unpack_checksum256()
-        last_code_update = dec.unpack_i64()
-        flags = dec.unpack_u32()
-        vm_type = dec.unpack_u8()
-        vm_version = dec.unpack_u8()
-        return AccountMetadataObject(table_id, name, recv_sequence, auth_sequence, code_sequence, abi_sequence, \
-            code_hash, last_code_update, flags, vm_type, vm_version)
+        return cls(*cls.codec.unpack(dec))
 
 # struct permission_object_ {
 #     permission_usage_object::id_type  usage_id;
@@ -195,6 +184,15 @@ class PermissionObject(object):
     by_owner = 2
     by_name = 3
 
+    codec = StructCodec([
+        ('usage_id', I64),
+        ('parent', I64),
+        ('owner', Name),
+        ('name', Name),
+        ('last_updated', I64),
+        ('auth', Authority),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, usage_id: I64, parent: I64, owner: Name, name: Name, last_updated: I64, auth: Authority):
         self._table_id = table_id
         self.usage_id = usage_id
@@ -236,30 +234,11 @@ class PermissionObject(object):
         return eos.s2b(name) + i2b(table_id)
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.usage_id)
-        enc.pack_i64(self.parent)
-        enc.pack_name(self.owner)
-        enc.pack_name(self.name)
-        enc.pack_i64(self.last_updated)
-        enc.pack(self.auth)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-    #   permission_usage_object::id_type  usage_id;
-    #   id_type                           parent; ///< parent permission
-    #   account_name                      owner; ///< the account this permission belongs to (should not be changed within a chainbase modifier lambda)
-    #   permission_name                   name; ///< human-readable name for the permission (should not be changed within a chainbase modifier lambda)
-    #   time_point                        last_updated; ///< the last time this authority was updated
-        table_id = dec.unpack_i64()
-        usage_id = dec.unpack_i64()
-        parent = dec.unpack_i64()
-        owner = dec.unpack_name()
-        name = dec.unpack_name()
-        last_updated = dec.unpack_i64()
-        auth = Authority.unpack(dec)
-        return PermissionObject(table_id, usage_id, parent, owner, name, last_updated, auth)
+        return cls(*cls.codec.unpack(dec))
 
 # struct permission_usage_object_ {
 #     time_point        last_used;   ///< when this permission was last used
@@ -267,6 +246,10 @@ class PermissionObject(object):
 
 class PermissionUsageObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('last_used', I64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, last_used: I64):
         self._table_id = table_id
         self.last_used = last_used
@@ -282,13 +265,11 @@ class PermissionUsageObject(object):
         return self.last_used == other.last_used
 
     def pack(self, enc: Encoder) -> int:
-        return enc.pack_i64(self.last_used)
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        last_used = dec.unpack_i64()
-        return PermissionUsageObject(table_id, last_used)
+        return cls(*cls.codec.unpack(dec))
 
 # struct permission_link_object_ {
 #     /// The account which is defining its permission requirements
@@ -307,6 +288,13 @@ class PermissionLinkObject(object):
     by_id = 0
     by_action_name = 1
     by_permission_name = 2
+    codec = StructCodec([
+        ('account', Name),
+        ('code', Name),
+        ('message_type', Name),
+        ('required_permission', Name),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, account: Name, code: Name, message_type: Name, required_permission: Name):
         self._table_id = table_id
         self.account = account
@@ -328,21 +316,11 @@ class PermissionLinkObject(object):
             and self.required_permission == other.required_permission
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_name(self.account)
-        enc.pack_name(self.code)
-        enc.pack_name(self.message_type)
-        enc.pack_name(self.required_permission)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        account = dec.unpack_name()
-        code = dec.unpack_name()
-        message_type = dec.unpack_name()
-        required_permission = dec.unpack_name()
-        return PermissionLinkObject(table_id, account, code, message_type, required_permission)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_action_name(cls, account: Name, code: Name, message_type: Name):
@@ -363,6 +341,13 @@ class PermissionLinkObject(object):
 class KeyValueObject(object):
     by_id = 0
     by_scope_primary = 1
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('value', bytes),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, value: bytes):
         self._table_id = table_id
         self.t_id = t_id
@@ -384,21 +369,11 @@ class KeyValueObject(object):
             and self.value == other.value
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack_bytes(self.value)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        value = dec.unpack_bytes()
-        return KeyValueObject(table_id, t_id, primary_key, payer, value)
+        return cls(*cls.codec.unpack(dec))
     
     @classmethod
     def generate_key_by_scope_primary(cls, t_id: I64, primary_key: U64):
@@ -416,6 +391,13 @@ class Index64Object(object):
     by_primary = 1
     by_secondary = 2
 
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('secondary_key', U64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, secondary_key: U64):
         self._table_id = table_id
         self.t_id = t_id
@@ -437,21 +419,11 @@ class Index64Object(object):
             and self.secondary_key == other.secondary_key
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack_u64(self.secondary_key)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        secondary_key = dec.unpack_u64()
-        return Index64Object(table_id, t_id, primary_key, payer, secondary_key)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_primary(cls, t_id: I64, primary_key: U64):
@@ -472,6 +444,13 @@ class Index128Object(object):
     by_id = 0
     by_primary = 1
     by_secondary = 2
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('secondary_key', U128),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, secondary_key: U128):
         self._table_id = table_id
         self.t_id = t_id
@@ -493,21 +472,11 @@ class Index128Object(object):
             and self.secondary_key == other.secondary_key
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack_u128(self.secondary_key)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        secondary_key = dec.unpack_u128()
-        return Index128Object(table_id, t_id, primary_key, payer, secondary_key)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_primary(cls, t_id: I64, primary_key: U64):
@@ -529,6 +498,13 @@ class Index256Object(object):
     by_id = 0
     by_primary = 1
     by_secondary = 2
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('secondary_key', U256),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, secondary_key: U256):
         self._table_id = table_id
         self.t_id = t_id
@@ -550,21 +526,11 @@ class Index256Object(object):
             and self.secondary_key == other.secondary_key
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack_u256(self.secondary_key)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        secondary_key = dec.unpack_u256()
-        return Index256Object(table_id, t_id, primary_key, payer, secondary_key)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_primary(cls, t_id: I64, primary_key: U64):
@@ -586,6 +552,13 @@ class IndexDoubleObject(object):
     by_id = 0
     by_primary = 1
     by_secondary = 2
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('secondary_key', float),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, secondary_key: float):
         self._table_id = table_id
         self.t_id = t_id
@@ -607,21 +580,11 @@ class IndexDoubleObject(object):
             and self.secondary_key == other.secondary_key
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack_double(self.secondary_key)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        secondary_key = dec.unpack_double()
-        return IndexDoubleObject(table_id, t_id, primary_key, payer, secondary_key)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_primary(cls, t_id: I64, primary_key: U64):
@@ -643,6 +606,13 @@ class IndexLongDoubleObject(object):
     by_id = 0
     by_primary = 1
     by_secondary = 2
+    codec = StructCodec([
+        ('t_id', I64),
+        ('primary_key', U64),
+        ('payer', Name),
+        ('secondary_key', F128),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, t_id: I64, primary_key: U64, payer: Name, secondary_key: F128):
         self._table_id = table_id
         self.t_id = t_id
@@ -664,21 +634,11 @@ class IndexLongDoubleObject(object):
             and self.secondary_key == other.secondary_key
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_i64(self.t_id)
-        enc.pack_u64(self.primary_key)
-        enc.pack_name(self.payer)
-        enc.pack(self.secondary_key)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        t_id = dec.unpack_i64()
-        primary_key = dec.unpack_u64()
-        payer = dec.unpack_name()
-        secondary_key = F128.unpack(dec)
-        return IndexLongDoubleObject(table_id, t_id, primary_key, payer, secondary_key)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_primary(cls, t_id: I64, primary_key: U64):
@@ -701,6 +661,11 @@ class IndexLongDoubleObject(object):
 
 class BlockSigningAuthorityV0(object):
     by_id = 0
+    codec = StructCodec([
+        ('threshold', U32),
+        ('keys', List[KeyWeight]),
+    ])
+
     def __init__(self, threshold: U32, keys: List[KeyWeight]):
         self.threshold = threshold
         self.keys = keys
@@ -713,16 +678,11 @@ class BlockSigningAuthorityV0(object):
             and self.keys == other.keys
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u32(self.threshold)
-        enc.pack_list(self.keys)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        threshold = dec.unpack_u32()
-        keys = dec.unpack_list(KeyWeight)
-        return BlockSigningAuthorityV0(threshold, keys)
+        return cls(*cls.codec.unpack(dec))
 
 BlockSigningAuthority = Variant[BlockSigningAuthorityV0]
 
@@ -816,6 +776,27 @@ class ProducerAuthoritySchedule(object):
 # }   
 
 class ChainConfig(object):
+    codec = StructCodec([
+        ('max_block_net_usage', U64),
+        ('target_block_net_usage_pct', U32),
+        ('max_transaction_net_usage', U32),
+        ('base_per_transaction_net_usage', U32),
+        ('net_usage_leeway', U32),
+        ('context_free_discount_net_usage_num', U32),
+        ('context_free_discount_net_usage_den', U32),
+        ('max_block_cpu_usage', U32),
+        ('target_block_cpu_usage_pct', U32),
+        ('max_transaction_cpu_usage', U32),
+        ('min_transaction_cpu_usage', U32),
+        ('max_transaction_lifetime', U32),
+        ('deferred_trx_expiration_window', U32),
+        ('max_transaction_delay', U32),
+        ('max_inline_action_size', U32),
+        ('max_inline_action_depth', U16),
+        ('max_authority_depth', U16),
+        ('max_action_return_value_size', U32),
+    ])
+
     def __init__(self,  max_block_net_usage: U64,
                         target_block_net_usage_pct: U32,
                         max_transaction_net_usage: U32,
@@ -861,66 +842,12 @@ class ChainConfig(object):
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
 
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u64(self.max_block_net_usage)
-        enc.pack_u32(self.target_block_net_usage_pct)
-        enc.pack_u32(self.max_transaction_net_usage)
-        enc.pack_u32(self.base_per_transaction_net_usage)
-        enc.pack_u32(self.net_usage_leeway)
-        enc.pack_u32(self.context_free_discount_net_usage_num)
-        enc.pack_u32(self.context_free_discount_net_usage_den)
-        enc.pack_u32(self.max_block_cpu_usage)
-        enc.pack_u32(self.target_block_cpu_usage_pct)
-        enc.pack_u32(self.max_transaction_cpu_usage)
-        enc.pack_u32(self.min_transaction_cpu_usage)
-        enc.pack_u32(self.max_transaction_lifetime)
-        enc.pack_u32(self.deferred_trx_expiration_window)
-        enc.pack_u32(self.max_transaction_delay)
-        enc.pack_u32(self.max_inline_action_size)
-        enc.pack_u16(self.max_inline_action_depth)
-        enc.pack_u16(self.max_authority_depth)
-        enc.pack_u32(self.max_action_return_value_size)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        max_block_net_usage = dec.unpack_u64()
-        target_block_net_usage_pct = dec.unpack_u32()
-        max_transaction_net_usage = dec.unpack_u32()
-        base_per_transaction_net_usage = dec.unpack_u32()
-        net_usage_leeway = dec.unpack_u32()
-        context_free_discount_net_usage_num = dec.unpack_u32()
-        context_free_discount_net_usage_den = dec.unpack_u32()
-        max_block_cpu_usage = dec.unpack_u32()
-        target_block_cpu_usage_pct = dec.unpack_u32()
-        max_transaction_cpu_usage = dec.unpack_u32()
-        min_transaction_cpu_usage = dec.unpack_u32()
-        max_transaction_lifetime = dec.unpack_u32()
-        deferred_trx_expiration_window = dec.unpack_u32()
-        max_transaction_delay = dec.unpack_u32()
-        max_inline_action_size = dec.unpack_u32()
-        max_inline_action_depth = dec.unpack_u16()
-        max_authority_depth = dec.unpack_u16()
-        max_action_return_value_size = dec.unpack_u32()
-        return ChainConfig(max_block_net_usage,
-                            target_block_net_usage_pct,
-                            max_transaction_net_usage,
-                            base_per_transaction_net_usage,
-                            net_usage_leeway,
-                            context_free_discount_net_usage_num,
-                            context_free_discount_net_usage_den,
-                            max_block_cpu_usage,
-                            target_block_cpu_usage_pct,
-                            max_transaction_cpu_usage,
-                            min_transaction_cpu_usage,
-                            max_transaction_lifetime,
-                            deferred_trx_expiration_window,
-                            max_transaction_delay,
-                            max_inline_action_size,
-                            max_inline_action_depth,
-                            max_authority_depth,
-                            max_action_return_value_size)
+        return cls(*cls.codec.unpack(dec))
 
 # struct kv_database_config {
 #     std::uint32_t max_key_size   = 0; ///< the maximum size in bytes of a key
@@ -929,6 +856,12 @@ class ChainConfig(object):
 # };
 
 class KvDatabaseConfig(object):
+    codec = StructCodec([
+        ('max_key_size', U32),
+        ('max_value_size', U32),
+        ('max_iterators', U32),
+    ])
+
     def __init__(self, max_key_size: U32, max_value_size: U32, max_iterators: U32):
         self.max_key_size = max_key_size
         self.max_value_size = max_value_size
@@ -943,19 +876,12 @@ class KvDatabaseConfig(object):
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
 
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u32(self.max_key_size)
-        enc.pack_u32(self.max_value_size)
-        enc.pack_u32(self.max_iterators)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        max_key_size = dec.unpack_u32()
-        max_value_size = dec.unpack_u32()
-        max_iterators = dec.unpack_u32()
-        return KvDatabaseConfig(max_key_size, max_value_size, max_iterators)
+        return cls(*cls.codec.unpack(dec))
 
 # struct wasm_config {
 #    std::uint32_t max_mutable_global_bytes;
@@ -972,6 +898,20 @@ class KvDatabaseConfig(object):
 # };
 
 class WasmConfig(object):
+    codec = StructCodec([
+        ('max_mutable_global_bytes', U32),
+        ('max_table_elements', U32),
+        ('max_section_elements', U32),
+        ('max_linear_memory_init', U32),
+        ('max_func_local_bytes', U32),
+        ('max_nested_structures', U32),
+        ('max_symbol_bytes', U32),
+        ('max_module_bytes', U32),
+        ('max_code_bytes', U32),
+        ('max_pages', U32),
+        ('max_call_depth', U32),
+    ])
+
     def __init__(self, max_mutable_global_bytes: U32,
                 max_table_elements: U32,
                 max_section_elements: U32,
@@ -1005,44 +945,10 @@ class WasmConfig(object):
         return self.__dict__ == other.__dict__
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u32(self.max_mutable_global_bytes)
-        enc.pack_u32(self.max_table_elements)
-        enc.pack_u32(self.max_section_elements)
-        enc.pack_u32(self.max_linear_memory_init)
-        enc.pack_u32(self.max_func_local_bytes)
-        enc.pack_u32(self.max_nested_structures)
-        enc.pack_u32(self.max_symbol_bytes)
-        enc.pack_u32(self.max_module_bytes)
-        enc.pack_u32(self.max_code_bytes)
-        enc.pack_u32(self.max_pages)
-        enc.pack_u32(self.max_call_depth)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        max_mutable_global_bytes = dec.unpack_u32()
-        max_table_elements = dec.unpack_u32()
-        max_section_elements = dec.unpack_u32()
-        max_linear_memory_init = dec.unpack_u32()
-        max_func_local_bytes = dec.unpack_u32()
-        max_nested_structures = dec.unpack_u32()
-        max_symbol_bytes = dec.unpack_u32()
-        max_module_bytes = dec.unpack_u32()
-        max_code_bytes = dec.unpack_u32()
-        max_pages = dec.unpack_u32()
-        max_call_depth = dec.unpack_u32()
-        return WasmConfig(max_mutable_global_bytes,
-                        max_table_elements,
-                        max_section_elements,
-                        max_linear_memory_init,
-                        max_func_local_bytes,
-                        max_nested_structures,
-                        max_symbol_bytes,
-                        max_module_bytes,
-                        max_code_bytes,
-                        max_pages,
-                        max_call_depth)
+        return cls(*cls.codec.unpack(dec))
 
 # struct global_property_object_ {
 #     // id_type                             id;
@@ -1107,6 +1013,10 @@ class GlobalPropertyObject(object):
 
 class DynamicGlobalPropertyObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('global_action_sequence', U64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, global_action_sequence: U64):
         self._table_id = table_id
         self.global_action_sequence = global_action_sequence
@@ -1122,15 +1032,11 @@ class DynamicGlobalPropertyObject(object):
         return self.global_action_sequence == other.global_action_sequence
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u64(self.global_action_sequence)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        global_action_sequence = dec.unpack_u64()
-        return DynamicGlobalPropertyObject(table_id, global_action_sequence)
+        return cls(*cls.codec.unpack(dec))
 
 
 # struct block_summary_object_ {
@@ -1139,6 +1045,10 @@ class DynamicGlobalPropertyObject(object):
 
 class BlockSummaryObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('block_id', Checksum256),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, block_id: Checksum256):
         self._table_id = table_id
         self.block_id = block_id
@@ -1154,15 +1064,11 @@ class BlockSummaryObject(object):
         return self.block_id == other.block_id
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.block_id)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        block_id = dec.unpack(Checksum256)
-        return BlockSummaryObject(table_id, block_id)
+        return cls(*cls.codec.unpack(dec))
 
 # struct transaction_object_ {
 #     time_point_sec      expiration;
@@ -1173,6 +1079,11 @@ class TransactionObject(object):
     by_id = 0
     by_trx_id = 1
     by_expiration = 2
+    codec = StructCodec([
+        ('expiration', U32),
+        ('trx_id', Checksum256),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, expiration: TimePointSec, trx_id: Checksum256):
         self._table_id = table_id
         self.expiration = expiration
@@ -1190,17 +1101,11 @@ class TransactionObject(object):
             and self.trx_id == other.trx_id
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u32(self.expiration)
-        enc.pack(self.trx_id)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        expiration = dec.unpack_u32()
-        trx_id = dec.unpack(Checksum256)
-        return TransactionObject(table_id, expiration, trx_id)
+        return cls(*cls.codec.unpack(dec))
     
     @classmethod
     def generate_key_by_expiration(cls, expiration: U32, table_id: I64):
@@ -1224,6 +1129,17 @@ class GeneratedTransactionObject(object):
     by_delay = 3
     by_sender_id = 4
 
+    codec = StructCodec([
+        ('trx_id', Checksum256),
+        ('sender', Name),
+        ('sender_id', U128),
+        ('payer', Name),
+        ('delay_until', TimePoint),
+        ('expiration', TimePoint),
+        ('published', TimePoint),
+        ('packed_trx', bytes),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, trx_id: Checksum256, sender: Name, sender_id: U128, payer: Name, delay_until: TimePoint, expiration: TimePoint, published: TimePoint, packed_trx: bytes):
         self._table_id = table_id
         self.trx_id = trx_id
@@ -1253,37 +1169,11 @@ class GeneratedTransactionObject(object):
             and self.packed_trx == other.packed_trx
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.trx_id)
-        enc.pack_name(self.sender)
-        enc.pack_u128(self.sender_id)
-        enc.pack_name(self.payer)
-        enc.pack(self.delay_until)
-        enc.pack(self.expiration)
-        enc.pack(self.published)
-        enc.pack_bytes(self.packed_trx)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        trx_id = dec.unpack_checksum256()
-        sender = dec.unpack_name()
-        sender_id = dec.unpack_u128()
-        payer = dec.unpack_name()
-        delay_until = TimePoint.unpack(dec)
-        expiration = TimePoint.unpack(dec)
-        published = TimePoint.unpack(dec)
-        packed_trx = dec.unpack_bytes()
-        return GeneratedTransactionObject(table_id,
-                trx_id,
-                sender,
-                sender_id,
-                payer,
-                delay_until,
-                expiration,
-                published,
-                packed_trx)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_expiration(self, expiration: Union[I64, TimePoint], table_id: I64):
@@ -1314,6 +1204,14 @@ class GeneratedTransactionObject(object):
 class TableIdObject(object):
     by_id = 0
     by_code_scope_table = 1
+    codec = StructCodec([
+        ('code', Name),
+        ('scope', Name),
+        ('table', Name),
+        ('payer', Name),
+        ('count', U32),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, code: Name, scope: Name, table: Name, payer: Name, count: U32):
         self._table_id = table_id
         self.code = code
@@ -1337,23 +1235,11 @@ class TableIdObject(object):
             and self.count == other.count
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_name(self.code)
-        enc.pack_name(self.scope)
-        enc.pack_name(self.table)
-        enc.pack_name(self.payer)
-        enc.pack_u32(self.count)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        code = dec.unpack_name()
-        scope = dec.unpack_name()
-        table = dec.unpack_name()
-        payer = dec.unpack_name()
-        count = dec.unpack_u32()
-        return TableIdObject(table_id, code, scope, table, payer, count)
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def generate_key_by_code_scope_table(cls, code: Name, scope: Name, table: Name):
@@ -1425,6 +1311,12 @@ class ResourceLimitsObject(object):
 # }
 
 class UsageAccumulator(object):
+    codec = StructCodec([
+        ('last_ordinal', U32),
+        ('value_ex', U64),
+        ('consumed', U64),
+    ])
+
     def __init__(self, last_ordinal: U32, value_ex: U64, consumed: U64):
         self.last_ordinal = last_ordinal
         self.value_ex = value_ex
@@ -1439,18 +1331,11 @@ class UsageAccumulator(object):
             and self.consumed == other.consumed
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u32(self.last_ordinal)
-        enc.pack_u64(self.value_ex)
-        enc.pack_u64(self.consumed)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        last_ordinal = dec.unpack_u32()
-        value_ex = dec.unpack_u64()
-        consumed = dec.unpack_u64()
-        return UsageAccumulator(last_ordinal, value_ex, consumed)
+        return cls(*cls.codec.unpack(dec))
 
 # struct resource_usage_object_ {
 #     account_name owner; //< owner should not be changed within a chainbase modifier lambda
@@ -1462,6 +1347,13 @@ class UsageAccumulator(object):
 class ResourceUsageObject(object):
     by_id = 0
     by_owner = 1
+    codec = StructCodec([
+        ('owner', Name),
+        ('net_usage', UsageAccumulator),
+        ('cpu_usage', UsageAccumulator),
+        ('ram_usage', U64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, owner: Name, net_usage: UsageAccumulator, cpu_usage: UsageAccumulator, ram_usage: U64):
         self._table_id = table_id
         self.owner = owner
@@ -1483,21 +1375,11 @@ class ResourceUsageObject(object):
             and self.ram_usage == other.ram_usage
 
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_name(self.owner)
-        enc.pack(self.net_usage)
-        enc.pack(self.cpu_usage)
-        enc.pack_u64(self.ram_usage)
-        return enc.get_pos() - pos
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        owner = dec.unpack_name()
-        net_usage = UsageAccumulator.unpack(dec)
-        cpu_usage = UsageAccumulator.unpack(dec)
-        ram_usage = dec.unpack_u64()
-        return ResourceUsageObject(table_id, owner, net_usage, cpu_usage, ram_usage)
+        return cls(*cls.codec.unpack(dec))
 
 # struct resource_limits_state_object_ {
 #     resource_limits::usage_accumulator average_block_net_usage;
@@ -1520,6 +1402,18 @@ class ResourceUsageObject(object):
 
 class ResourceLimitsStateObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('average_block_net_usage', UsageAccumulator),
+        ('average_block_cpu_usage', UsageAccumulator),
+        ('pending_net_usage', U64),
+        ('pending_cpu_usage', U64),
+        ('total_net_weight', U64),
+        ('total_cpu_weight', U64),
+        ('total_ram_bytes', U64),
+        ('virtual_net_limit', U64),
+        ('virtual_cpu_limit', U64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64,
                 average_block_net_usage: UsageAccumulator,
                 average_block_cpu_usage: UsageAccumulator,
@@ -1560,31 +1454,10 @@ class ResourceLimitsStateObject(object):
             and self.virtual_cpu_limit == other.virtual_cpu_limit
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.average_block_net_usage)
-        enc.pack(self.average_block_cpu_usage)
-        enc.pack_u64(self.pending_net_usage)
-        enc.pack_u64(self.pending_cpu_usage)
-        enc.pack_u64(self.total_net_weight)
-        enc.pack_u64(self.total_cpu_weight)
-        enc.pack_u64(self.total_ram_bytes)
-        enc.pack_u64(self.virtual_net_limit)
-        enc.pack_u64(self.virtual_cpu_limit)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        average_block_net_usage = UsageAccumulator.unpack(dec)
-        average_block_cpu_usage = UsageAccumulator.unpack(dec)
-        pending_net_usage = dec.unpack_u64()
-        pending_cpu_usage = dec.unpack_u64()
-        total_net_weight = dec.unpack_u64()
-        total_cpu_weight = dec.unpack_u64()
-        total_ram_bytes = dec.unpack_u64()
-        virtual_net_limit = dec.unpack_u64()
-        virtual_cpu_limit = dec.unpack_u64()
-        return ResourceLimitsStateObject(table_id, average_block_net_usage, average_block_cpu_usage, pending_net_usage, pending_cpu_usage, total_net_weight, total_cpu_weight, total_ram_bytes, virtual_net_limit, virtual_cpu_limit)
+        return cls(*cls.codec.unpack(dec))
 
 # struct ratio {
 #     uint64_t numerator;
@@ -1592,6 +1465,11 @@ class ResourceLimitsStateObject(object):
 # };
 
 class Ratio(object):
+    codec = StructCodec([
+        ('numerator', U64),
+        ('denominator', U64),
+    ])
+
     def __init__(self, numerator: U64, denominator: U64):
         self.numerator = numerator
         self.denominator = denominator
@@ -1603,16 +1481,10 @@ class Ratio(object):
         return self.numerator == other.numerator and self.denominator == other.denominator
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u64(self.numerator)
-        enc.pack_u64(self.denominator)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        numerator = dec.unpack_u64()
-        denominator = dec.unpack_u64()
-        return Ratio(numerator, denominator)
+        return cls(*cls.codec.unpack(dec))
 
 # struct elastic_limit_parameters {
 #     uint64_t target;           // the desired usage
@@ -1625,6 +1497,15 @@ class Ratio(object):
 # }
 
 class ElasticLimitParameters(object):
+    codec = StructCodec([
+        ('target', U64),
+        ('max', U64),
+        ('periods', U32),
+        ('max_multiplier', U32),
+        ('contract_rate', Ratio),
+        ('expand_rate', Ratio),
+    ])
+
     def __init__(self, target: U64, max: U64, periods: U32, max_multiplier: U32, contract_rate: Ratio, expand_rate: Ratio):
         self.target = target
         self.max = max
@@ -1645,24 +1526,10 @@ class ElasticLimitParameters(object):
             and self.expand_rate == other.expand_rate
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u64(self.target)
-        enc.pack_u64(self.max)
-        enc.pack_u32(self.periods)
-        enc.pack_u32(self.max_multiplier)
-        enc.pack(self.contract_rate)
-        enc.pack(self.expand_rate)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        target = dec.unpack_u64()
-        max = dec.unpack_u64()
-        periods = dec.unpack_u32()
-        max_multiplier = dec.unpack_u32()
-        contract_rate = Ratio.unpack(dec)
-        expand_rate = Ratio.unpack(dec)
-        return ElasticLimitParameters(target, max, periods, max_multiplier, contract_rate, expand_rate)
+        return cls(*cls.codec.unpack(dec))
 
 # struct resource_limits_config_object_ {
 
@@ -1675,6 +1542,13 @@ class ElasticLimitParameters(object):
 
 class ResourceLimitsConfigObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('cpu_limit_parameters', ElasticLimitParameters),
+        ('net_limit_parameters', ElasticLimitParameters),
+        ('account_cpu_usage_average_window', U32),
+        ('account_net_usage_average_window', U32),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, cpu_limit_parameters: ElasticLimitParameters, net_limit_parameters: ElasticLimitParameters, account_cpu_usage_average_window: U32, account_net_usage_average_window: U32):
         self._table_id = table_id
         self.cpu_limit_parameters = cpu_limit_parameters
@@ -1696,21 +1570,10 @@ class ResourceLimitsConfigObject(object):
             and self.account_net_usage_average_window == other.account_net_usage_average_window
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.cpu_limit_parameters)
-        enc.pack(self.net_limit_parameters)
-        enc.pack_u32(self.account_cpu_usage_average_window)
-        enc.pack_u32(self.account_net_usage_average_window)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        cpu_limit_parameters = ElasticLimitParameters.unpack(dec)
-        net_limit_parameters = ElasticLimitParameters.unpack(dec)
-        account_cpu_usage_average_window = dec.unpack_u32()
-        account_net_usage_average_window = dec.unpack_u32()
-        return ResourceLimitsConfigObject(table_id, cpu_limit_parameters, net_limit_parameters, account_cpu_usage_average_window, account_net_usage_average_window)
+        return cls(*cls.codec.unpack(dec))
 
 # struct activated_protocol_feature_ {
 #     digest_type feature_digest;
@@ -1718,6 +1581,11 @@ class ResourceLimitsConfigObject(object):
 # };
 
 class ActivatedProtocolFeature(object):
+    codec = StructCodec([
+        ('feature_digest', Checksum256),
+        ('activation_block_num', U32),
+    ])
+
     def __init__(self, feature_digest: Checksum256, activation_block_num: U32):
         self.feature_digest = feature_digest
         self.activation_block_num = activation_block_num
@@ -1729,16 +1597,10 @@ class ActivatedProtocolFeature(object):
         return self.feature_digest == other.feature_digest and self.activation_block_num == other.activation_block_num
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.feature_digest)
-        enc.pack_u32(self.activation_block_num)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        feature_digest = Checksum256.unpack(dec)
-        activation_block_num = dec.unpack_u32()
-        return ActivatedProtocolFeature(feature_digest, activation_block_num)
+        return cls(*cls.codec.unpack(dec))
 
 # struct protocol_state_object_ {
 #     vector<activated_protocol_feature_>        activated_protocol_features;
@@ -1798,6 +1660,11 @@ class ProtocolStateObject(object):
 
 class AccountRamCorrectionObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('name', Name),
+        ('ram_correction', U64),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, name: Name, ram_correction: U64):
         self._table_id = table_id
         self.name = name
@@ -1814,17 +1681,10 @@ class AccountRamCorrectionObject(object):
         return self.name == other.name and self.ram_correction == other.ram_correction
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_name(self.name)
-        enc.pack_u64(self.ram_correction)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        name = dec.unpack_name()
-        ram_correction = dec.unpack_u64()
-        return AccountRamCorrectionObject(table_id, name, ram_correction)
+        return cls(*cls.codec.unpack(dec))
 
 
 # struct code_object_ {
@@ -1839,6 +1699,15 @@ class AccountRamCorrectionObject(object):
 class CodeObject(object):
     by_id = 0
     by_code_hash = 1
+    codec = StructCodec([
+        ('code_hash', Checksum256),
+        ('code', bytes),
+        ('code_ref_count', U64),
+        ('first_block_used', U32),
+        ('vm_type', U8),
+        ('vm_version', U8),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, code_hash: Checksum256, code: List[str], code_ref_count: U64, first_block_used: U32, vm_type: U8, vm_version: U8):
         self._table_id = table_id
         self.code_hash = code_hash
@@ -1864,25 +1733,10 @@ class CodeObject(object):
             and self.vm_version == other.vm_version
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack(self.code_hash)
-        enc.pack_bytes(self.code)
-        enc.pack_u64(self.code_ref_count)
-        enc.pack_u32(self.first_block_used)
-        enc.pack_u8(self.vm_type)
-        enc.pack_u8(self.vm_version)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        code_hash = Checksum256.unpack(dec)
-        code = dec.unpack_bytes()
-        code_ref_count = dec.unpack_u64()
-        first_block_used = dec.unpack_u32()
-        vm_type = dec.unpack_u8()
-        vm_version = dec.unpack_u8()
-        return CodeObject(table_id, code_hash, code, code_ref_count, first_block_used, vm_type, vm_version)
+        return cls(*cls.codec.unpack(dec))
 
 # struct database_header_object_ {
 #     uint32_t       version;
@@ -1890,6 +1744,10 @@ class CodeObject(object):
 
 class DatabaseHeaderObject(object):
     by_id = 0
+    codec = StructCodec([
+        ('version', U32),
+    ], prefix=[('table_id', I64)])
+
     def __init__(self, table_id: I64, version: U32):
         self._table_id = table_id
         self.version = version
@@ -1905,12 +1763,7 @@ class DatabaseHeaderObject(object):
         return self.version == other.version
     
     def pack(self, enc: Encoder) -> int:
-        pos = enc.get_pos()
-        enc.pack_u32(self.version)
-        return enc.get_pos() - pos
-    
+        return self.codec.pack(enc, self)
     @classmethod
     def unpack(cls, dec: Decoder):
-        table_id = dec.unpack_i64()
-        version = dec.unpack_u32()
-        return DatabaseHeaderObject(table_id, version)
+        return cls(*cls.codec.unpack(dec))
@@ -0,0 +1,142 @@
+"""
+Lazy views of database objects.
+
+A view keeps a reference to the raw row returned by the database and decodes a field only when it
+is read. The fields before the first variable width field are at fixed offsets and are decoded in
+place, the variable width fields and the fields after them are decoded in order on first access and
+cached, so reading the name of an account does not decode its abi:
+
+    account = AccountObjectIndex(db, lazy=True).find_by_name('eosio')
+    account.creation_date
+
+A view has the attributes of the object class it is created from, `to_object` decodes the whole
+object. `bytes` fields are slices of the row, memoryviews if the row is a memoryview.
+"""
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..bases.codec import FixedType, StructCodec, fixed_types
+from ..bases.packer import Decoder, Encoder
+
+class ObjectView(object):
+    """
+    Base class of the classes returned by `view_class`.
+    """
+    __slots__ = ('_data', '_base', '_pos', '_values')
+
+    object_class: Any = None
+    field_names: Tuple[str, ...] = ()
+    # offset of the first variable width field, the fields from it on are decoded in order
+    var_offset = 0
+    var_unpackers: Tuple[Callable, ...] = ()
+
+    def __init__(self, data, base: int = 0):
+        self._data = data
+        self._base = base
+        self._pos = 0
+        self._values: Optional[List[Any]] = None
+
+    @classmethod
+    def unpack(cls, dec: Decoder):
+        return cls(dec.raw_data, dec._pos)
+
+    def _get_var(self, i: int):
+        values = self._values
+        if values is None:
+            values = self._values = []
+            self._pos = self._base + self.var_offset
+        elif i < len(values):
+            return values[i]
+        dec = Decoder(self._data)
+        dec._pos = self._pos
+        unpackers = self.var_unpackers
+        while len(values) <= i:
+            values.append(unpackers[len(values)](dec))
+        self._pos = dec._pos
+        return values[i]
+
+    def to_object(self):
+        dec = Decoder(self._data)
+        dec._pos = self._base
+        return self.object_class.unpack(dec)
+
+    def pack(self, enc: Encoder) -> int:
+        return self.to_object().pack(enc)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}: {getattr(self, name)!r}' for name in self.field_names)
+        return f'{type(self).__name__}({{{fields}}})'
+
+    def __eq__(self, other):
+        if isinstance(other, ObjectView):
+            other = other.to_object()
+        return self.to_object() == other
+
+def fixed_getter(fmt: str, decode: Optional[Callable], offset: int) -> Callable:
+    st = struct.Struct('<' + fmt)
+    if decode:
+        def get(self):
+            return decode(st.unpack_from(self._data, self._base + offset)[0])
+    else:
+        def get(self):
+            return st.unpack_from(self._data, self._base + offset)[0]
+    return get
+
+def struct_getter(unpack: Callable, offset: int) -> Callable:
+    def get(self):
+        dec = Decoder(self._data)
+        dec._pos = self._base + offset
+        return unpack(dec)
+    return get
+
+def var_getter(i: int) -> Callable:
+    def get(self):
+        return self._get_var(i)
+    return get
+
+def field_unpacker(name: str, tp) -> Callable:
+    codec = StructCodec([(name, tp)])
+    def unpack(dec: Decoder):
+        return codec.unpack(dec)[0]
+    return unpack
+
+_view_classes: Dict[Any, type] = {}
+
+def view_class(cls) -> type:
+    """
+    Returns the view class of a database object class with a `StructCodec`, created once per class.
+    """
+    view = _view_classes.get(cls)
+    if view:
+        return view
+    codec = getattr(cls, 'codec', None)
+    if not isinstance(codec, StructCodec):
+        raise TypeError(f'{cls.__name__} has no StructCodec')
+
+    fields = codec.prefix + codec.fields
+    namespace: Dict[str, Any] = {'__slots__': ()}
+    offset: Optional[int] = 0
+    var_unpackers = []
+    for name, tp in fields:
+        fmt = codec.fixed_format(tp) if offset is not None else None
+        if fmt is None:
+            if offset is not None:
+                namespace['var_offset'] = offset
+                offset = None
+            namespace[name] = property(var_getter(len(var_unpackers)))
+            var_unpackers.append(field_unpacker(name, tp))
+            continue
+        fixed = fixed_types.get(tp) if not isinstance(tp, FixedType) else tp
+        if fixed is not None:
+            namespace[name] = property(fixed_getter(fixed.fmt, fixed.decode, offset))
+        else:
+            # nested fixed width struct
+            namespace[name] = property(struct_getter(field_unpacker(name, tp), offset))
+        offset += struct.calcsize('<' + fmt)
+
+    namespace['object_class'] = cls
+    namespace['field_names'] = tuple(name for name, _ in fields)
+    namespace['var_unpackers'] = tuple(var_unpackers)
+    view = type(f'{cls.__name__}View', (ObjectView,), namespace)
+    _view_classes[cls] = view
+    return view
@@ -8,7 +8,6 @@ import signal
 import socket
 import sys
 import threading
-import time
 import traceback
 import uvloop
 import yaml
@@ -18,7 +17,10 @@ from typing import Optional
 
 from . import eos
 from .bases import args, debug, helper, log, utils
+from .bases.read_write_lock import SharedReadWriteLock
 from .node import node, node_config, rpc, worker
+from .node.chain_info import ChainInfoSnapshot
+from .node.worker_pool import WorkerPool, WorkerStatistics
 from .tester import debug_server, server
 from .core.chain_exceptions import ChainException
 
@@ -50,7 +52,9 @@ class Main(object):
         self.rpc_server = None
 
         self.worker_processes = []
+        self.worker_pool: Optional[WorkerPool] = None
         self.rwlock = None
+        self.chain_info = None
         self.init_finished_event = threading.Event()
         self.init_worker_process_finished_event = None
 
@@ -91,6 +95,9 @@ class Main(object):
         return True
 
     def shutdown_worker_processes(self):
+        if self.worker_pool:
+            self.worker_pool.stop()
+            self.worker_pool = None
         for worker in self.worker_processes:
             p, msg, exit_event = worker
             exit_event.set() # shutdown worker
@@ -153,15 +160,11 @@ class Main(object):
 
             node.attach_node()
 
-            try:
-                worker_processes = node_config.get_config()['worker_processes']
-                if not self.start_worker_processes(worker_processes):
-                    eos.exit()
-                    self.init_finished_event.set()
-                    self.init_success = False
-                    return False
-            except KeyError:
-                logger.info('+++++no worker_process in config file')
+            if not self.start_workers():
+                eos.exit()
+                self.init_finished_event.set()
+                self.init_success = False
+                return False
             self.init_finished_event.set()
 
         except Exception as e:
@@ -211,15 +214,11 @@ class Main(object):
                 self.init_success = False
                 return False
 
-            try:
-                worker_processes = node_config.get_config()['worker_processes']
-                if not self.start_worker_processes(worker_processes):
-                    eos.exit()
-                    self.init_finished_event.set()
-                    self.init_success = False
-                    return False
-            except KeyError:
-                logger.info('+++++no worker_process in config file')
+            if not self.start_workers():
+                eos.exit()
+                self.init_finished_event.set()
+                self.init_success = False
+                return False
             self.init_finished_event.set()
 
         except Exception as e:
@@ -276,12 +275,52 @@ class Main(object):
         logger.info(f"quit {self.node_type}")
         eos.exit()
 
-    def start_worker_processes(self, worker_processes):
-        if not worker_processes:
+    def start_workers(self):
+        config = node_config.get_config()
+        worker_processes = config.get('worker_processes')
+        pool_config = config.get('worker_pool')
+        if not worker_processes and not pool_config:
+            logger.info('+++++no worker_processes or worker_pool in config file')
             return True
+
+        # pyeosnode creates the lock with the node, the connections take it when they push blocks
+        if not self.rwlock:
+            self.rwlock = SharedReadWriteLock()
+        self.chain_info = ChainInfoSnapshot()
+        # an attached eosnode has no accepted block callback, workers ask for chain info instead
+        if self.node_type != 'eosnode':
+            node.get_node().set_chain_info_snapshot(self.chain_info)
+
+        if worker_processes and not self.start_worker_processes(worker_processes):
+            return False
+        if pool_config:
+            return self.start_worker_pool(pool_config)
+        return True
+
+    def start_worker_processes(self, worker_processes):
         self.worker_processes = []
-        self.rwlock = worker.ReadWriteLock()
+        for rpc_address in worker_processes:
+            if not utils.can_listen(rpc_address):
+                logger.error('rpc_address %s is in use', rpc_address)
+                return False
+            ret = self.start_worker_process(rpc_address)
+            if not ret:
+                return False
+            self.worker_processes.append(ret)
+        return True
+
+    def start_worker_pool(self, pool_config):
+        rpc_address = pool_config.get('rpc_address')
+        if not rpc_address or not utils.can_listen(rpc_address):
+            logger.error('worker_pool rpc_address %s is invalid or in use', rpc_address)
+            return False
+
+        def start_pool_worker(rpc_address, statistics):
+            return self.start_worker_process(rpc_address, statistics, True)
+        self.worker_pool = WorkerPool.from_config(pool_config, start_pool_worker)
+        return self.worker_pool.start()
 
+    def start_worker_process(self, rpc_address, statistics: Optional[WorkerStatistics] = None, reuse_port: bool = False):
         data_dir = eos.data_dir()
         config_dir = eos.config_dir()
         if self.node_type == 'eosnode':
@@ -289,39 +328,42 @@ class Main(object):
         else:
             state_size = int(node.get_node().chain.get_chain_config()['state_size'])
 
-        for rpc_address in worker_processes:
-            if not utils.can_listen(rpc_address):
-                logger.error('rpc_address %s is in use', rpc_address)
-                return False
-            in_queue, out_queue = Queue(), Queue()
-            exit_event = Event()
-            messenger = worker.Messenger(in_queue, out_queue)
-            logger.info('start worker %s', rpc_address)
-            p = Process(target=worker.run, args=(rpc_address, self.rwlock, worker.Messenger(out_queue, in_queue), exit_event, data_dir, config_dir, state_size))
-            p.start()
-            ret = messenger.get_timeout(3.0)
-            if not ret:
-                logger.error('worker %s start failed', rpc_address)
-                return False
-            logger.info('worker %s started', rpc_address)
-            self.worker_processes.append((p, messenger, exit_event))
-
-            def message_listener(messenger):
-                while True:
-                    try:
-                        msg = messenger.get()
-                        if not msg:
-                            break
+        exit_event = Event()
+        messenger, worker_messenger = worker.new_messenger_pair()
+        logger.info('start worker %s', rpc_address)
+        p = Process(target=worker.run, args=(rpc_address, self.rwlock, self.chain_info, worker_messenger, exit_event, data_dir, config_dir, state_size, statistics, reuse_port))
+        p.start()
+        # the worker owns its end, reads of ours fail with EOFError once the worker is gone
+        worker_messenger.conn.close()
+        ret = messenger.get_timeout(3.0)
+        if not ret:
+            logger.error('worker %s start failed', rpc_address)
+            # a worker that is still starting would keep the port and the lock
+            p.terminate()
+            p.join()
+            messenger.conn.close()
+            return None
+        logger.info('worker %s started', rpc_address)
+
+        def message_listener(messenger):
+            while True:
+                try:
+                    msg = messenger.get()
+                    if not msg:
+                        break
+                    logger.info('worker %s message: %s', rpc_address, msg)
+                    if msg == 'get_info':
+                        msg = node.get_node().api.get_info(is_json=False)
+                        messenger.put(msg)
                         logger.info('worker %s message: %s', rpc_address, msg)
-                        if msg == 'get_info':
-                            msg = node.get_node().api.get_info(is_json=False)
-                            messenger.put(msg)
-                            logger.info('worker %s message: %s', rpc_address, msg)
-                    except Exception as e:
-                        logger.error('message_listener error: %s', e)
-                        messenger.put(str(e))
-            threading.Thread(target=message_listener, args=(messenger, )).start()
-        return True
+                except (EOFError, OSError):
+                    # worker process is gone
+                    break
+                except Exception as e:
+                    logger.error('message_listener error: %s', e)
+                    messenger.put(str(e))
+        threading.Thread(target=message_listener, args=(messenger, )).start()
+        return p, messenger, exit_event
 
     def handle_signal(self, signum):
         logger.info("handle_signal: %s", signum)
@@ -385,6 +427,8 @@ class Main(object):
         has_producer = node_config.get_producer_config() is not None
         logger.info("++++has_producer: %s", has_producer)
 
+        # created before the node so that the network and the rpc server share it with the workers
+        self.rwlock = SharedReadWriteLock()
         try:
             _node = node.init_node(result.genesis_file, result.snapshot_file, self.rwlock)
         except ChainException as e:
@@ -399,15 +443,10 @@ class Main(object):
         loop.add_signal_handler(signal.SIGINT, self.handle_signal, signal.SIGINT)
         loop.add_signal_handler(signal.SIGTERM, self.handle_signal, signal.SIGTERM)
 
-        try:
-            worker_processes = node_config.get_config()['worker_processes']
-            if not self.start_worker_processes(worker_processes):
-                self.quit_node()
-                await self.shutdown()
-                return False
-        except KeyError:
-            logger.info('+++++no worker_process_num in config file')
-            pass
+        if not self.start_workers():
+            self.quit_node()
+            await self.shutdown()
+            return False
 
         if not self.start_webserver(self.quit_node):
             await self.shutdown()
@@ -0,0 +1,105 @@
+import asyncio
+import queue
+import threading
+from typing import Optional
+
+from ..bases import log
+from ..core.blocks import BlockHeader
+
+default_block_apply_queue_size = 64
+
+logger = log.get_logger(__name__)
+
+class BlockApplier(object):
+    """
+    Applies the blocks received by a connection on a dedicated thread so that reading from the
+    socket overlaps with block validation.
+
+    At most `queue_size` blocks are queued; `put` waits for a free slot, which stops the
+    connection from reading the socket and lets TCP flow control slow down the peer.
+
+    The results are handed to `conn.on_block_applied` by a single task in the order the blocks
+    were applied. `conn.apply_block` must hold the chain write lock, the event loop reads the
+    chain while the thread applies blocks.
+    """
+    def __init__(self, conn, queue_size: int = default_block_apply_queue_size):
+        self.conn = conn
+        self.queue_size = queue_size
+        self.queue = queue.Queue()
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.results: Optional[asyncio.Queue] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.reply_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.thread:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.slots = asyncio.Semaphore(self.queue_size)
+        self.results = asyncio.Queue()
+        self.reply_task = asyncio.create_task(self.reply())
+        self.thread = threading.Thread(target=self.run, name=f'block-applier-{self.conn.peer}', daemon=True)
+        self.thread.start()
+
+    async def stop(self):
+        if not self.thread:
+            return
+        self.queue.put(None)
+        thread = self.thread
+        self.thread = None
+        await self.loop.run_in_executor(None, thread.join)
+        # the results of the applied blocks are queued before the thread exits
+        self.results.put_nowait(None)
+        await self.reply_task
+        self.reply_task = None
+
+    def is_running(self):
+        return self.thread is not None
+
+    def pending_blocks(self):
+        return self.queue.qsize()
+
+    async def put(self, header: BlockHeader, raw_block: bytes):
+        await self.slots.acquire()
+        self.queue.put((header, raw_block))
+
+    def discard_pending_blocks(self):
+        # blocks queued after a failed block can not be linked either
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self.queue.put(None)
+                return
+            self.loop.call_soon_threadsafe(self.slots.release)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            header, raw_block = item
+            try:
+                result = self.conn.apply_block(header, raw_block)
+            except Exception as e:
+                result = e
+                self.discard_pending_blocks()
+            self.loop.call_soon_threadsafe(self.on_block_applied, header, raw_block, result)
+        logger.info('block applier for %s exit', self.conn.peer)
+
+    def on_block_applied(self, header: BlockHeader, raw_block: bytes, result):
+        self.slots.release()
+        self.results.put_nowait((header, raw_block, result))
+
+    async def reply(self):
+        while True:
+            item = await self.results.get()
+            if item is None:
+                break
+            try:
+                await self.conn.on_block_applied(*item)
+            except Exception as e:
+                logger.exception(e)
@@ -0,0 +1,102 @@
+import asyncio
+import collections
+from concurrent.futures import Executor
+from typing import List, Optional
+
+from ..bases import log
+from ..core.chain import Chain
+from .messages import signed_block_message
+
+default_sync_read_ahead = 256
+default_sync_send_batch = 32
+default_sync_read_threads = 2
+
+logger = log.get_logger(__name__)
+
+def pack_signed_block_frame(raw_block: bytes) -> bytes:
+    return int.to_bytes(len(raw_block) + 1, 4, 'little') + bytes([signed_block_message]) + raw_block
+
+class BlockServer(object):
+    """
+    Serves a sync request by reading blocks ahead on a thread pool and writing them to the peer in
+    batches, with one `drain` per batch instead of one per block.
+
+    Irreversible blocks are read from the memory mapped blocks.log without calling into the controller,
+    blocks that are not in the block log and reversible blocks are read through the chain, a
+    `LockedChain` that holds the read lock, on the same pool. `executor` is owned by the caller and
+    reused by its requests, None is the default executor of the loop.
+    """
+    def __init__(self, chain: Chain, writer: asyncio.StreamWriter, read_ahead: int = default_sync_read_ahead,
+                 batch_size: int = default_sync_send_batch, executor: Optional[Executor] = None):
+        self.chain = chain
+        self.writer = writer
+        self.batch_size = max(batch_size, 1)
+        self.max_pending_batches = max(read_ahead // self.batch_size, 1)
+        self.block_log = chain.get_raw_block_log()
+        self.executor = executor
+        self.sent_blocks = 0
+
+    def read_log_frames(self, start_block: int, end_block: int) -> List[bytes]:
+        """
+        Stops at the first block that is not in the block log.
+        """
+        frames = []
+        for num in range(start_block, end_block + 1):
+            raw_block = self.block_log.read_block(num)
+            if raw_block is None:
+                break
+            frames.append(pack_signed_block_frame(raw_block))
+        return frames
+
+    def read_frames(self, start_block: int, end_block: int) -> List[bytes]:
+        frames = []
+        for num in range(start_block, end_block + 1):
+            try:
+                raw_block = self.chain.fetch_raw_block_by_number(num)
+            except Exception as e:
+                logger.info('+++++no block for num: %s, %s', num, e)
+                break
+            frames.append(pack_signed_block_frame(raw_block))
+        return frames
+
+    def read_batch_frames(self, start_block: int, end_block: int, irreversible: bool) -> List[bytes]:
+        """
+        Runs on the pool.
+        """
+        frames = []
+        if self.block_log and irreversible:
+            frames = self.read_log_frames(start_block, end_block)
+        if len(frames) <= end_block - start_block:
+            frames.extend(self.read_frames(start_block + len(frames), end_block))
+        return frames
+
+    async def read_batch(self, start_block: int, end_block: int) -> List[bytes]:
+        irreversible = end_block <= self.chain.last_irreversible_block_num()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.read_batch_frames, start_block, end_block, irreversible)
+
+    async def serve(self, start_block: int, end_block: int) -> bool:
+        """
+        Sends blocks from `start_block` to `end_block` to the peer, returns False if a block is missing.
+        """
+        pending = collections.deque()
+        next_block = start_block
+        try:
+            while pending or next_block <= end_block:
+                while next_block <= end_block and len(pending) < self.max_pending_batches:
+                    batch_end = min(next_block + self.batch_size - 1, end_block)
+                    pending.append((batch_end - next_block + 1, asyncio.create_task(self.read_batch(next_block, batch_end))))
+                    next_block = batch_end + 1
+
+                count, future = pending.popleft()
+                frames = await future
+                if frames:
+                    self.writer.writelines(frames)
+                    await self.writer.drain()
+                    self.sent_blocks += len(frames)
+                if len(frames) < count:
+                    return False
+            return True
+        finally:
+            for _, future in pending:
+                future.cancel()
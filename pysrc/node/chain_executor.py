@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi.responses import PlainTextResponse
+
+from . import node_config
+from ..bases import log
+
+default_rpc_threads = 2
+default_rpc_queue_size = 64
+default_rpc_timeout = 10.0 # in seconds
+
+logger = log.get_logger(__name__)
+
+class ChainExecutorBusy(Exception):
+    pass
+
+class ChainExecutorTimeout(Exception):
+    pass
+
+class ChainExecutor(object):
+    """
+    Runs native chain calls of RPC handlers on a thread pool so they do not block the event loop.
+    Queries hold `chain_read_lock` and run concurrently, read only transactions hold
+    `chain_transaction_lock` and run alone in their process.
+
+    At most `max_pending` calls are queued or running, more calls fail with `ChainExecutorBusy`.
+    A call that does not finish in `timeout` seconds fails with `ChainExecutorTimeout`, it is dropped
+    if it has not started yet, otherwise it keeps its thread and its place in the queue until the
+    native call returns.
+    """
+    def __init__(self, max_workers: int, max_pending: int, timeout: float, thread_name_prefix: str = 'chain-executor'):
+        self.executor = ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix=thread_name_prefix)
+        self.max_pending = max(max_pending, 1)
+        self.timeout = timeout
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.lock = threading.Lock()
+
+    def on_done(self, future):
+        with self.lock:
+            self.pending -= 1
+
+    async def run(self, fn: Callable, *args):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ChainExecutorBusy(f'{self.pending} chain calls are pending')
+            self.pending += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self.on_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ChainExecutorTimeout(f'chain call timed out after {self.timeout} seconds')
+
+    def get_statistics(self) -> dict:
+        return {
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+def get_rpc_config(key: str, default):
+    try:
+        return node_config.get_config()[key]
+    except:
+        return default
+
+_read_executor: Optional[ChainExecutor] = None
+_transaction_executor: Optional[ChainExecutor] = None
+
+def get_read_executor() -> ChainExecutor:
+    """
+    Executor of read only chain queries such as get_table_rows, they run concurrently under the read lock.
+    """
+    global _read_executor
+    if not _read_executor:
+        threads = get_rpc_config('rpc_threads', default_rpc_threads)
+        queue_size = get_rpc_config('rpc_queue_size', default_rpc_queue_size)
+        timeout = get_rpc_config('rpc_timeout', default_rpc_timeout)
+        logger.info('+++++rpc_threads: %s, rpc_queue_size: %s, rpc_timeout: %s', threads, queue_size, timeout)
+        _read_executor = ChainExecutor(threads, queue_size, timeout, 'rpc-read')
+    return _read_executor
+
+def get_transaction_executor() -> ChainExecutor:
+    """
+    Executor of read only transactions, a transaction holds the controller of the worker like a query.
+    """
+    global _transaction_executor
+    if not _transaction_executor:
+        queue_size = get_rpc_config('rpc_queue_size', default_rpc_queue_size)
+        timeout = get_rpc_config('rpc_timeout', default_rpc_timeout)
+        _transaction_executor = ChainExecutor(1, queue_size, timeout, 'rpc-transaction')
+    return _transaction_executor
+
+def reset_executors():
+    """
+    Forgets the executors of the parent process in a forked worker, their threads do not exist in the child.
+    """
+    global _read_executor, _transaction_executor
+    _read_executor = None
+    _transaction_executor = None
+
+def generate_executor_error(e: Exception) -> PlainTextResponse:
+    if isinstance(e, ChainExecutorBusy):
+        message = 'Too Many Pending Requests, try again later.'
+    else:
+        message = 'Request Timeout, try again later.'
+    error = f'{{"code":400, "message":"{message}","error":{{"code":0,"name":"","what":"","details":[]}}}}'
+    return PlainTextResponse(error, status_code=400)
@@ -0,0 +1,143 @@
+import json
+import struct
+from typing import Dict, Optional, Tuple
+
+from ..bases.shared_snapshot import SharedSnapshot
+
+# room for get_info as JSON text when it does not fit in the fixed layout
+RAW_INFO_CAPACITY = 64 * 1024
+
+# fields of get_info in the order nodeos returns them: name, struct format, kind
+CHAIN_INFO_FIELDS = (
+    ('server_version', '16s', 'str'),
+    ('chain_id', '32s', 'id'),
+    ('head_block_num', 'I', 'int'),
+    ('last_irreversible_block_num', 'I', 'int'),
+    ('last_irreversible_block_id', '32s', 'id'),
+    ('head_block_id', '32s', 'id'),
+    ('head_block_time', '32s', 'str'),
+    ('head_block_producer', '16s', 'str'),
+    ('virtual_block_cpu_limit', 'Q', 'int'),
+    ('virtual_block_net_limit', 'Q', 'int'),
+    ('block_cpu_limit', 'Q', 'int'),
+    ('block_net_limit', 'Q', 'int'),
+    ('server_version_string', '64s', 'str'),
+    ('fork_db_head_block_num', 'I', 'int'),
+    ('fork_db_head_block_id', '32s', 'id'),
+    ('server_full_version_string', '128s', 'str'),
+    ('total_cpu_weight', 'Q', 'int'),
+    ('total_net_weight', 'Q', 'int'),
+    ('earliest_available_block_num', 'I', 'int'),
+    ('last_irreversible_block_time', '32s', 'str'),
+)
+
+# a bit mask of the fields present in get_info precedes the fields
+chain_info_layout = struct.Struct('<Q' + ''.join(fmt for _, fmt, _ in CHAIN_INFO_FIELDS))
+# set in the mask if the mask is followed by get_info as JSON text instead of the fields
+RAW_INFO = 1 << 63
+
+class ChainInfoSnapshot(object):
+    """
+    get_info of the main node in a fixed layout shared memory region, see `CHAIN_INFO_FIELDS`.
+
+    The main node publishes on every accepted block, worker processes read it without locks or
+    messages. A reader renders the JSON text once per published version.
+
+    get_info with a field that is not in `CHAIN_INFO_FIELDS` or a value that does not fit in its
+    field, such as a longer version string, is published as JSON text and read back unchanged.
+    """
+    def __init__(self, snapshot: Optional[SharedSnapshot] = None):
+        if not snapshot:
+            snapshot = SharedSnapshot(capacity=max(chain_info_layout.size, RAW_INFO_CAPACITY))
+        self.snapshot = snapshot
+        self.version = 0
+        self.info: Optional[str] = None
+
+    def __getstate__(self):
+        return {'snapshot': self.snapshot}
+
+    def __setstate__(self, state):
+        self.__init__(state['snapshot'])
+
+    def free(self):
+        self.snapshot.free()
+
+    def publish(self, info: str) -> int:
+        """
+        Packs get_info returned by the chain, returns the new version.
+        """
+        data = pack_chain_info(info)
+        if data is None:
+            data = struct.pack('<Q', RAW_INFO) + info.encode()
+        return self.snapshot.publish(data)
+
+    def read(self) -> Tuple[int, Optional[Dict]]:
+        """
+        Returns the version and the fields of get_info, (0, None) if nothing has been published yet.
+        """
+        version, data = self.snapshot.read()
+        if not version:
+            return 0, None
+        return version, decode_chain_info(data)
+
+    def get_info(self) -> Optional[str]:
+        """
+        Returns get_info as JSON text, None if nothing has been published yet.
+        """
+        version, data = self.snapshot.read()
+        if version != self.version:
+            self.version = version
+            if not version:
+                self.info = None
+            elif is_raw_info(data):
+                self.info = data[8:].decode()
+            else:
+                self.info = json.dumps(decode_chain_info(data), separators=(',', ':'))
+        return self.info
+
+def is_raw_info(data: bytes) -> bool:
+    return bool(struct.unpack_from('<Q', data)[0] & RAW_INFO)
+
+def pack_chain_info(info: str) -> Optional[bytes]:
+    """
+    Packs get_info in the fixed layout, returns None if it can not be decoded back unchanged.
+    """
+    info = json.loads(info)
+    present = 0
+    values = []
+    try:
+        for i, (name, _, kind) in enumerate(CHAIN_INFO_FIELDS):
+            value = info.get(name)
+            if value is not None:
+                present |= 1 << i
+            if kind == 'int':
+                values.append(int(value or 0))
+            elif kind == 'id':
+                values.append(bytes.fromhex(value or ''))
+            else:
+                values.append((value or '').encode())
+        data = chain_info_layout.pack(present, *values)
+        # unknown fields, truncated strings or ids, integers in another format
+        if decode_chain_info(data) != info:
+            return None
+    except (struct.error, TypeError, ValueError):
+        return None
+    return data
+
+def decode_chain_info(data: bytes) -> Dict:
+    if is_raw_info(data):
+        return json.loads(data[8:])
+    present, *values = chain_info_layout.unpack(data)
+    info = {}
+    for i, (name, _, kind) in enumerate(CHAIN_INFO_FIELDS):
+        if not present & (1 << i):
+            continue
+        value = values[i]
+        if kind == 'int':
+            # like fc::json, integers wider than 32 bits are strings
+            info[name] = value if value <= 0xffffffff else str(value)
+        elif kind == 'id':
+            info[name] = value.hex()
+        else:
+            info[name] = value.rstrip(b'\x00').decode()
+    return info
@@ -261,6 +261,10 @@ class ChainApi(object):
         ret = _chainapi.get_table_by_scope(self.ptr, params)
         return self.parse_return_value(ret)
 
+    def get_table_by_scope_ex(self, params, return_json = True):
+        ret = _chainapi.get_table_by_scope(self.ptr, params)
+        return self.parse_return_value(ret, return_json)
+
     def get_currency_balance(self, code: str, account: str, symbol: Optional[str]=''):
         '''
             struct get_currency_balance_params {
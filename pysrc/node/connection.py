@@ -4,9 +4,15 @@ import secrets
 import socket
 import ssl
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Optional, Union
 
 from . import node_config
+from .block_applier import BlockApplier, default_block_apply_queue_size
+from .block_server import BlockServer, default_sync_read_ahead, default_sync_read_threads, default_sync_send_batch
+from .frame_reader import FrameReader
+from .locked_chain import LockedChain
 from .messages import (
     MessageType,
     NetMessage,
@@ -44,10 +50,17 @@ block_count_per_slot = 2 * 60 # one minute per slot
 
 print_sync_blocks_info_interval = 10
 
+class BlockApplyResult(Enum):
+    applied = 0
+    duplicated = 1
+    # block number is not the next block of the chain head
+    unexpected = 2
+
 class Connection(object):
     def __init__(self, chain: Chain, rwlock = None, peer: str = ''):
         self.peer = peer
-        self.chain = chain
+        # the chain is read in the loop while blocks are applied by the block applier thread
+        self.chain = chain if isinstance(chain, LockedChain) else LockedChain(chain, rwlock)
         self.rwlock = rwlock
         self.set_default()
         self.goway_listeners = []
@@ -58,6 +71,12 @@ class Connection(object):
         self.lock = asyncio.Lock()
         self.sync_request_task = None
         self.sync_task = None
+        # set by SyncScheduler while blocks are synced from multiple peers
+        self.sync_scheduler = None
+        # set by stop_reading, handle_messages returns before it reads the next message
+        self.stop_reading_event: Optional[asyncio.Event] = None
+        # reads the blocks of the sync requests of the peer, created on the first request
+        self.block_read_executor: Optional[ThreadPoolExecutor] = None
 
         try:
             self.has_producer = node_config.get_producer_config()
@@ -70,6 +89,37 @@ class Connection(object):
         except:
             self.sync_fetch_span = default_sync_fetch_span
 
+        try:
+            net_config = node_config.get_net_config()
+            self.sync_read_ahead = net_config['sync_read_ahead']
+        except:
+            self.sync_read_ahead = default_sync_read_ahead
+
+        try:
+            net_config = node_config.get_net_config()
+            self.sync_send_batch = net_config['sync_send_batch']
+        except:
+            self.sync_send_batch = default_sync_send_batch
+
+        try:
+            net_config = node_config.get_net_config()
+            self.sync_read_threads = net_config['sync_read_threads']
+        except:
+            self.sync_read_threads = default_sync_read_threads
+
+        try:
+            net_config = node_config.get_net_config()
+            block_apply_queue_size = net_config['block_apply_queue_size']
+        except:
+            block_apply_queue_size = default_block_apply_queue_size
+
+        # 0 disables the applier thread, blocks are then pushed in the read loop
+        if block_apply_queue_size > 0:
+            self.block_applier = BlockApplier(self, block_apply_queue_size)
+        else:
+            self.block_applier = None
+        self.block_apply_failed = False
+
         try:
             net_config = node_config.get_net_config()
             socks5_proxy = net_config['socks5_proxy']
@@ -92,6 +142,9 @@ class Connection(object):
         self.connected = False
         self.reader = None
         self.writer = None
+        self.frame_reader: Optional[FrameReader] = None
+        # read of the next chunk left pending by wait_for_message
+        self.fill_task: Optional[asyncio.Task] = None
         # self.last_notice_message = None
         self.time_message_latency = 0.0
         self.generation = 1
@@ -125,7 +178,14 @@ class Connection(object):
         self.closed = True
         if self.writer:
             self.writer.close()
+        if self.fill_task:
+            self.fill_task.cancel()
+            self.fill_task = None
+        if self.block_read_executor:
+            self.block_read_executor.shutdown(wait=False, cancel_futures=True)
+            self.block_read_executor = None
         self.reader = None
+        self.frame_reader = None
 
     async def sleep(self, seconds: float):
         while seconds > 0.0:
@@ -145,28 +205,17 @@ class Connection(object):
         return None
 
     async def read_message(self):
-        msg_len = await self.read(4)
-        if not msg_len:
+        if self.closed:
             return (None, None)
-        msg_len = int.from_bytes(msg_len, 'little')
-        if msg_len >= max_package_size or msg_len < 2:
+        try:
+            return await self.frame_reader.read_frame()
+        except asyncio.exceptions.IncompleteReadError as e:
+            self.logger.error(f'asyncio.exceptions.IncompleteReadError: len(e.partial)={len(e.partial)}, e.expected={e.expected}')
             self.close()
-            raise Exception(f'bad message length: {msg_len}')
-            return (None, None)
-
-        msg_type = await self.read(1)
-        if not msg_type:
-            self.logger.error(f'fail to read msg type')
-            # self.close()
-            return (None, None)
-        msg_type = msg_type[0]
-        # self.logger.info(f'+++{msg_type}, {msg_len}')
-        msg = await self.read(msg_len-1)
-        if not msg:
-            self.logger.error(f'fail to read msg')
-            # self.close()
-            return (None, None)
-        return msg_type, msg
+        except ValueError as e:
+            self.close()
+            raise Exception(str(e))
+        return (None, None)
 
     def write(self, data):
         if self.closed:
@@ -388,27 +437,20 @@ class Connection(object):
         else:
             self.logger.info(f"block speed: {block_sync_speed} b/s, current block num: {received_block_num}, current block time: {header.block_time()}")
 
-    def push_block(self, raw_block: bytes, return_statistics: bool = False):
-        if self.has_producer:
-            if self.rwlock:
-                with self.rwlock.wlock():
-                    return eos.push_signed_block(raw_block)
-            else:
-                return eos.push_signed_block(raw_block)
-        else:
-            if self.rwlock:
-                with self.rwlock.wlock():
-                    ret, statistics = self.chain.push_raw_block(raw_block, return_statistics)
-                    if statistics:
-                        self.logger.info(statistics)
-            else:
-                ret, statistics = self.chain.push_raw_block(raw_block, return_statistics)
-                if statistics:
-                    self.logger.info(statistics)
+    def push_block(self, raw_block: Union[bytes, memoryview], return_statistics: bool = False):
+        with self.chain.write_lock():
+            if self.has_producer:
+                return eos.push_signed_block(bytes(raw_block))
+            ret, statistics = self.chain.push_raw_block(raw_block, return_statistics)
+            if statistics:
+                self.logger.info(statistics)
 
+    def apply_block(self, header: BlockHeader, raw_msg: bytes) -> BlockApplyResult:
+        # the head block can not change between the checks and the push
+        with self.chain.write_lock():
+            return self._apply_block(header, raw_msg)
 
-    async def on_signed_block_message(self, raw_msg: bytes):
-        header = BlockHeader.unpack_bytes(raw_msg)
+    def _apply_block(self, header: BlockHeader, raw_msg: bytes) -> BlockApplyResult:
         received_block_num = header.block_num()
         head_block_num = self.chain.head_block_num()
         # self.logger.info(f"++++++++head_block_num: {head_block_num}, received_block_num: {received_block_num}, received_block_time: {header.block_time()}")
@@ -419,11 +461,26 @@ class Connection(object):
             block_id = self.chain.get_block_id_for_num(received_block_num)
             if block_id == received_block_id:
                 self.logger.info(f"++++++++receive duplicated block: head_block_num: {head_block_num}, received_block_num: {received_block_num}, received block_id: {received_block_id}")
-                return True
+                return BlockApplyResult.duplicated
             else:
                 self.logger.info(f"++++++++receive invalid block, maybe fork happened: {received_block_num}, block_id: {block_id}, received block_id: {received_block_id}")
         elif head_block_num +1 < received_block_num:
             self.logger.error(f"++++++++++invalid incomming block number: expected: {head_block_num + 1}: received: {received_block_num}")
+            return BlockApplyResult.unexpected
+
+        if time.time() - header.block_time_ms() / 1000 < 60:
+            return_statistics = True
+        else:
+            return_statistics = False
+
+        self.push_block(raw_msg, return_statistics)
+        return BlockApplyResult.applied
+
+    async def on_block_applied(self, header: BlockHeader, raw_msg: bytes, result):
+        received_block_num = header.block_num()
+        if result == BlockApplyResult.duplicated:
+            return True
+        elif result == BlockApplyResult.unexpected:
             if not await self.send_reset_sync_request_message():
                 return False
             req_trx = OrderedIds(IdListModes.none, 0, [])
@@ -435,17 +492,8 @@ class Connection(object):
             # if not await self.send_handshake_message():
             #     return False
             # return True
-        try:
-            if time.time() - header.block_time_ms() / 1000 < 60:
-                return_statistics = True
-            else:
-                return_statistics = False
-
-            self.push_block(raw_msg, return_statistics)
-
-            await asyncio.sleep(0.0)
         # unlinkable_block_exception
-        except UnlinkableBlockException as e:
+        elif isinstance(result, UnlinkableBlockException):
             if not await self.send_reset_sync_request_message():
                 return False
             received_block_id = header.calculate_id()
@@ -456,22 +504,25 @@ class Connection(object):
             msg = RequestMessage(req_trx, req_blocks)
             self.logger.info(f'send request message: {msg}')
             return await self.send_message(msg)
-        except ForkDatabaseException as e:
+        elif isinstance(result, ForkDatabaseException):
             # fork_database_exception
-            self.logger.exception(e)
-            if e.json()['stack'][0]['format'].startswith('we already know about this block'):
-                self.logger.warning(f"++++++++receive duplicated block: {received_block_num}, block_id: {block_id}")
+            self.logger.exception(result)
+            if result.json()['stack'][0]['format'].startswith('we already know about this block'):
+                self.logger.warning(f"++++++++receive duplicated block: {received_block_num}, block_id: {header.calculate_id()}")
                 return True
             else:
+                self.block_apply_failed = True
                 eos.exit()
                 return False
-        except DatabaseGuardException as e:
-            self.logger.fatal(f"%s", e)
+        elif isinstance(result, DatabaseGuardException):
+            self.logger.fatal(f"%s", result)
+            self.block_apply_failed = True
             eos.exit()
             return False
-        except Exception as e:
-            self.logger.fatal(f"%s", e)
-            self.logger.exception(e)
+        elif isinstance(result, Exception):
+            self.logger.fatal(f"%s", result)
+            self.logger.exception(result)
+            self.block_apply_failed = True
             eos.exit()
             return False
 
@@ -504,23 +555,59 @@ class Connection(object):
 
         return True
 
+    async def queue_signed_block(self, header: BlockHeader, raw_msg: bytes):
+        if self.block_apply_failed:
+            return False
+        received_block_num = header.block_num()
+        await self.block_applier.put(header, raw_msg)
+        # request the next range as soon as the last block of the current one arrives,
+        # so the peer keeps sending while the queued blocks are applied
+        if self.last_sync_request and self.last_sync_request.end_block == received_block_num:
+            if self.last_handshake and self.last_handshake.last_irreversible_block_num > received_block_num:
+                return await self.send_sync_request_message(received_block_num + 1)
+        return True
+
+    async def on_signed_block_message(self, raw_msg: Union[bytes, memoryview]):
+        if self.sync_scheduler or self.block_applier:
+            # the block is applied after the next frame is read
+            raw_msg = self.frame_reader.detach(raw_msg)
+        header = BlockHeader.unpack_bytes(raw_msg)
+        if self.sync_scheduler:
+            return await self.sync_scheduler.on_signed_block_message(self, header, raw_msg)
+
+        if self.block_applier:
+            return await self.queue_signed_block(header, raw_msg)
+
+        try:
+            result = self.apply_block(header, raw_msg)
+            await asyncio.sleep(0.0)
+        except Exception as e:
+            result = e
+        return await self.on_block_applied(header, raw_msg, result)
+
+    def get_block_read_executor(self) -> ThreadPoolExecutor:
+        if not self.block_read_executor:
+            self.block_read_executor = ThreadPoolExecutor(max_workers=max(self.sync_read_threads, 1), thread_name_prefix='block-reader')
+        return self.block_read_executor
+
     async def handle_sync_request_message(self, message: SyncRequestMessage):
+        server = BlockServer(self.chain, self.writer, self.sync_read_ahead, self.sync_send_batch, self.get_block_read_executor())
         try:
-            for num in range(message.start_block, message.end_block+1):
-                raw_block = self.chain.fetch_block_by_number(num)
-                if raw_block:
-                    if not await self.send_message(SignedBlockMessage(raw_block)):
-                        return False
-                else:
-                    self.logger.info(f"+++++++++no block for num: {num}")
-                    break
+            if not await server.serve(message.start_block, message.end_block):
+                self.logger.info(f"+++++++++no block for num: {message.start_block + server.sent_blocks}")
         except asyncio.exceptions.CancelledError:
             self.logger.info(f"handle_sync_request_message CancelledError")
+        except Exception as e:
+            self.logger.error(f'connection error when sending blocks {message}')
+            self.logger.exception(e)
+            self.close()
         self.sync_request_task = None
 
     async def on_handshake_message(self, message: HandshakeMessage):
         self.last_handshake = message
         self.logger.info("received handshake message: %s", message)
+        if self.sync_scheduler:
+            return await self.sync_scheduler.on_handshake_message(self, message)
         if self.chain.head_block_num() < message.last_irreversible_block_num:
             if not await self.send_sync_request_message():
                 return False
@@ -569,6 +656,9 @@ class Connection(object):
         return True
 
     async def on_notice_message(self, message: NoticeMessage):
+        if self.sync_scheduler:
+            # sync requests are sent by the scheduler
+            return True
         if message.known_blocks.mode == IdListModes.catch_up:
             pending = message.known_blocks.pending
             try:
@@ -617,6 +707,10 @@ class Connection(object):
         tp, raw_msg = await self.read_message()
         if not raw_msg or eos.should_exit():
             return False
+        if tp == MessageType.signed_block.value:
+            return await self.on_signed_block_message(raw_msg)
+        # other messages are small and may be kept around, e.g. last_handshake
+        raw_msg = bytes(raw_msg)
         if tp == MessageType.handshake.value:
             message = HandshakeMessage.unpack_bytes(raw_msg)
             return await self.on_handshake_message(message)
@@ -631,8 +725,6 @@ class Connection(object):
             message = RequestMessage.unpack_bytes(raw_msg)
             self.logger.info(message)
             return await self.on_request_message(message)
-        elif tp == MessageType.signed_block.value:
-            return await self.on_signed_block_message(raw_msg)
         elif tp == MessageType.time.value:
             message = TimeMessage.unpack_bytes(raw_msg)
             # self.logger.info(message)
@@ -656,8 +748,50 @@ class Connection(object):
             self.logger.info("++++%s %s", tp, raw_msg)
         return True
 
+    def stop_reading(self):
+        if self.stop_reading_event:
+            self.stop_reading_event.set()
+
+    async def wait_for_message(self) -> bool:
+        """
+        Waits until bytes of the next message are received, returns False if `stop_reading` is
+        called first. Nothing is consumed from the stream while waiting, a read that is still
+        pending when reading stops is waited for by the next call.
+        """
+        if self.stop_reading_event.is_set():
+            return False
+        if not self.frame_reader or self.frame_reader.pending_bytes():
+            # a closed connection is reported by read_message
+            return True
+        if not self.fill_task:
+            self.fill_task = asyncio.create_task(self.frame_reader.fill())
+        if not self.fill_task.done():
+            stop_task = asyncio.create_task(self.stop_reading_event.wait())
+            try:
+                await asyncio.wait([self.fill_task, stop_task], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                stop_task.cancel()
+            if not self.fill_task.done():
+                return False
+        fill_task, self.fill_task = self.fill_task, None
+        # a closed stream is reported by read_message
+        if not fill_task.cancelled():
+            fill_task.exception()
+        return True
+
     async def handle_messages(self):
         self.last_sync_request = None
+        self.block_apply_failed = False
+        self.stop_reading_event = asyncio.Event()
+        if self.block_applier:
+            self.block_applier.start()
+        try:
+            return await self._handle_messages()
+        finally:
+            if self.block_applier:
+                await self.block_applier.stop()
+
+    async def _handle_messages(self):
         # reset sync request cache in peer in case of lost connection during sync
         await self.send_reset_sync_request_message()
 
@@ -671,6 +805,9 @@ class Connection(object):
 
         while not eos.should_exit():
             try:
+                if not await self.wait_for_message():
+                    self.logger.info('+++++stop reading messages')
+                    return True
                 if not await self._handle_message():
                     return False
             except Exception as e:
@@ -730,6 +867,7 @@ class OutConnection(Connection):
                     self.reader, self.writer = await self.open_connection_socks5(self.proxy_host, self.proxy_port, host, port)
                 else:
                     self.reader, self.writer = await asyncio.open_connection(host, port, limit=100*1024*1024)
+            self.frame_reader = FrameReader(self.reader, max_package_size)
             if await self.estimate_connection_latency():
                 return self
             return None
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Tuple, Union
+
+default_read_size = 256*1024
+
+class FrameReader(object):
+    """
+    Reads net messages (frames) from a stream in large chunks.
+
+    A frame is `[u32 length][u8 type][body]`, `read_frame` returns `(type, body)` where body is a
+    memoryview. If the frame is contained in one chunk read from the stream, body is a slice of that
+    chunk and no bytes are copied. A frame that spans several chunks is assembled in a reusable
+    buffer, which is overwritten by the next frame, call `detach` to keep a body after that.
+    """
+    def __init__(self, reader: asyncio.StreamReader, max_frame_size: int, read_size: int = default_read_size):
+        self.reader = reader
+        self.max_frame_size = max_frame_size
+        self.read_size = read_size
+        self.chunk = memoryview(b'')
+        self.pos = 0
+        self.buffer = bytearray(read_size)
+
+    def pending_bytes(self):
+        return len(self.chunk) - self.pos
+
+    async def read_chunk(self, size: int):
+        data = await self.reader.read(max(size, self.read_size))
+        if not data:
+            raise asyncio.IncompleteReadError(b'', size)
+        self.chunk = memoryview(data)
+        self.pos = 0
+
+    async def fill(self):
+        """
+        Reads the next chunk if all read bytes are consumed. Cancelling `fill` loses no data, the
+        stream stays at a frame boundary.
+        """
+        if self.pending_bytes() == 0:
+            await self.read_chunk(0)
+
+    async def read(self, size: int) -> memoryview:
+        if len(self.chunk) - self.pos >= size:
+            ret = self.chunk[self.pos:self.pos+size]
+            self.pos += size
+            return ret
+
+        if len(self.buffer) < size:
+            # views of the old buffer may still be referenced, so do not resize it in place
+            self.buffer = bytearray(size)
+        buffer = memoryview(self.buffer)
+        filled = 0
+        while filled < size:
+            if self.pos >= len(self.chunk):
+                await self.read_chunk(size - filled)
+            n = min(len(self.chunk) - self.pos, size - filled)
+            buffer[filled:filled+n] = self.chunk[self.pos:self.pos+n]
+            self.pos += n
+            filled += n
+        return buffer[:size]
+
+    async def read_frame(self) -> Tuple[int, memoryview]:
+        header = await self.read(5)
+        msg_len = int.from_bytes(header[:4], 'little')
+        if msg_len >= self.max_frame_size or msg_len < 2:
+            raise ValueError(f'bad message length: {msg_len}')
+        msg_type = header[4]
+        return msg_type, await self.read(msg_len-1)
+
+    def detach(self, body: memoryview) -> Union[bytes, memoryview]:
+        """
+        Returns a body that stays valid after the next `read_frame` call.
+        """
+        if isinstance(body, memoryview) and body.obj is self.buffer:
+            return bytes(body)
+        return body
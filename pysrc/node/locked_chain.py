@@ -0,0 +1,137 @@
+import contextlib
+import os
+import threading
+
+class ProcessReadWriteLock(object):
+    """
+    Read write lock of the threads of one process, a waiting writer goes before new readers.
+    Not reentrant.
+    """
+    def __init__(self):
+        self.cond = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        with self.cond:
+            while self.writer or self.waiting_writers:
+                self.cond.wait()
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.readers -= 1
+                if not self.readers:
+                    self.cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        with self.cond:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.cond.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.writer = False
+                self.cond.notify_all()
+
+# reads of the chain database run concurrently, a read only transaction changes the pending block
+# of its process and excludes the other threads of the process
+process_lock = ProcessReadWriteLock()
+
+def reset_process_lock():
+    """
+    Workers are forked from the supervisor thread while other threads may hold the lock,
+    the child process starts with a new lock, the threads holding the old one do not exist in it.
+    """
+    global process_lock
+    process_lock = ProcessReadWriteLock()
+
+os.register_at_fork(after_in_child=reset_process_lock)
+
+@contextlib.contextmanager
+def chain_read_lock(rwlock = None):
+    """
+    Held by a thread of a process while it reads the chain, the threads of all processes read at the
+    same time, the shared read lock keeps the main process from applying a block meanwhile.
+    Without a shared lock the chain can only be used by the thread that updates it.
+    """
+    if not rwlock:
+        yield
+        return
+    with process_lock.read():
+        with rwlock.rlock():
+            yield
+
+@contextlib.contextmanager
+def chain_transaction_lock(rwlock = None):
+    """
+    Held while a read only transaction runs in the pending block of a worker, no other thread of the
+    worker uses the chain meanwhile, other processes keep reading. Only taken on executor threads,
+    never on the event loop.
+    """
+    if not rwlock:
+        yield
+        return
+    with process_lock.write():
+        with rwlock.rlock():
+            yield
+
+def chain_write_lock(rwlock = None):
+    """
+    Held while the chain is updated, the write lock excludes all readers of all processes.
+    """
+    if not rwlock:
+        return contextlib.nullcontext()
+    return rwlock.wlock()
+
+class LockedChain(object):
+    """
+    Wraps a chain so that the network code on the event loop never reads the controller while the
+    block applier thread updates it: every method is called under `chain_read_lock`, blocks are
+    applied under `write_lock`. A thread that holds the write lock calls the methods without
+    locking again.
+
+    The read lock is taken per call and is never held across an `await`, a writer waiting for the
+    lock can not deadlock the loop. Without a lock the methods are called directly.
+    """
+    def __init__(self, chain, rwlock = None):
+        self.chain = chain
+        self.rwlock = rwlock
+        self._local = threading.local()
+
+    def is_write_locked(self) -> bool:
+        return getattr(self._local, 'write_locked', False)
+
+    @contextlib.contextmanager
+    def write_lock(self):
+        if not self.rwlock or self.is_write_locked():
+            yield
+            return
+        with self.rwlock.wlock():
+            self._local.write_locked = True
+            try:
+                yield
+            finally:
+                self._local.write_locked = False
+
+    def __getattr__(self, name):
+        attr = getattr(self.chain, name)
+        if not callable(attr) or not self.rwlock:
+            return attr
+        rwlock = self.rwlock
+        def call(*args, **kwargs):
+            if self.is_write_locked():
+                return attr(*args, **kwargs)
+            with chain_read_lock(rwlock):
+                return attr(*args, **kwargs)
+        # looked up once per method
+        self.__dict__[name] = call
+        return call
@@ -2,6 +2,7 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Type, Union
 
 from .. import eos
+from ..bases.codec import FixedType, StructCodec
 from ..bases.packer import Decoder, Encoder
 from ..bases.types import I16, I64, U16, U32, U64, Checksum256, PublicKey, Signature
 from ..core.packed_transaction import PackedTransaction
@@ -69,6 +70,24 @@ class NetMessage(object):
 class HandshakeMessage(NetMessage):
     msg_type = handshake_message
 
+    codec = StructCodec([
+        ('network_version', U16),
+        ('chain_id', Checksum256),
+        ('node_id', Checksum256),
+        ('key', PublicKey),
+        ('time', I64),
+        ('token', Checksum256),
+        ('sig', Signature),
+        ('p2p_address', str),
+        ('last_irreversible_block_num', U32),
+        ('last_irreversible_block_id', Checksum256),
+        ('head_num', U32),
+        ('head_id', Checksum256),
+        ('os', str),
+        ('agent', str),
+        ('generation', I16),
+    ])
+
     def __init__(self, network_version: U16, chain_id: Checksum256, node_id: Checksum256, key: PublicKey, time: I64, token: Checksum256, sig: Signature, p2p_address: str, last_irreversible_block_num: U32, last_irreversible_block_id: Checksum256, head_num: U32, head_id: Checksum256, os: str, agent: str, generation: I16):
         """
         Initializes a new `NetPlugin` object with the specified parameters.
@@ -150,59 +169,12 @@ class HandshakeMessage(NetMessage):
             self.generation == other.generation
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u16(self.network_version)
-        enc.pack(self.chain_id)
-        enc.pack(self.node_id)
-        enc.pack(self.key)
-        enc.pack_i64(self.time)
-        enc.pack(self.token)
-        enc.pack(self.sig)
-        enc.pack_string(self.p2p_address)
-        enc.pack_u32(self.last_irreversible_block_num)
-        enc.pack(self.last_irreversible_block_id)
-        enc.pack_u32(self.head_num)
-        enc.pack(self.head_id)
-        enc.pack_string(self.os)
-        enc.pack_string(self.agent)
-        enc.pack_i16(self.generation)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        network_version = dec.unpack_u16()
-        chain_id = Checksum256.unpack(dec)
-        node_id = Checksum256.unpack(dec)
-        key = PublicKey.unpack(dec)
-        time = dec.unpack_i64()
-        token = Checksum256.unpack(dec)
-        sig = Signature.unpack(dec)
-        p2p_address = dec.unpack_string()
-        last_irreversible_block_num = dec.unpack_u32()
-        last_irreversible_block_id = Checksum256.unpack(dec)
-        head_num = dec.unpack_u32()
-        head_id = Checksum256.unpack(dec)
-        os = dec.unpack_string()
-        agent = dec.unpack_string()
-        generation = dec.unpack_i16()
-        return cls(
-            network_version,
-            chain_id,
-            node_id,
-            key,
-            time,
-            token,
-            sig,
-            p2p_address,
-            last_irreversible_block_num,
-            last_irreversible_block_id,
-            head_num,
-            head_id,
-            os,
-            agent,
-            generation
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -218,6 +190,13 @@ class HandshakeMessage(NetMessage):
 class ChainSizeMessage(NetMessage):
     msg_type = chain_size_message
 
+    codec = StructCodec([
+        ('last_irreversible_block_num', U32),
+        ('last_irreversible_block_id', Checksum256),
+        ('head_num', U32),
+        ('head_id', Checksum256),
+    ])
+
     def __init__(self, last_irreversible_block_num: U32, last_irreversible_block_id: Checksum256, head_num: U32, head_id: Checksum256):
         """
         Represents the current state of the network.
@@ -252,26 +231,12 @@ class ChainSizeMessage(NetMessage):
             self.head_id == other.head_id
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u32(self.last_irreversible_block_num)
-        enc.pack(self.last_irreversible_block_id)
-        enc.pack_u32(self.head_num)
-        enc.pack(self.head_id)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        last_irreversible_block_num = dec.unpack_u32()
-        last_irreversible_block_id = Checksum256.unpack(dec)
-        head_num = dec.unpack_u32()
-        head_id = Checksum256.unpack(dec)
-        return cls(
-            last_irreversible_block_num,
-            last_irreversible_block_id,
-            head_num,
-            head_id
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -306,6 +271,9 @@ class GoAwayReason(Enum):
     fatal_other = 10
     authentication = 11
 
+# packed as uint32
+go_away_reason_type = FixedType('I', lambda reason: reason.value, GoAwayReason)
+
 # struct go_away_message {
 #     go_away_message(go_away_reason r = no_reason) : reason(r), node_id() {}
 #     go_away_reason reason{no_reason};
@@ -315,6 +283,11 @@ class GoAwayReason(Enum):
 class GoAwayMessage(NetMessage):
     msg_type = go_away_message
 
+    codec = StructCodec([
+        ('reason', go_away_reason_type),
+        ('node_id', Checksum256),
+    ])
+
     def __init__(self, reason: GoAwayReason, node_id: Checksum256):
         """
         Initializes a new GoAwayMessage object with the given reason and node ID.
@@ -341,20 +314,12 @@ class GoAwayMessage(NetMessage):
             self.node_id == other.node_id
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u32(self.reason.value)
-        enc.pack(self.node_id)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        reason = GoAwayReason(dec.unpack_u32())
-        node_id = Checksum256.unpack(dec)
-        return cls(
-            reason,
-            node_id
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -372,6 +337,14 @@ class TimeMessage(NetMessage):
     A message that contains time synchronization information.
     """
     msg_type = time_message
+
+    codec = StructCodec([
+        ('org', I64),
+        ('rec', I64),
+        ('xmt', I64),
+        ('dst', I64),
+    ])
+
     def __init__(self, org: I64, rec: I64, xmt: I64, dst: I64):
         """
         Initializes a new TimeMessage object.
@@ -409,26 +382,12 @@ class TimeMessage(NetMessage):
             self.dst == other.dst
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_i64(self.org)
-        enc.pack_i64(self.rec)
-        enc.pack_i64(self.xmt)
-        enc.pack_i64(self.dst)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        org = dec.unpack_i64()
-        rec = dec.unpack_i64()
-        xmt = dec.unpack_i64()
-        dst = dec.unpack_i64()
-        return cls(
-            org,
-            rec,
-            xmt,
-            dst
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -447,6 +406,9 @@ class IdListModes(Enum):
     last_irr_catch_up = 2
     normal = 3
 
+# packed as uint32
+id_list_modes_type = FixedType('I', lambda mode: mode.value, IdListModes)
+
 # struct ordered_ids {
 #     select_ids() : mode(none),pending(0),ids() {}
 #     id_list_modes  mode{none};
@@ -456,6 +418,12 @@ class IdListModes(Enum):
 # }
 
 class OrderedIds(object):
+    codec = StructCodec([
+        ('mode', id_list_modes_type),
+        ('pending', U32),
+        ('ids', List[Checksum256]),
+    ])
+
     def __init__(self, mode: IdListModes, pending: U32, ids: List[Checksum256]):
         self.mode = mode
         self.pending = pending
@@ -478,23 +446,12 @@ class OrderedIds(object):
             self.ids == other.ids
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u32(self.mode.value)
-        enc.pack_u32(self.pending)
-        enc.pack_list(self.ids)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        mode = IdListModes(dec.unpack_u32())
-        pending = dec.unpack_u32()
-        ids = dec.unpack_list(Checksum256)
-        return cls(
-            mode,
-            pending,
-            ids
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -512,6 +469,11 @@ class RequestMessage(NetMessage):
     """
     msg_type = request_message
 
+    codec = StructCodec([
+        ('req_trx', OrderedIds),
+        ('req_blocks', OrderedIds),
+    ])
+
     def __init__(self, req_trx: OrderedIds, req_blocks: OrderedIds):
         """
         Initializes a new RequestMessage object.
@@ -538,20 +500,12 @@ class RequestMessage(NetMessage):
             self.req_blocks == other.req_blocks
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack(self.req_trx)
-        enc.pack(self.req_blocks)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        req_trx = OrderedIds.unpack(dec)
-        req_blocks = OrderedIds.unpack(dec)
-        return cls(
-            req_trx,
-            req_blocks
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -568,6 +522,12 @@ class NoticeMessage(NetMessage):
     A message sent by a node to notify other nodes of known transactions and blocks.
     """
     msg_type = notice_message
+
+    codec = StructCodec([
+        ('known_trx', OrderedIds),
+        ('known_blocks', OrderedIds),
+    ])
+
     def __init__(self, known_trx: OrderedIds, known_blocks: OrderedIds):
         """
         Initializes a new NoticeMessage object.
@@ -594,20 +554,12 @@ class NoticeMessage(NetMessage):
             self.known_blocks == other.known_blocks
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack(self.known_trx)
-        enc.pack(self.known_blocks)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        known_trx = OrderedIds.unpack(dec)
-        known_blocks = OrderedIds.unpack(dec)
-        return cls(
-            known_trx,
-            known_blocks
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
@@ -623,6 +575,12 @@ class SyncRequestMessage(NetMessage):
     A message that requests synchronization of blocks between two nodes.
     """
     msg_type = sync_request_message
+
+    codec = StructCodec([
+        ('start_block', U32),
+        ('end_block', U32),
+    ])
+
     def __init__(self, start_block: U32, end_block: U32):
         """
         Initializes a new SyncRequestMessage object.
@@ -647,20 +605,12 @@ class SyncRequestMessage(NetMessage):
             self.end_block == other.end_block
         )
     
-    def pack(self, enc: Encoder):
-        pos = enc.get_pos()
-        enc.pack_u32(self.start_block)
-        enc.pack_u32(self.end_block)
-        return enc.get_pos() - pos
+    def pack(self, enc: Encoder) -> int:
+        return self.codec.pack(enc, self)
 
     @classmethod
     def unpack(cls, dec: Decoder):
-        start_block = dec.unpack_u32()
-        end_block = dec.unpack_u32()
-        return cls(
-            start_block,
-            end_block
-        )
+        return cls(*cls.codec.unpack(dec))
 
     @classmethod
     def unpack_bytes(cls, data: bytes):
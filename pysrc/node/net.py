@@ -2,8 +2,11 @@ import asyncio
 import multiprocessing
 from typing import Any, Dict, List, Optional, Type, Union
 
+from . import node_config
 from .messages import GoAwayMessage
 from .connection import Connection, OutConnection
+from .locked_chain import LockedChain
+from .sync_scheduler import SyncScheduler
 
 from .. import eos
 from ..bases import debug, log, utils
@@ -17,7 +20,8 @@ global_property_type = 12
 
 class Network(object):
     def __init__(self, chain, peers: List[str], rwlock: Optional[multiprocessing.Lock] = None):
-        self.chain = chain
+        # shared by the connections, the sync scheduler and the block servers
+        self.chain = LockedChain(chain, rwlock)
         self.connections: List[Connection] = []
         self.generation = 0
         self.last_time_message = None
@@ -27,6 +31,12 @@ class Network(object):
         self.sync_finished = False
         self.conn: Optional[Connection] = None
 
+        try:
+            self.multi_peer_sync = node_config.get_net_config()['multi_peer_sync']
+        except:
+            self.multi_peer_sync = True
+        self.sync_scheduler = SyncScheduler(self.chain)
+
         self.logger = log.get_logger('network')
 
         self.rwlock = rwlock
@@ -131,6 +141,13 @@ class Network(object):
 
         while not eos.should_exit():
             try:
+                connections = [c for c in self.connections if c.connected]
+                # a node that is caught up goes on with the fastest connection
+                if self.multi_peer_sync and len(connections) > 1 and self.sync_scheduler.needs_sync(connections):
+                    self.logger.info('+++++sync blocks from %s peers', len(connections))
+                    await self.sync_scheduler.run(connections)
+                    if eos.should_exit():
+                        break
                 self.conn = await self.get_fastest_connection()
                 if not self.conn:
                     continue
@@ -18,6 +18,8 @@ import yaml
 from . import net, node_config
 
 from . import chainapi
+from .chain_info import ChainInfoSnapshot
+from .response_cache import ResponseCache, default_table_rows_cache_size
 from .. import eos
 from ..bases import log
 
@@ -116,6 +118,14 @@ def read_genesis_from_block_log(tester):
         chain_id = dec.read_bytes(32).hex()
     assert chain_id == tester.api.get_info()['chain_id']
 
+def new_table_rows_cache() -> ResponseCache:
+    try:
+        cache_size = node_config.get_config()['table_rows_cache_size']
+    except:
+        cache_size = default_table_rows_cache_size
+    logger.info('+++++table_rows_cache_size: %sMB', cache_size)
+    return ResponseCache(cache_size*1024*1024)
+
 def read_chain_id_from_block_log(data_dir):
     block_log_file = f'{data_dir}/blocks/blocks.log'
     if not os.path.exists(block_log_file):
@@ -185,6 +195,7 @@ def init(genesis_file: str, snapshot_file: str):
 class Node(object):
     def __init__(self, data_dir: str, config_dir: str, genesis: str, state_size: int, snapshot_file: str = '', debug_producer_key: str = '', rwlock = None, worker_process: bool = False):
         self.rwlock = rwlock
+        self.chain_info_snapshot: Optional[ChainInfoSnapshot] = None
         if not worker_process:
             eos.set_data_dir(data_dir)
             eos.set_config_dir(config_dir)
@@ -303,13 +314,25 @@ class Node(object):
         self._chain.set_applied_transaction_event_callback(self.on_applied_transaction_event)
 
         self.chain_info = self._chain.get_info()
+        self.table_rows_cache = new_table_rows_cache()
+        self.table_rows_cache.set_head(self._chain.head_block_id())
 
     def on_accepted_block(self, block_state_ptr):
         # bs = BlockState(block_state_ptr)
         # bs.free()
         self.chain_info = self.chain.get_info()
+        self.table_rows_cache.set_head(self.chain.head_block_id())
+        if self.chain_info_snapshot:
+            self.chain_info_snapshot.publish(self.chain_info)
         # logger.info(self.chain_info)
 
+    def set_chain_info_snapshot(self, snapshot: ChainInfoSnapshot):
+        """
+        Publishes the chain info to `snapshot` now and on every accepted block, for worker processes.
+        """
+        self.chain_info_snapshot = snapshot
+        snapshot.publish(self.chain_info)
+
     def on_irreversible_block(self, block_state_ptr):
         pass
         # bs = BlockState(block_state_ptr)
@@ -446,6 +469,9 @@ class Node(object):
         node.trace = None
         node.snapshot = None
         node.rwlock = None
+        node.chain_info_snapshot = None
+        # no accepted block callback in an attached node to invalidate the cache
+        node.table_rows_cache = ResponseCache(0)
 
         node.is_temp_data_dir = False
         node.data_dir = ''
@@ -0,0 +1,90 @@
+import collections
+import threading
+from typing import Optional
+
+from ..bases import log
+
+default_table_rows_cache_size = 64 # in MB
+
+logger = log.get_logger(__name__)
+
+class ResponseCache(object):
+    """
+    LRU cache of RPC responses keyed by the raw request body, limited to `max_bytes` of keys and UTF-8
+    encoded responses. Only successful responses are put, an error may not happen again.
+
+    All entries are dropped when the head block changes, see `set_head`. A response computed while the
+    head changed is not stored, the `generation` returned by `get_generation` has to be passed to `put`.
+
+    The head block id is the only invalidation, responses have to be computed without a pending block:
+    the node has no pending block outside of `push_transaction`, which starts and aborts its block under
+    the write lock, readers never see it. A node that keeps a pending block between blocks, such as a
+    producing node, must not use the cache.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.head = None
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_generation(self) -> int:
+        return self.generation
+
+    def put(self, key: bytes, value: str, generation: int) -> bool:
+        size = len(key) + len(value.encode())
+        if size > self.max_bytes:
+            return False
+        with self.lock:
+            if generation != self.generation:
+                return False
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, old_size) = self.entries.popitem(last=False)
+                self.size -= old_size
+            return True
+
+    def set_head(self, head):
+        """
+        Drops all entries if `head` is not the head block the entries were computed at.
+        """
+        with self.lock:
+            if head == self.head:
+                return
+            self.head = head
+            self.clear_entries()
+
+    def clear(self):
+        with self.lock:
+            self.clear_entries()
+
+    def clear_entries(self):
+        self.entries.clear()
+        self.size = 0
+        self.generation += 1
+
+    def get_statistics(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'size': self.size,
+            'max_size': self.max_bytes,
+        }
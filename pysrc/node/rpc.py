@@ -2,13 +2,13 @@ import asyncio
 import json
 import uvicorn
 
-from aiocache import cached, Cache
-from aiocache.serializers import StringSerializer
 from fastapi import FastAPI, Request
 from fastapi.responses import PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 
-from . import net, node, node_config
+from . import net, node, node_config, table_rows_batch, table_rows_binary, table_stream
+from .chain_executor import ChainExecutorBusy, ChainExecutorTimeout, generate_executor_error, get_read_executor
+from .locked_chain import chain_read_lock, chain_write_lock
 from ..bases import log, rate_limit
 from ..core.chain_exceptions import BlockValidateException, InvalidSnapshotRequestException, SnapshotRequestNotFoundException, ChainException
 from ..node.messages import PackedTransactionMessage
@@ -71,7 +71,6 @@ async def read_root():
     return {"Hello": "World"}
 
 @app.get("/v1/chain/get_info", response_class=PlainTextResponse)
-# @cached(ttl=1, cache=Cache.MEMORY, key="get_info", serializer=StringSerializer())
 async def get_info(request: Request):
     return node.get_node().get_chain_info()
 
@@ -79,14 +78,86 @@ async def get_info(request: Request):
 async def get_table_rows(req: Request):
     global g_worker
     params = await req.body()
+    cache = node.get_node().table_rows_cache
+    ret = cache.get(params)
+    if ret is not None:
+        return ret
+    generation = cache.get_generation()
+
     rwlock = node.get_node().rwlock
-    if rwlock:
-        with rwlock.rlock():
+    try:
+        if rwlock:
+            def get_table_rows_ex():
+                with chain_read_lock(rwlock):
+                    return node.get_node().api.get_table_rows_ex(params, return_json=False)
+            ret = await get_read_executor().run(get_table_rows_ex)
+        else:
+            # without a lock the chain can only be read in the thread that updates it
             ret = node.get_node().api.get_table_rows_ex(params, return_json=False)
-            return ret
+    except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+        return generate_executor_error(e)
+    except Exception as e:
+        # errors are not cached
+        return PlainTextResponse(table_rows_batch.error_result(e), status_code=500)
+    cache.put(params, ret, generation)
+    return ret
+
+@app.post("/v1/chain/get_table_rows_batch")
+async def get_table_rows_batch(req: Request):
+    try:
+        queries = table_rows_batch.parse_batch(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+
+    _node = node.get_node()
+    if _node.rwlock:
+        try:
+            results = await table_rows_batch.run_table_rows_batch(_node.api, queries, _node.rwlock)
+        except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+            return generate_executor_error(e)
     else:
-        ret = node.get_node().api.get_table_rows_ex(params, return_json=False)
-        return ret
+        # without a lock the chain can only be read in the thread that updates it
+        results = table_rows_batch.get_table_rows_batch(_node.api, queries)
+    return table_rows_batch.generate_batch_response(results)
+
+@app.post("/v1/chain/get_table_rows_stream")
+async def get_table_rows_stream(req: Request):
+    try:
+        params = table_stream.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+    _node = node.get_node()
+    return table_stream.stream_table_rows(_node.api, params, _node.rwlock)
+
+@app.post("/v1/chain/get_table_by_scope_stream")
+async def get_table_by_scope_stream(req: Request):
+    try:
+        params = table_stream.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+    _node = node.get_node()
+    return table_stream.stream_table_by_scope(_node.api, params, _node.rwlock)
+
+@app.post("/v1/chain/get_table_rows_binary")
+async def get_table_rows_binary(req: Request):
+    try:
+        params = table_rows_binary.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+
+    _node = node.get_node()
+    rwlock = _node.rwlock
+    if rwlock:
+        def get_table_rows_binary_ex():
+            with chain_read_lock(rwlock):
+                return table_rows_binary.get_table_rows_binary(_node.db, **params)
+        try:
+            ret = await get_read_executor().run(get_table_rows_binary_ex)
+        except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+            return generate_executor_error(e)
+    else:
+        ret = table_rows_binary.get_table_rows_binary(_node.db, **params)
+    return table_rows_binary.generate_binary_response(*ret)
 
 def generate_response(result):
     content = {"status": "ok", "result": result}
@@ -123,19 +194,15 @@ async def push_transaction(request: Request, args: PushTransactionArgs):
     ret = None
     success = False
     chain = node.get_node().chain
-    try:
-        rwlock = node.get_node().rwlock
-        if rwlock:
-            with rwlock.wlock():
-                chain.start_block()
-                success, ret = chain.push_transaction_ex(packed_tx, return_json=False)
-        else:
+    # the pending block is aborted before other threads read the chain again
+    with chain_write_lock(node.get_node().rwlock):
+        try:
             chain.start_block()
             success, ret = chain.push_transaction_ex(packed_tx, return_json=False)
-    except Exception as e:
-        return generate_error_response(str(e))
-    finally:
-        chain.abort_block()
+        except Exception as e:
+            return generate_error_response(str(e))
+        finally:
+            chain.abort_block()
 
     if success:
         if await conn.send_message(msg):
@@ -147,7 +214,9 @@ async def push_transaction(request: Request, args: PushTransactionArgs):
 async def trace_api_get_block_trace(request: Request, args: GetBlockTraceArgs):
     try:
         logger.error("++++++++args.block_num: %s", args.block_num)
-        ret = node.get_node().get_trace().get_block_trace(args.block_num)
+        # the trace log is written while blocks are applied
+        with chain_read_lock(node.get_node().rwlock):
+            ret = node.get_node().get_trace().get_block_trace(args.block_num)
         if ret == 'null':
             return '{"code":404,"message":"Trace API: block trace missing","error":{"code":0,"name":"","what":"","details":[]}}'
         return ret
@@ -157,20 +226,24 @@ async def trace_api_get_block_trace(request: Request, args: GetBlockTraceArgs):
 
 async def snapshot_schedule(request: Request, args: SnapshotScheduleArgs):
     try:
-        ret = node.get_node().get_snapshot().schedule(args.start_block_num, args.end_block_num, args.block_spacing, args.snapshot_description)
+        # the schedule is used by the accepted block callbacks of the block applier thread
+        with chain_write_lock(node.get_node().rwlock):
+            ret = node.get_node().get_snapshot().schedule(args.start_block_num, args.end_block_num, args.block_spacing, args.snapshot_description)
         return f'{{"status": "ok", "result": {ret}}}'
     except InvalidSnapshotRequestException:
         return '{"status": "error", "result": "invalid snapshot request"}'
 
 async def snapshot_unschedule(request: Request, args: SnapshotUnscheduleArgs):
     try:
-        ret = node.get_node().get_snapshot().unschedule(args.schedule_request_id)
+        with chain_write_lock(node.get_node().rwlock):
+            ret = node.get_node().get_snapshot().unschedule(args.schedule_request_id)
         return f'{{"status": "ok", "result": {ret}}}'
     except SnapshotRequestNotFoundException:
         return '{"status": "error", "result": "invalid snapshot request"}'
 
 async def snapshot_get_requests(request: Request):
-    ret = node.get_node().get_snapshot().get_requests()
+    with chain_read_lock(node.get_node().rwlock):
+        ret = node.get_node().get_snapshot().get_requests()
     return f'{{"status": "ok", "result": {ret}}}'
 
 def add_post_method(path, func):
@@ -0,0 +1,379 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from . import node_config
+from .block_applier import BlockApplier, default_block_apply_queue_size
+from .connection import BlockApplyResult, Connection, default_sync_fetch_span
+
+from .. import eos
+from ..bases import log
+from ..core.blocks import BlockHeader
+from ..core.chain import Chain
+from ..core.chain_exceptions import (DatabaseGuardException, ForkDatabaseException,
+                               UnlinkableBlockException)
+
+default_sync_stall_timeout = 10.0
+default_sync_slow_factor = 4.0
+# a peer that lost a chunk is not given a new one for this many seconds
+default_sync_penalty_time = 30.0
+# time given to the peers to finish the message they are reading when the sync stops
+default_sync_stop_timeout = 5.0
+
+print_sync_info_interval = 10
+
+logger = log.get_logger(__name__)
+
+class SyncChunk(object):
+    def __init__(self, start_block: int, end_block: int):
+        self.start_block = start_block
+        self.end_block = end_block
+        # next block number expected from the peer serving this chunk
+        self.next_block = start_block
+        self.conn: Optional[Connection] = None
+        self.assigned_time = 0.0
+        self.last_progress_time = 0.0
+
+    def __repr__(self):
+        return f'SyncChunk(start_block: {self.start_block}, end_block: {self.end_block}, next_block: {self.next_block}, conn: {self.conn})'
+
+    def __str__(self):
+        return self.__repr__()
+
+    def remaining(self):
+        return self.end_block - self.next_block + 1
+
+    def block_rate(self):
+        duration = self.last_progress_time - self.assigned_time
+        received = self.next_block - self.start_block
+        if duration <= 0.0 or received <= 0:
+            return 0.0
+        return received / duration
+
+class SyncScheduler(object):
+    """
+    Splits the range between the local head and the highest irreversible block reported by the
+    peers into `sync_fetch_span` chunks, requests them from all connected peers at once and
+    queues the received blocks in order to a BlockApplier, which pushes them to the chain on its
+    thread while the peers keep sending.
+    """
+    peer = 'multi-peer-sync'
+
+    def __init__(self, chain: Chain):
+        self.chain = chain
+        self.connections: List[Connection] = []
+        self.pending_chunks: List[SyncChunk] = []
+        self.assignments: Dict[Connection, SyncChunk] = {}
+        self.penalties: Dict[Connection, float] = {}
+        self.peer_rates: Dict[Connection, float] = {}
+        # received blocks waiting for their predecessors, block_num => (conn, raw_block)
+        self.blocks: Dict[int, Tuple[Connection, bytes]] = {}
+        # peers of the blocks queued to the applier, block_num => conn
+        self.queued_blocks: Dict[int, Connection] = {}
+        # next block to queue to the applier
+        self.next_block = 0
+        self.scheduled_block = 0
+        self.target_block = 0
+        self.wakeup_event = asyncio.Event()
+        self.failed = False
+
+        self.applied_blocks = 0
+        self.print_info_time = 0.0
+
+        try:
+            net_config = node_config.get_net_config()
+        except:
+            net_config = {}
+
+        self.sync_fetch_span = net_config.get('sync_fetch_span', default_sync_fetch_span)
+        self.sync_stall_timeout = net_config.get('sync_stall_timeout', default_sync_stall_timeout)
+        self.sync_slow_factor = net_config.get('sync_slow_factor', default_sync_slow_factor)
+        self.sync_penalty_time = net_config.get('sync_penalty_time', default_sync_penalty_time)
+        self.sync_stop_timeout = net_config.get('sync_stop_timeout', default_sync_stop_timeout)
+        block_apply_queue_size = net_config.get('block_apply_queue_size', default_block_apply_queue_size)
+        self.applier = BlockApplier(self, max(block_apply_queue_size, 1))
+
+    def reset(self):
+        head_block_num = self.chain.head_block_num()
+        self.next_block = head_block_num + 1
+        self.scheduled_block = head_block_num
+        self.pending_chunks = []
+        self.assignments = {}
+        self.blocks = {}
+        self.queued_blocks = {}
+
+    def update_target(self):
+        target = 0
+        for conn in self.connections:
+            if not conn.last_handshake:
+                continue
+            if conn.last_handshake.last_irreversible_block_num > target:
+                target = conn.last_handshake.last_irreversible_block_num
+        self.target_block = target
+        return target
+
+    def needs_sync(self, connections: List[Connection]) -> bool:
+        """
+        True if the chain head is more than one chunk behind the highest irreversible block number
+        of the peers, or if no peer has sent a handshake yet, the handshakes are read while syncing.
+        """
+        peer_libs = [conn.last_handshake.last_irreversible_block_num for conn in connections if conn.last_handshake]
+        if not peer_libs:
+            return True
+        return max(peer_libs) - self.chain.head_block_num() > self.sync_fetch_span
+
+    def is_finished(self):
+        return self.target_block > 0 and self.next_block > self.target_block
+
+    def is_available(self, conn: Connection):
+        if not conn.connected or conn.closed:
+            return False
+        if not conn.last_handshake:
+            return False
+        if conn in self.assignments:
+            return False
+        penalty_time = self.penalties.get(conn, 0.0)
+        return time.monotonic() >= penalty_time
+
+    def next_chunk(self, conn: Connection) -> Optional[SyncChunk]:
+        peer_lib = conn.last_handshake.last_irreversible_block_num
+        for i, chunk in enumerate(self.pending_chunks):
+            if chunk.end_block <= peer_lib:
+                return self.pending_chunks.pop(i)
+
+        # limit the number of blocks buffered ahead of the chain head
+        window = self.sync_fetch_span * max(len(self.connections), 1) * 2
+        if self.scheduled_block - self.next_block >= window:
+            return None
+
+        start_block = self.scheduled_block + 1
+        end_block = min(start_block + self.sync_fetch_span - 1, self.target_block, peer_lib)
+        if end_block < start_block:
+            return None
+        self.scheduled_block = end_block
+        return SyncChunk(start_block, end_block)
+
+    async def assign_chunk(self, conn: Connection, chunk: SyncChunk):
+        chunk.conn = conn
+        chunk.assigned_time = chunk.last_progress_time = time.monotonic()
+        self.assignments[conn] = chunk
+        logger.info('+++++assign %s', chunk)
+        if not await conn.send_sync_request_message(chunk.next_block, chunk.end_block):
+            self.release_chunk(conn, penalize=True)
+
+    def release_chunk(self, conn: Connection, penalize: bool = False):
+        try:
+            chunk = self.assignments.pop(conn)
+        except KeyError:
+            return
+        if penalize:
+            self.penalties[conn] = time.monotonic() + self.sync_penalty_time
+        # skip the blocks that are already received from other peers
+        while chunk.next_block <= chunk.end_block and (chunk.next_block < self.next_block or chunk.next_block in self.blocks):
+            chunk.next_block += 1
+        if chunk.next_block > chunk.end_block:
+            return
+        chunk.conn = None
+        self.pending_chunks.append(chunk)
+        self.pending_chunks.sort(key=lambda c: c.next_block)
+
+    async def schedule(self):
+        self.update_target()
+        for conn in self.connections:
+            if not self.is_available(conn):
+                continue
+            chunk = self.next_chunk(conn)
+            if not chunk:
+                continue
+            await self.assign_chunk(conn, chunk)
+
+    def best_peer_rate(self):
+        rates = [rate for conn, rate in self.peer_rates.items() if conn.connected]
+        if not rates:
+            return 0.0
+        return max(rates)
+
+    async def check_stalled_chunks(self):
+        now = time.monotonic()
+        has_idle_peer = any(self.is_available(conn) for conn in self.connections)
+        for conn, chunk in list(self.assignments.items()):
+            if not conn.connected:
+                logger.info('+++++%s disconnected, release %s', conn, chunk)
+                self.release_chunk(conn)
+            elif now - chunk.last_progress_time > self.sync_stall_timeout:
+                logger.info('+++++%s stalled, release %s', conn, chunk)
+                await conn.send_reset_sync_request_message()
+                self.release_chunk(conn, penalize=True)
+            elif has_idle_peer and chunk.next_block <= self.next_block <= chunk.end_block:
+                # the chunk that blocks the chain head is served too slowly compared to the best peer
+                rate = chunk.block_rate()
+                best_rate = self.best_peer_rate()
+                if now - chunk.assigned_time > 1.0 and rate * self.sync_slow_factor < best_rate:
+                    logger.info('+++++%s too slow (%.1f b/s, best: %.1f b/s), release %s', conn, rate, best_rate, chunk)
+                    await conn.send_reset_sync_request_message()
+                    self.release_chunk(conn, penalize=True)
+
+    async def on_handshake_message(self, conn: Connection, message):
+        self.wakeup_event.set()
+        return True
+
+    async def on_signed_block_message(self, conn: Connection, header: BlockHeader, raw_block: bytes):
+        block_num = header.block_num()
+        chunk = self.assignments.get(conn)
+        if chunk and chunk.next_block <= block_num <= chunk.end_block:
+            chunk.next_block = block_num + 1
+            chunk.last_progress_time = time.monotonic()
+            self.peer_rates[conn] = chunk.block_rate()
+            if chunk.next_block > chunk.end_block:
+                del self.assignments[conn]
+                self.wakeup_event.set()
+
+        if block_num < self.next_block or block_num in self.blocks:
+            return True
+        self.blocks[block_num] = (conn, raw_block)
+        return await self.apply_blocks()
+
+    async def apply_blocks(self):
+        while self.next_block in self.blocks:
+            conn, raw_block = self.blocks.pop(self.next_block)
+            self.queued_blocks[self.next_block] = conn
+            self.next_block += 1
+            await self.applier.put(BlockHeader.unpack_bytes(raw_block), raw_block)
+
+        if self.is_finished():
+            self.wakeup_event.set()
+        return True
+
+    def apply_block(self, header: BlockHeader, raw_block: bytes) -> BlockApplyResult:
+        """
+        Called by the applier thread, the blocks of a restarted sync are skipped.
+        """
+        conn = self.queued_blocks.get(header.block_num())
+        if not conn:
+            return BlockApplyResult.duplicated
+        try:
+            conn.push_block(raw_block)
+        except ForkDatabaseException as e:
+            # an exception makes the applier discard the queued blocks, a known block is not an error
+            if e.json()['stack'][0]['format'].startswith('we already know about this block'):
+                logger.warning('+++++receive duplicated block: %s', header.block_num())
+                return BlockApplyResult.duplicated
+            raise
+        return BlockApplyResult.applied
+
+    async def on_block_applied(self, header: BlockHeader, raw_block: bytes, result):
+        block_num = header.block_num()
+        conn = self.queued_blocks.pop(block_num, None)
+        if not conn or result == BlockApplyResult.duplicated:
+            return True
+        if isinstance(result, UnlinkableBlockException):
+            logger.warning('+++++receive unlinkable block %s from %s, restart from head', block_num, conn)
+            self.penalties[conn] = time.monotonic() + self.sync_penalty_time
+            if conn not in self.assignments:
+                await conn.send_reset_sync_request_message()
+            await self.restart()
+            return True
+        elif isinstance(result, DatabaseGuardException):
+            logger.fatal('%s', result)
+            self.failed = True
+            eos.exit()
+            return False
+        elif isinstance(result, Exception):
+            logger.exception(result)
+            self.failed = True
+            eos.exit()
+            return False
+        conn.calculate_block_sync_info(header, len(raw_block))
+        self.applied_blocks += 1
+        self.print_sync_info()
+        return True
+
+    async def restart(self):
+        """
+        Drops the buffered and queued blocks and schedules again from the chain head, the peers
+        stop sending the released chunks.
+        """
+        self.applier.discard_pending_blocks()
+        for conn in list(self.assignments.keys()):
+            await conn.send_reset_sync_request_message()
+            self.release_chunk(conn)
+        self.reset()
+        self.wakeup_event.set()
+
+    def print_sync_info(self):
+        now = time.monotonic()
+        if not self.print_info_time:
+            self.print_info_time = now
+            self.applied_blocks = 0
+            return
+        duration = now - self.print_info_time
+        if duration < print_sync_info_interval:
+            return
+        speed = round(self.applied_blocks / duration, 1)
+        logger.info(f'+++++multi-peer sync: {speed} b/s, head: {self.next_block - 1}, target: {self.target_block}, peers: {len(self.assignments)}, buffered blocks: {len(self.blocks)}')
+        self.print_info_time = now
+        self.applied_blocks = 0
+
+    async def wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self.wakeup_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.wakeup_event.clear()
+
+    async def stop_readers(self, connections: List[Connection], tasks: List[asyncio.Task]):
+        """
+        Stops the message loops of the peers after the message they are reading, a peer that does
+        not finish its message in `sync_stop_timeout` seconds is disconnected.
+        """
+        for conn in connections:
+            conn.stop_reading()
+        if not tasks:
+            return
+        done, pending = await asyncio.wait(tasks, timeout=self.sync_stop_timeout)
+        for conn, task in zip(connections, tasks):
+            if task in pending:
+                logger.info('+++++%s is still reading a message, close it', conn)
+                task.cancel()
+                conn.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, connections: List[Connection]):
+        """
+        Drives the block sync through all connections until the chain head reaches the highest
+        irreversible block number reported by the peers.
+        """
+        self.connections = connections
+        self.failed = False
+        self.reset()
+        self.applier.start()
+
+        tasks = []
+        for conn in connections:
+            conn.sync_scheduler = self
+            tasks.append(asyncio.create_task(conn.handle_messages()))
+
+        try:
+            while not eos.should_exit():
+                if all(task.done() for task in tasks):
+                    logger.info('+++++all peers disconnected')
+                    break
+                await self.schedule()
+                if self.is_finished() or self.failed:
+                    break
+                await self.wait(1.0)
+                await self.check_stalled_chunks()
+        finally:
+            await self.stop_readers(connections, tasks)
+            for conn in connections:
+                conn.sync_scheduler = None
+            # applies the queued blocks
+            await self.applier.stop()
+            for conn in connections:
+                if conn.connected:
+                    await conn.send_reset_sync_request_message()
+            self.assignments = {}
+            self.blocks = {}
+            self.queued_blocks = {}
+        logger.info('+++++multi-peer sync finished, head block num: %s', self.chain.head_block_num())
+        return not self.failed
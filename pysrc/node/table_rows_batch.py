@@ -0,0 +1,76 @@
+import json
+import threading
+from typing import List, Optional
+
+from fastapi.responses import PlainTextResponse
+
+from .chainapi import ChainApi
+from .chain_executor import ChainExecutorTimeout, get_read_executor, get_rpc_config
+from .locked_chain import chain_read_lock
+from ..core.chain_exceptions import ChainException
+
+default_rpc_batch_size = 1000 # max queries of a batch
+
+def parse_batch(body: bytes) -> List[str]:
+    """
+    Parses a JSON array of get_table_rows params, returns the params of each query as JSON text.
+    Raises ValueError if the body is not a JSON array of objects or has too many queries.
+    """
+    try:
+        queries = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f'invalid JSON: {e}')
+    if not isinstance(queries, list) or not all(isinstance(q, dict) for q in queries):
+        raise ValueError('expected a JSON array of get_table_rows params')
+    max_size = get_rpc_config('rpc_batch_size', default_rpc_batch_size)
+    if len(queries) > max_size:
+        raise ValueError(f'too many queries: {len(queries)} > {max_size}')
+    return [json.dumps(q) for q in queries]
+
+def error_result(e: Exception) -> str:
+    if isinstance(e, ChainException):
+        error = e.json()
+    else:
+        error = {"code": 0, "name": "", "what": str(e), "details": []}
+    return json.dumps({"code": 500, "message": "Internal Service Error", "error": error})
+
+def get_table_rows_batch(api: ChainApi, queries: List[str], rwlock = None, cancelled: Optional[threading.Event] = None) -> List[str]:
+    """
+    Runs all queries under one read lock so that all results come from the same head block.
+    A failed query does not fail the batch, its result is an error object.
+    The batch stops after the running query once `cancelled` is set, the lock is released and
+    ChainExecutorTimeout is raised.
+    """
+    results = []
+    with chain_read_lock(rwlock):
+        for params in queries:
+            if cancelled and cancelled.is_set():
+                raise ChainExecutorTimeout(f'batch cancelled after {len(results)} of {len(queries)} queries')
+            try:
+                results.append(api.get_table_rows_ex(params, return_json=False))
+            except Exception as e:
+                results.append(error_result(e))
+    return results
+
+async def run_table_rows_batch(api: ChainApi, queries: List[str], rwlock = None) -> List[str]:
+    """
+    Runs a batch on the read executor, a batch that times out is cancelled so that it does not keep
+    the read lock for the remaining queries.
+    """
+    cancelled = threading.Event()
+    try:
+        return await get_read_executor().run(get_table_rows_batch, api, queries, rwlock, cancelled)
+    except ChainExecutorTimeout:
+        cancelled.set()
+        raise
+
+def generate_batch_response(results: List[str]) -> PlainTextResponse:
+    """
+    Returns the results as a JSON array, the whole response is built in memory,
+    the size of a batch is limited by `rpc_batch_size`.
+    """
+    return PlainTextResponse('[' + ','.join(results) + ']', media_type='application/json')
+
+def generate_invalid_request_error(e: ValueError) -> PlainTextResponse:
+    error = json.dumps({"code": 400, "message": "Invalid Request", "error": {"code": 0, "name": "", "what": str(e), "details": []}})
+    return PlainTextResponse(error, status_code=400)
@@ -0,0 +1,75 @@
+import json
+import struct
+from typing import Dict, Tuple
+
+from fastapi.responses import Response
+
+from ..bases.packer import unpack_length
+from ..core.database import Database, KeyValueObjectIndex, TableIdObjectIndex
+
+MAX_PRIMARY_KEY = 0xffffffffffffffff
+
+# primary key, payer, size of the row data
+row_header = struct.Struct('<QQI')
+# table_id, t_id, primary_key, payer of a raw key_value_object, followed by the row data
+key_value_header = struct.Struct('<qqQQ')
+
+def parse_params(body: bytes) -> Dict:
+    """
+    Parses `code`, `scope`, `table`, `lower_bound`, `upper_bound` and `limit`, the bounds are primary keys.
+    Raises ValueError if the params are invalid.
+    """
+    try:
+        params = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f'invalid JSON: {e}')
+    if not isinstance(params, dict):
+        raise ValueError('expected a JSON object')
+    try:
+        return {
+            'code': str(params['code']),
+            'scope': str(params['scope']),
+            'table': str(params['table']),
+            'lower_bound': int(params.get('lower_bound') or 0),
+            'upper_bound': int(params.get('upper_bound') or MAX_PRIMARY_KEY),
+            'limit': int(params.get('limit', 10)),
+        }
+    except KeyError as e:
+        raise ValueError(f'missing param: {e}')
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'invalid param: {e}')
+
+def get_table_rows_binary(db: Database, code: str, scope: str, table: str, lower_bound: int = 0,
+                          upper_bound: int = MAX_PRIMARY_KEY, limit: int = 10) -> Tuple[bytes, bool, int]:
+    """
+    Returns the rows of a table with primary keys from `lower_bound` to `upper_bound` without
+    decoding them with the ABI, each row is packed as `row_header` followed by the raw row data.
+    Returns (rows, more, next_key), `next_key` is the primary key of the first row not returned.
+    """
+    table_id = TableIdObjectIndex(db).find_by_code_scope_table(code, scope, table)
+    if not table_id or limit <= 0:
+        return b'', False, 0
+
+    rows = bytearray()
+    state = {'count': 0, 'next_key': None}
+    def on_row(raw: bytes, user_data):
+        _, t_id, primary_key, payer = key_value_header.unpack_from(raw)
+        if t_id != table_id.table_id or primary_key > upper_bound:
+            return 0
+        if state['count'] == limit:
+            state['next_key'] = primary_key
+            return 0
+        size, n = unpack_length(raw[key_value_header.size:key_value_header.size + 5])
+        start = key_value_header.size + n
+        rows.extend(row_header.pack(primary_key, payer, size))
+        rows.extend(memoryview(raw)[start:start + size])
+        state['count'] += 1
+        return 1
+
+    KeyValueObjectIndex(db).walk_range_by_scope_primary((table_id.table_id, lower_bound), (table_id.table_id, upper_bound), on_row, raw_data=True)
+    more = state['next_key'] is not None
+    return bytes(rows), more, state['next_key'] if more else 0
+
+def generate_binary_response(rows: bytes, more: bool, next_key: int) -> Response:
+    headers = {'X-More': 'true' if more else 'false', 'X-Next-Key': str(next_key)}
+    return Response(content=rows, media_type='application/octet-stream', headers=headers)
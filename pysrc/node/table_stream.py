@@ -0,0 +1,98 @@
+import json
+from typing import AsyncIterator, Callable, Dict
+
+from fastapi.responses import StreamingResponse
+
+from .chainapi import ChainApi
+from .chain_executor import get_read_executor, get_rpc_config
+from .locked_chain import chain_read_lock
+from .table_rows_batch import error_result
+from ..bases import log
+
+default_rpc_stream_page_size = 500 # rows read under one read lock
+
+logger = log.get_logger(__name__)
+
+def parse_params(body: bytes) -> Dict:
+    """
+    Parses the params of get_table_rows or get_table_by_scope, `limit` is the total number of rows to stream.
+    Raises ValueError if the body is not a JSON object.
+    """
+    try:
+        params = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f'invalid JSON: {e}')
+    if not isinstance(params, dict):
+        raise ValueError('expected a JSON object')
+    try:
+        params['limit'] = int(params.get('limit', 10))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    return params
+
+async def read_page(fn: Callable, params: Dict, rwlock = None) -> Dict:
+    """
+    Reads one page, holding the read lock only while the page is read.
+    """
+    if not rwlock:
+        # without a lock the chain can only be read in the thread that updates it
+        return json.loads(fn(json.dumps(params), return_json=False))
+    def read():
+        with chain_read_lock(rwlock):
+            return fn(json.dumps(params), return_json=False)
+    return json.loads(await get_read_executor().run(read))
+
+async def iter_pages(fn: Callable, params: Dict, next_page: Callable[[Dict, Dict], bool], rwlock = None) -> AsyncIterator[str]:
+    remaining = params['limit']
+    page_size = get_rpc_config('rpc_stream_page_size', default_rpc_stream_page_size)
+    params = dict(params)
+    try:
+        while remaining > 0:
+            params['limit'] = min(page_size, remaining)
+            page = await read_page(fn, params, rwlock)
+            rows = page['rows']
+            for row in rows:
+                yield json.dumps(row, separators=(',', ':')) + '\n'
+            remaining -= len(rows)
+            if not rows or not next_page(params, page):
+                break
+    except Exception as e:
+        # the status code is already sent, the error is the last line
+        logger.error('+++++stream error: %s', e)
+        yield error_result(e) + '\n'
+
+def next_table_rows_page(params: Dict, page: Dict) -> bool:
+    next_key = page.get('next_key')
+    if not page.get('more') or not next_key:
+        return False
+    # bounds are inclusive and next_key is the first row not returned
+    if params.get('reverse'):
+        params['upper_bound'] = next_key
+    else:
+        params['lower_bound'] = next_key
+    return True
+
+def next_table_by_scope_page(params: Dict, page: Dict) -> bool:
+    # `more` is the scope to continue from
+    more = page.get('more')
+    if not more:
+        return False
+    if params.get('reverse'):
+        params['upper_bound'] = more
+    else:
+        params['lower_bound'] = more
+    return True
+
+def stream_table_rows(api: ChainApi, params: Dict, rwlock = None) -> StreamingResponse:
+    """
+    Streams the rows of get_table_rows as newline delimited JSON, `rpc_stream_page_size` rows at a time.
+    """
+    rows = iter_pages(api.get_table_rows_ex, params, next_table_rows_page, rwlock)
+    return StreamingResponse(rows, media_type='application/x-ndjson')
+
+def stream_table_by_scope(api: ChainApi, params: Dict, rwlock = None) -> StreamingResponse:
+    """
+    Streams the rows of get_table_by_scope as newline delimited JSON, `rpc_stream_page_size` rows at a time.
+    """
+    rows = iter_pages(api.get_table_by_scope_ex, params, next_table_by_scope_page, rwlock)
+    return StreamingResponse(rows, media_type='application/x-ndjson')
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import queue
 import signal
 import sys
 import uvicorn
@@ -8,18 +9,22 @@ import uvloop
 import threading
 import time
 
-from aiocache import cached, Cache
-from aiocache.serializers import StringSerializer
-
 from fastapi import FastAPI, Request
 from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from multiprocessing import Process, Condition, Value, Lock, Event
+from multiprocessing import Process, Event, Pipe
+from multiprocessing.connection import Connection
+from typing import Optional, Tuple
 
-from . import net, node
+from . import net, node, table_rows_batch, table_rows_binary, table_stream
+from .chain_info import ChainInfoSnapshot
+from .locked_chain import chain_read_lock, chain_transaction_lock
+from .worker_pool import STATISTICS_INTERVAL, WorkerStatistics, new_reuse_port_socket
+from .chain_executor import ChainExecutorBusy, ChainExecutorTimeout, generate_executor_error, get_read_executor, get_transaction_executor, reset_executors
 
 from .. import eos
 from ..bases import log, rate_limit
+from ..bases.read_write_lock import SharedReadWriteLock
 from ..bases.uvicorn_server import UvicornServer
 from ..core.chain_exceptions import BlockValidateException, DatabaseGuardException, ChainException
 
@@ -55,67 +60,62 @@ class PushReadOnlyTransactionArgs(BaseModel):
     packed_tx: str
 
 class Messenger(object):
-    def __init__(self, in_queue, out_queue):
-        self.in_queue = in_queue
-        self.out_queue = out_queue
+    """
+    One end of a duplex pipe between the main process and a worker process, see `new_messenger_pair`.
+
+    `get` and `get_timeout` block the calling thread, `request` sends a message and waits for the reply
+    in the event loop without blocking it.
+    """
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.send_lock = threading.Lock()
+        self.request_lock: Optional[asyncio.Lock] = None
 
     def get(self, wait=True):
-        return self.in_queue.get(wait)
+        if not wait:
+            return self.get_nowait()
+        return self.conn.recv()
 
     def get_nowait(self):
-        return self.in_queue.get_nowait()
+        if not self.conn.poll():
+            raise queue.Empty
+        return self.conn.recv()
 
     def get_timeout(self, timeout):
-        while timeout > 0:
-            if self.in_queue.empty():
-                time.sleep(0.1)
-                timeout -= 0.1
-                continue
-            return self.in_queue.get_nowait()
-        return None
-
-    def put(self, data):
-        self.out_queue.put(data)
-
-class ReadWriteLock:
-    class _RLock:
-        def __init__(self, lock):
-            self._lock = lock
-
-        def __enter__(self):
-            self._lock._read_ready.acquire()
-            self._lock._readers.value += 1
-            self._lock._read_ready.release()
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            self._lock._read_ready.acquire()
-            self._lock._readers.value -= 1
-            if not self._lock._readers.value:
-                self._lock._read_ready.notify_all()
-            self._lock._read_ready.release()
-
-    class _WLock:
-        def __init__(self, lock):
-            self._lock = lock
-
-        def __enter__(self):
-            self._lock._read_ready.acquire()
-            while self._lock._readers.value > 0:
-                self._lock._read_ready.wait()
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            self._lock._read_ready.notify_all()
-            self._lock._read_ready.release()
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
 
-    def __init__(self):
-        self._read_ready = Condition(Lock())
-        self._readers = Value('i', 0)  # integer, initially 0
+    async def get_async(self):
+        loop = asyncio.get_running_loop()
+        fd = self.conn.fileno()
+        while not self.conn.poll():
+            readable = loop.create_future()
+            loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+        return self.conn.recv()
+
+    async def request(self, data):
+        # replies arrive in the order of the requests, one request at a time keeps them paired
+        if not self.request_lock:
+            self.request_lock = asyncio.Lock()
+        async with self.request_lock:
+            self.put(data)
+            return await self.get_async()
 
-    def rlock(self):
-        return self._RLock(self)
+    def put(self, data):
+        with self.send_lock:
+            self.conn.send(data)
 
-    def wlock(self):
-        return self._WLock(self)
+def new_messenger_pair() -> Tuple[Messenger, Messenger]:
+    """
+    Returns the messenger of the main process and the messenger of the worker process.
+    """
+    conn1, conn2 = Pipe()
+    return Messenger(conn1), Messenger(conn2)
 
 g_worker = None
 
@@ -126,38 +126,97 @@ async def read_root():
     return {"Hello": "World"}
 
 @app.get("/v1/chain/get_info", response_class=PlainTextResponse)
-@cached(ttl=1, cache=Cache.MEMORY, key="get_info", serializer=StringSerializer())
 async def get_info():
-    g_worker.messenger.put('get_info')
+    info = g_worker.chain_info.get_info()
+    if info:
+        return info
+    # nothing published, e.g. the main process runs an attached eosnode
     try:
-        msg = g_worker.messenger.get()
-        logger.info('get_info: %s', msg)
-        return msg
+        return await g_worker.messenger.request('get_info')
     except Exception as e:
         logger.exception(e)
     return 'None'
-    # return node.get_node().api.get_info(is_json=False)
 
 @app.post("/v1/chain/push_read_only_transaction", response_class=PlainTextResponse)
 async def push_ro_transaction(args: PushReadOnlyTransactionArgs):
     global g_worker
     packed_tx = bytes.fromhex(args.packed_tx)
 
-    with g_worker.rwlock.rlock():
-        return node.get_node().chain.push_ro_transaction(packed_tx, return_json=False)
+    def push_ro_transaction():
+        with chain_transaction_lock(g_worker.rwlock):
+            return node.get_node().chain.push_ro_transaction(packed_tx, return_json=False)
+    try:
+        return await get_transaction_executor().run(push_ro_transaction)
+    except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+        return generate_executor_error(e)
 
 @app.post("/v1/chain/get_table_rows", response_class=PlainTextResponse)
 async def get_table_rows(req: Request):
     global g_worker
     kwargs = await req.json()
     logger.info('get_table_rows: %s', kwargs)
-    with g_worker.rwlock.rlock():
-        ret = node.get_node().api.get_table_rows(**kwargs, return_json=False)
-        logger.info('get_table_rows: %s', ret)
-        return ret
+
+    def get_table_rows():
+        with chain_read_lock(g_worker.rwlock):
+            return node.get_node().api.get_table_rows(**kwargs, return_json=False)
+    try:
+        ret = await get_read_executor().run(get_table_rows)
+    except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+        return generate_executor_error(e)
+    logger.info('get_table_rows: %s', ret)
+    return ret
+
+@app.post("/v1/chain/get_table_rows_batch")
+async def get_table_rows_batch(req: Request):
+    global g_worker
+    try:
+        queries = table_rows_batch.parse_batch(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+
+    try:
+        results = await table_rows_batch.run_table_rows_batch(node.get_node().api, queries, g_worker.rwlock)
+    except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+        return generate_executor_error(e)
+    return table_rows_batch.generate_batch_response(results)
+
+@app.post("/v1/chain/get_table_rows_stream")
+async def get_table_rows_stream(req: Request):
+    global g_worker
+    try:
+        params = table_stream.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+    return table_stream.stream_table_rows(node.get_node().api, params, g_worker.rwlock)
+
+@app.post("/v1/chain/get_table_by_scope_stream")
+async def get_table_by_scope_stream(req: Request):
+    global g_worker
+    try:
+        params = table_stream.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+    return table_stream.stream_table_by_scope(node.get_node().api, params, g_worker.rwlock)
+
+@app.post("/v1/chain/get_table_rows_binary")
+async def get_table_rows_binary(req: Request):
+    global g_worker
+    try:
+        params = table_rows_binary.parse_params(await req.body())
+    except ValueError as e:
+        return table_rows_batch.generate_invalid_request_error(e)
+
+    def get_table_rows_binary():
+        with chain_read_lock(g_worker.rwlock):
+            return table_rows_binary.get_table_rows_binary(node.get_node().db, **params)
+    try:
+        ret = await get_read_executor().run(get_table_rows_binary)
+    except (ChainExecutorBusy, ChainExecutorTimeout) as e:
+        return generate_executor_error(e)
+    return table_rows_binary.generate_binary_response(*ret)
 
 class Worker(object):
-    def __init__(self, messenger: Messenger, rwlock, exit_event, rpc_address: str):
+    def __init__(self, messenger: Messenger, rwlock, chain_info: ChainInfoSnapshot, exit_event, rpc_address: str, statistics: Optional[WorkerStatistics] = None, reuse_port: bool = False):
         uds = None
         host = None
         port = None
@@ -175,14 +234,18 @@ class Worker(object):
 
         app.get("/")(read_root)
         app.middleware("http")(rate_limit.rate_limit_middleware)
-        rate_limit.create_schedule_task()
 
         self.config = uvicorn.Config(app, host=host, port=port, uds=uds)
         self.server = UvicornServer(self.config)
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.statistics = statistics
 
         self.messenger = messenger
         self.exit_event = exit_event
         self.rwlock = rwlock
+        self.chain_info = chain_info
 
         self.in_shutdown = False
 
@@ -190,7 +253,11 @@ class Worker(object):
         try:
             # if port is in use, uvicorn will raise OSError and all sys.exit(-1) which should be avoided
             # so make sure to check port is in use before start the server
-            await self.server.serve()
+            if self.reuse_port:
+                # workers of a pool listen on the same port
+                await self.server.serve(sockets=[new_reuse_port_socket(self.host, self.port)])
+            else:
+                await self.server.serve()
         except asyncio.exceptions.CancelledError:
             logger.info('worker: asyncio.exceptions.CancelledError')
         except Exception as e:
@@ -220,11 +287,28 @@ class Worker(object):
         logger.info("handle_signal: %s", signum)
         self.exit()
 
+    async def report_statistics(self):
+        loop = asyncio.get_running_loop()
+        last_time = time.monotonic()
+        last_cpu_time = time.process_time()
+        while not eos.should_exit():
+            start = loop.time()
+            await asyncio.sleep(STATISTICS_INTERVAL)
+            latency = max(loop.time() - start - STATISTICS_INTERVAL, 0.0)
+            now = time.monotonic()
+            cpu_time = time.process_time()
+            cpu_usage = (cpu_time - last_cpu_time) / (now - last_time)
+            last_time, last_cpu_time = now, cpu_time
+            self.statistics.publish(latency, cpu_usage, get_read_executor().pending + get_transaction_executor().pending)
+
     async def main(self):
         loop = asyncio.get_event_loop()
         loop.add_signal_handler(signal.SIGINT, self.handle_signal, signal.SIGINT)
         loop.add_signal_handler(signal.SIGTERM, self.handle_signal, signal.SIGTERM)
 
+        rate_limit.create_schedule_task()
+        if self.statistics:
+            asyncio.create_task(self.report_statistics())
         asyncio.create_task(self.start())
         try:
             while not eos.should_exit():
@@ -240,10 +324,21 @@ class Worker(object):
         self.exit()
         logger.info('exit_listener')
 
-def run(rpc_address, rwlock: Lock, messenger: Messenger, exit_event: Event, data_dir: str, config_dir: str, state_size: int):
+def reset_forked_state():
+    """
+    Drops the state a worker copies from the main process when it is forked, by the event loop
+    thread or by the worker pool supervisor thread: the running loop, the rate limiter and scheduler,
+    and the chain executors whose threads do not exist in the worker.
+    """
+    asyncio._set_running_loop(None)
+    rate_limit.reset()
+    reset_executors()
+
+def run(rpc_address, rwlock: SharedReadWriteLock, chain_info: ChainInfoSnapshot, messenger: Messenger, exit_event: Event, data_dir: str, config_dir: str, state_size: int, statistics: Optional[WorkerStatistics] = None, reuse_port: bool = False):
     global g_worker
+    reset_forked_state()
     try:
-        g_worker = Worker(messenger, rwlock, exit_event, rpc_address)
+        g_worker = Worker(messenger, rwlock, chain_info, exit_event, rpc_address, statistics, reuse_port)
         _node = node.init_worker_node(data_dir, config_dir, state_size, rwlock)
         _node.chain.start_block()
     except DatabaseGuardException as e:
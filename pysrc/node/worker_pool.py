@@ -0,0 +1,237 @@
+import socket
+import struct
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ..bases import log
+from ..bases.shared_snapshot import SharedSnapshot
+
+logger = log.get_logger(__name__)
+
+default_min_workers = 1
+default_max_workers = 4
+default_scale_up_latency = 0.05 # in seconds
+default_scale_down_latency = 0.005 # in seconds
+default_scale_up_cpu = 0.8 # 1.0 is one busy core
+default_scale_down_cpu = 0.2
+default_supervise_interval = 5.0 # in seconds
+
+STATISTICS_INTERVAL = 1.0 # in seconds
+
+# event loop latency in seconds, cpu usage, pending chain calls
+statistics_layout = struct.Struct('<ddI')
+
+class WorkerStatistics(object):
+    """
+    Load of a worker process published to the supervisor in shared memory, updated every `STATISTICS_INTERVAL` seconds.
+
+    The event loop latency is how late a timer fires, which is how long a new request waits before it is handled.
+    """
+    def __init__(self, snapshot: Optional[SharedSnapshot] = None):
+        if not snapshot:
+            snapshot = SharedSnapshot(capacity=statistics_layout.size)
+        self.snapshot = snapshot
+
+    def __getstate__(self):
+        return {'snapshot': self.snapshot}
+
+    def __setstate__(self, state):
+        self.__init__(state['snapshot'])
+
+    def free(self):
+        self.snapshot.free()
+
+    def publish(self, latency: float, cpu_usage: float, pending: int):
+        self.snapshot.publish(statistics_layout.pack(latency, cpu_usage, pending))
+
+    def read(self) -> Optional[Tuple[float, float, int]]:
+        """
+        Returns (latency, cpu_usage, pending), None if the worker has not published yet.
+        """
+        version, data = self.snapshot.read()
+        if not version:
+            return None
+        return statistics_layout.unpack(data)
+
+def new_reuse_port_socket(host: str, port: int) -> socket.socket:
+    """
+    Returns a socket bound to `host:port` that other processes can bind too, the kernel spreads
+    incoming connections over all of them.
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+class PoolWorker(object):
+    def __init__(self, process, messenger, exit_event, statistics: WorkerStatistics):
+        self.process = process
+        self.messenger = messenger
+        self.exit_event = exit_event
+        self.statistics = statistics
+
+    def stop(self, timeout: float = 10.0):
+        self.exit_event.set()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            logger.error('+++++worker %s did not exit, terminate it', self.process.pid)
+            self.process.terminate()
+            self.process.join()
+        self.statistics.free()
+
+# start_worker(rpc_address, statistics) returns (process, messenger, exit_event) of a started worker or None
+StartWorker = Callable[[str, WorkerStatistics], Optional[tuple]]
+
+class WorkerPool(object):
+    """
+    Read only RPC workers that share one listening address through SO_REUSEPORT.
+
+    A supervisor thread restarts crashed workers, starts a worker when the workers are busy and stops
+    one when they are idle, between `min_workers` and `max_workers`. Workers are busy when the average
+    event loop latency or cpu usage exceeds the scale up threshold or chain calls are pending, and idle
+    when both are below the scale down thresholds.
+    """
+    def __init__(self, rpc_address: str, start_worker: StartWorker, min_workers: int = default_min_workers,
+                 max_workers: int = default_max_workers,
+                 scale_up_latency: float = default_scale_up_latency, scale_down_latency: float = default_scale_down_latency,
+                 scale_up_cpu: float = default_scale_up_cpu, scale_down_cpu: float = default_scale_down_cpu,
+                 interval: float = default_supervise_interval):
+        self.rpc_address = rpc_address
+        self.start_worker = start_worker
+        self.min_workers = max(min_workers, 1)
+        self.max_workers = max(max_workers, self.min_workers)
+        self.scale_up_latency = scale_up_latency
+        self.scale_down_latency = scale_down_latency
+        self.scale_up_cpu = scale_up_cpu
+        self.scale_down_cpu = scale_down_cpu
+        self.interval = interval
+
+        self.workers: List[PoolWorker] = []
+        self.restarts = 0
+        self.lock = threading.Lock()
+        self.exit_event = threading.Event()
+        self.supervisor: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: dict, start_worker: StartWorker):
+        return cls(
+            config['rpc_address'],
+            start_worker,
+            min_workers=config.get('min_workers', default_min_workers),
+            max_workers=config.get('max_workers', default_max_workers),
+            scale_up_latency=config.get('scale_up_latency', default_scale_up_latency),
+            scale_down_latency=config.get('scale_down_latency', default_scale_down_latency),
+            scale_up_cpu=config.get('scale_up_cpu', default_scale_up_cpu),
+            scale_down_cpu=config.get('scale_down_cpu', default_scale_down_cpu),
+            interval=config.get('interval', default_supervise_interval),
+        )
+
+    def start(self) -> bool:
+        if self.rpc_address.startswith('/') or self.rpc_address.startswith('./'):
+            logger.error('+++++worker_pool needs a tcp address, got %s', self.rpc_address)
+            return False
+        for _ in range(self.min_workers):
+            if not self.add_worker():
+                self.stop()
+                return False
+        self.supervisor = threading.Thread(target=self.supervise, name='worker-pool-supervisor', daemon=True)
+        self.supervisor.start()
+        return True
+
+    def add_worker(self) -> bool:
+        statistics = WorkerStatistics()
+        ret = self.start_worker(self.rpc_address, statistics)
+        if not ret:
+            statistics.free()
+            return False
+        with self.lock:
+            self.workers.append(PoolWorker(*ret, statistics))
+        logger.info('+++++worker pool: %s workers', len(self.workers))
+        return True
+
+    def remove_worker(self):
+        with self.lock:
+            worker = self.workers.pop()
+        worker.stop()
+        logger.info('+++++worker pool: %s workers', len(self.workers))
+
+    def restart_crashed_workers(self):
+        with self.lock:
+            crashed = [w for w in self.workers if not w.process.is_alive()]
+            self.workers = [w for w in self.workers if w.process.is_alive()]
+        for worker in crashed:
+            logger.error('+++++worker %s exited with code %s, restart it', worker.process.pid, worker.process.exitcode)
+            worker.statistics.free()
+            self.restarts += 1
+            self.add_worker()
+
+    def add_missing_workers(self):
+        """
+        Starts workers until there are `min_workers` workers, a worker that failed to start or to
+        restart is started again on the next tick.
+        """
+        while len(self.workers) < self.min_workers and not self.exit_event.is_set():
+            if not self.add_worker():
+                logger.error('+++++worker pool: start worker failed, %s workers', len(self.workers))
+                return
+
+    def get_load(self) -> Optional[Tuple[float, float, int]]:
+        """
+        Returns the average latency and cpu usage and the total pending calls of the workers.
+        """
+        with self.lock:
+            statistics = [w.statistics.read() for w in self.workers]
+        statistics = [s for s in statistics if s]
+        if not statistics:
+            return None
+        latency = sum(s[0] for s in statistics) / len(statistics)
+        cpu_usage = sum(s[1] for s in statistics) / len(statistics)
+        pending = sum(s[2] for s in statistics)
+        return latency, cpu_usage, pending
+
+    def autoscale(self):
+        load = self.get_load()
+        if not load:
+            return
+        latency, cpu_usage, pending = load
+        count = len(self.workers)
+        if latency > self.scale_up_latency or cpu_usage > self.scale_up_cpu or pending:
+            if count < self.max_workers:
+                logger.info('+++++workers are busy, latency: %.4f, cpu: %.2f, pending: %s', latency, cpu_usage, pending)
+                self.add_worker()
+        elif latency < self.scale_down_latency and cpu_usage < self.scale_down_cpu:
+            if count > self.min_workers:
+                logger.info('+++++workers are idle, latency: %.4f, cpu: %.2f', latency, cpu_usage)
+                self.remove_worker()
+
+    def supervise(self):
+        while not self.exit_event.wait(self.interval):
+            try:
+                self.restart_crashed_workers()
+                self.add_missing_workers()
+                self.autoscale()
+            except Exception as e:
+                logger.exception(e)
+
+    def stop(self):
+        self.exit_event.set()
+        if self.supervisor and self.supervisor is not threading.current_thread():
+            self.supervisor.join()
+        with self.lock:
+            workers = self.workers
+            self.workers = []
+        for worker in workers:
+            worker.stop()
+
+    def get_statistics(self) -> dict:
+        load = self.get_load()
+        return {
+            'workers': len(self.workers),
+            'restarts': self.restarts,
+            'latency': load[0] if load else 0.0,
+            'cpu_usage': load[1] if load else 0.0,
+            'pending': load[2] if load else 0,
+        }
@@ -115,8 +115,7 @@ setup(
         "fastapi",
         "pydantic",
         'aiomonitor',
-        'uvloop',
-        'aiocache'
+        'uvloop'
     ],
     tests_require=[],
     include_package_data=True
@@ -117,8 +117,8 @@ cdef extern from "_ipyeos.hpp":
         void gen_transaction(bool json, string& _actions, int64_t expiration_sec, string& reference_block_id, string& _chain_id, bool compress, string& _private_keys, vector[char]& result)
         bool push_transaction(const char *_packed_trx, size_t _packed_trx_size, int64_t block_deadline_ms, uint32_t billed_cpu_time_us, bool explicit_cpu_bill, uint32_t subjective_cpu_bill_us, bool read_only, string& result)
         bool push_block_from_block_log(void *block_log_ptr, uint32_t block_num)
-        bool push_raw_block(const char *raw_block, size_t raw_block_size, string *block_statistics)
-        bool push_block(const signed_block_proxy *block, string *block_statistics)
+        bool push_raw_block(const char *raw_block, size_t raw_block_size, string *block_statistics) nogil
+        bool push_block(const signed_block_proxy *block, string *block_statistics) nogil
 
         string get_scheduled_transactions()
         string get_scheduled_transaction(const char *sender_id, size_t sender_id_size, string& sender)
@@ -582,24 +582,40 @@ def push_transaction(uint64_t ptr, _packed_trx: bytes, int64_t block_deadline_ms
 def push_block_from_block_log(uint64_t ptr, uint64_t block_log_ptr, uint32_t block_num) -> bool:
     return chain(ptr).push_block_from_block_log(<void *>block_log_ptr, block_num)
 
-def push_raw_block(uint64_t ptr, raw_block: bytes, bool return_block_statistic):
+# raw_block can be any object that supports the buffer protocol, e.g. bytes or memoryview
+def push_raw_block(uint64_t ptr, const unsigned char[::1] raw_block, bool return_block_statistic):
     cdef string block_statistics
+    cdef bool ret
+    cdef chain_proxy *_chain = chain(ptr)
+    cdef size_t raw_block_size = raw_block.shape[0]
+    if raw_block_size == 0:
+        return (False, None)
+    cdef const char *_raw_block = <const char *>&raw_block[0]
+    # release the GIL so that the event loop keeps running while the block is applied
+    with nogil:
+        if return_block_statistic:
+            ret = _chain.push_raw_block(_raw_block, raw_block_size, &block_statistics)
+        else:
+            ret = _chain.push_raw_block(_raw_block, raw_block_size, <string *>0)
     if return_block_statistic:
-        ret = chain(ptr).push_raw_block(<const char *>raw_block, len(raw_block), &block_statistics)
         return (ret, block_statistics)
-    else:
-        ret = chain(ptr).push_raw_block(<const char *>raw_block, len(raw_block), <string *>0)
-        return (ret, None)
+    return (ret, None)
 
 # bool push_block(const signed_block_proxy *block, string *block_statistics)
 def push_block(uint64_t ptr, uint64_t signed_block_proxy_ptr, bool return_block_statistic):
     cdef string block_statistics
+    cdef bool ret
+    cdef chain_proxy *_chain = chain(ptr)
+    cdef const signed_block_proxy *_block = <signed_block_proxy *>signed_block_proxy_ptr
+    # release the GIL so that blocks can be decoded on other threads while the block is applied
+    with nogil:
+        if return_block_statistic:
+            ret = _chain.push_block(_block, &block_statistics)
+        else:
+            ret = _chain.push_block(_block, <string *>0)
     if return_block_statistic:
-        ret = chain(ptr).push_block(<signed_block_proxy *>signed_block_proxy_ptr, &block_statistics)
         return (ret, block_statistics)
-    else:
-        ret = chain(ptr).push_block(<signed_block_proxy *>signed_block_proxy_ptr, <string *>0)
-        return (ret, None)
+    return (ret, None)
 
 def get_scheduled_transactions(uint64_t ptr):
     return chain(ptr).get_scheduled_transactions()
@@ -148,3 +148,84 @@ def upper_bound(uint64_t ptr, tp: int32_t, index_position: int32_t, raw_data: by
 
 def row_count(uint64_t ptr, tp: int32_t):
     return db(ptr).row_count(tp)
+
+ctypedef struct raw_rows:
+    vector[char] *data
+    vector[uint64_t] *offsets
+    uint64_t limit
+    bool out_of_memory
+
+# the walk is called with the GIL held, a failed allocation stops the walk instead of escaping the native walk
+cdef int32_t database_on_raw_data(int32_t tp, char *data, size_t size, void *custom_data) noexcept:
+    cdef raw_rows *rows = <raw_rows *>custom_data
+    cdef size_t pos = rows.data.size()
+    try:
+        rows.data.resize(pos + size)
+        try:
+            rows.offsets.push_back(pos)
+        except MemoryError:
+            rows.data.resize(pos)
+            raise
+    except MemoryError:
+        rows.out_of_memory = True
+        return 0
+    memcpy(rows.data.data() + pos, data, size)
+    if rows.limit and rows.offsets.size() >= rows.limit:
+        return 0
+    return 1
+
+cdef raw_rows_result(raw_rows &rows, vector[char] &data, vector[uint64_t] &offsets):
+    if rows.out_of_memory:
+        raise MemoryError(f'out of memory after {offsets.size()} rows, pass a limit or a smaller range')
+    return (PyBytes_FromStringAndSize(data.data(), data.size()), PyBytes_FromStringAndSize(<char *>offsets.data(), offsets.size() * 8))
+
+def walk_raw(uint64_t ptr, tp: int32_t, index_position: int32_t, uint64_t limit = 0):
+    """
+    Collects the rows of an index into one buffer without calling into Python per row, at most `limit` rows if it is not 0,
+    returns (ret, data, offsets), offsets are the start positions of the rows packed as native uint64
+    """
+    cdef vector[char] data
+    cdef vector[uint64_t] offsets
+    cdef raw_rows rows
+    rows.data = &data
+    rows.offsets = &offsets
+    rows.limit = limit
+    rows.out_of_memory = False
+    db(ptr).set_data_handler(database_on_raw_data, <void *>&rows)
+    ret = db(ptr).walk(tp, index_position)
+    return (ret,) + raw_rows_result(rows, data, offsets)
+
+def walk_range_raw(uint64_t ptr, tp: int32_t, index_position: int32_t, raw_lower_bound: bytes, raw_upper_bound: bytes, uint64_t limit = 0):
+    cdef vector[char] data
+    cdef vector[uint64_t] offsets
+    cdef raw_rows rows
+    rows.data = &data
+    rows.offsets = &offsets
+    rows.limit = limit
+    rows.out_of_memory = False
+    db(ptr).set_data_handler(database_on_raw_data, <void *>&rows)
+    ret = db(ptr).walk_range(tp, index_position, <const char *>raw_lower_bound, len(raw_lower_bound), <const char *>raw_upper_bound, len(raw_upper_bound))
+    return (ret,) + raw_rows_result(rows, data, offsets)
+
+ctypedef struct range_stats:
+    uint64_t count
+    uint64_t packed_size
+
+cdef int32_t database_on_count(int32_t tp, char *data, size_t size, void *custom_data) noexcept:
+    cdef range_stats *stats = <range_stats *>custom_data
+    stats.count += 1
+    stats.packed_size += size
+    return 1
+
+def count_range(uint64_t ptr, tp: int32_t, index_position: int32_t, raw_lower_bound: bytes, raw_upper_bound: bytes):
+    """
+    Counts the rows of a range of an index by walking them in the database, the cost is linear in
+    the number of rows but there is no call into Python per row,
+    returns (ret, count, packed_size), packed_size is the total size of the packed rows
+    """
+    cdef range_stats stats
+    stats.count = 0
+    stats.packed_size = 0
+    db(ptr).set_data_handler(database_on_count, <void *>&stats)
+    ret = db(ptr).walk_range(tp, index_position, <const char *>raw_lower_bound, len(raw_lower_bound), <const char *>raw_upper_bound, len(raw_upper_bound))
+    return (ret, stats.count, stats.packed_size)
@@ -38,3 +38,290 @@ def acquire_write_lock(uint64_t ptr):
 
 def release_write_lock(uint64_t ptr):
     proxy(ptr).release_write_lock()
+
+# writer preferring reader-writer lock in memory shared by processes
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #include <string.h>
+    #include <time.h>
+    #include <sched.h>
+    #ifdef __linux__
+    #include <linux/futex.h>
+    #include <sys/syscall.h>
+    #include <unistd.h>
+    #endif
+
+    #define SHARED_RWLOCK_WRITER 0x80000000u
+
+    typedef struct {
+        uint32_t state;           // number of readers, SHARED_RWLOCK_WRITER if a writer holds the lock
+        uint32_t writers_waiting;
+        uint32_t read_seq;        // futex word of waiting readers
+        uint32_t write_seq;       // futex word of waiting writers
+        uint64_t read_acquires;
+        uint64_t read_contended;
+        uint64_t read_wait_ns;
+        uint64_t write_acquires;
+        uint64_t write_contended;
+        uint64_t write_wait_ns;
+    } shared_rwlock;
+
+    static inline uint64_t shared_rwlock_now() {
+        struct timespec ts;
+        clock_gettime(CLOCK_MONOTONIC, &ts);
+        return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+    }
+
+    static inline void shared_rwlock_wait(uint32_t *seq, uint32_t value) {
+    #ifdef __linux__
+        syscall(SYS_futex, seq, FUTEX_WAIT, value, NULL, NULL, 0);
+    #else
+        if (__atomic_load_n(seq, __ATOMIC_SEQ_CST) == value) {
+            sched_yield();
+        }
+    #endif
+    }
+
+    static inline void shared_rwlock_wake(uint32_t *seq, int count) {
+        __atomic_add_fetch(seq, 1, __ATOMIC_SEQ_CST);
+    #ifdef __linux__
+        syscall(SYS_futex, seq, FUTEX_WAKE, count, NULL, NULL, 0);
+    #endif
+    }
+
+    static inline int shared_rwlock_try_read(shared_rwlock *lock) {
+        // new readers wait behind waiting writers
+        if (__atomic_load_n(&lock->writers_waiting, __ATOMIC_SEQ_CST)) {
+            return 0;
+        }
+        uint32_t state = __atomic_load_n(&lock->state, __ATOMIC_SEQ_CST);
+        while (!(state & SHARED_RWLOCK_WRITER)) {
+            if (__atomic_compare_exchange_n(&lock->state, &state, state + 1, 1, __ATOMIC_SEQ_CST, __ATOMIC_SEQ_CST)) {
+                return 1;
+            }
+        }
+        return 0;
+    }
+
+    static inline int shared_rwlock_try_write(shared_rwlock *lock) {
+        uint32_t state = 0;
+        return __atomic_compare_exchange_n(&lock->state, &state, SHARED_RWLOCK_WRITER, 0, __ATOMIC_SEQ_CST, __ATOMIC_SEQ_CST);
+    }
+
+    static void shared_rwlock_acquire_read(shared_rwlock *lock) {
+        __atomic_add_fetch(&lock->read_acquires, 1, __ATOMIC_RELAXED);
+        if (shared_rwlock_try_read(lock)) {
+            return;
+        }
+        uint64_t start = shared_rwlock_now();
+        for (;;) {
+            uint32_t seq = __atomic_load_n(&lock->read_seq, __ATOMIC_SEQ_CST);
+            if (shared_rwlock_try_read(lock)) {
+                break;
+            }
+            shared_rwlock_wait(&lock->read_seq, seq);
+        }
+        __atomic_add_fetch(&lock->read_contended, 1, __ATOMIC_RELAXED);
+        __atomic_add_fetch(&lock->read_wait_ns, shared_rwlock_now() - start, __ATOMIC_RELAXED);
+    }
+
+    static void shared_rwlock_release_read(shared_rwlock *lock) {
+        uint32_t state = __atomic_sub_fetch(&lock->state, 1, __ATOMIC_SEQ_CST);
+        if (state == 0 && __atomic_load_n(&lock->writers_waiting, __ATOMIC_SEQ_CST)) {
+            shared_rwlock_wake(&lock->write_seq, 1);
+        }
+    }
+
+    static void shared_rwlock_acquire_write(shared_rwlock *lock) {
+        __atomic_add_fetch(&lock->write_acquires, 1, __ATOMIC_RELAXED);
+        if (shared_rwlock_try_write(lock)) {
+            return;
+        }
+        uint64_t start = shared_rwlock_now();
+        __atomic_add_fetch(&lock->writers_waiting, 1, __ATOMIC_SEQ_CST);
+        for (;;) {
+            uint32_t seq = __atomic_load_n(&lock->write_seq, __ATOMIC_SEQ_CST);
+            if (shared_rwlock_try_write(lock)) {
+                break;
+            }
+            shared_rwlock_wait(&lock->write_seq, seq);
+        }
+        __atomic_sub_fetch(&lock->writers_waiting, 1, __ATOMIC_SEQ_CST);
+        __atomic_add_fetch(&lock->write_contended, 1, __ATOMIC_RELAXED);
+        __atomic_add_fetch(&lock->write_wait_ns, shared_rwlock_now() - start, __ATOMIC_RELAXED);
+    }
+
+    static void shared_rwlock_release_write(shared_rwlock *lock) {
+        __atomic_store_n(&lock->state, 0, __ATOMIC_SEQ_CST);
+        if (__atomic_load_n(&lock->writers_waiting, __ATOMIC_SEQ_CST)) {
+            shared_rwlock_wake(&lock->write_seq, 1);
+        } else {
+            shared_rwlock_wake(&lock->read_seq, 0x7fffffff);
+        }
+    }
+    """
+    ctypedef struct shared_rwlock:
+        uint32_t state
+        uint32_t writers_waiting
+        uint64_t read_acquires
+        uint64_t read_contended
+        uint64_t read_wait_ns
+        uint64_t write_acquires
+        uint64_t write_contended
+        uint64_t write_wait_ns
+
+    void shared_rwlock_acquire_read(shared_rwlock *lock) nogil
+    void shared_rwlock_release_read(shared_rwlock *lock) nogil
+    void shared_rwlock_acquire_write(shared_rwlock *lock) nogil
+    void shared_rwlock_release_write(shared_rwlock *lock) nogil
+
+cdef shared_rwlock *shared_lock(uint64_t ptr) noexcept nogil:
+    return <shared_rwlock*>ptr
+
+def shared_lock_size():
+    return sizeof(shared_rwlock)
+
+def shared_lock_init(unsigned char[::1] buffer) -> uint64_t:
+    """
+    Initializes a lock at the start of `buffer`, returns the address of the lock
+    """
+    assert buffer.shape[0] >= sizeof(shared_rwlock), 'buffer is too small'
+    memset(&buffer[0], 0, sizeof(shared_rwlock))
+    return <uint64_t>&buffer[0]
+
+def shared_lock_attach(unsigned char[::1] buffer) -> uint64_t:
+    assert buffer.shape[0] >= sizeof(shared_rwlock), 'buffer is too small'
+    return <uint64_t>&buffer[0]
+
+def shared_acquire_read_lock(uint64_t ptr):
+    with nogil:
+        shared_rwlock_acquire_read(shared_lock(ptr))
+
+def shared_release_read_lock(uint64_t ptr):
+    shared_rwlock_release_read(shared_lock(ptr))
+
+def shared_acquire_write_lock(uint64_t ptr):
+    with nogil:
+        shared_rwlock_acquire_write(shared_lock(ptr))
+
+def shared_release_write_lock(uint64_t ptr):
+    shared_rwlock_release_write(shared_lock(ptr))
+
+def shared_lock_statistics(uint64_t ptr):
+    cdef shared_rwlock *lock = shared_lock(ptr)
+    return dict(
+        readers=lock.state & 0x7fffffff,
+        writer=(lock.state & 0x80000000) != 0,
+        writers_waiting=lock.writers_waiting,
+        read_acquires=lock.read_acquires,
+        read_contended=lock.read_contended,
+        read_wait_ns=lock.read_wait_ns,
+        write_acquires=lock.write_acquires,
+        write_contended=lock.write_contended,
+        write_wait_ns=lock.write_wait_ns,
+    )
+
+# single writer sequence lock over a byte buffer in memory shared by processes,
+# readers never block the writer and retry while a write is in progress
+cdef extern from *:
+    """
+    typedef struct {
+        uint64_t seq;       // odd while the writer is copying data
+        uint32_t size;
+        uint32_t capacity;
+    } shared_seqlock;
+
+    static inline char *shared_seqlock_data(shared_seqlock *lock) {
+        return (char *)lock + sizeof(shared_seqlock);
+    }
+
+    static uint64_t shared_seqlock_write(shared_seqlock *lock, const char *data, uint32_t size) {
+        uint64_t seq = __atomic_load_n(&lock->seq, __ATOMIC_RELAXED);
+        __atomic_store_n(&lock->seq, seq + 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_RELEASE);
+        if (size) {
+            memcpy(shared_seqlock_data(lock), data, size);
+        }
+        __atomic_store_n(&lock->size, size, __ATOMIC_RELAXED);
+        __atomic_store_n(&lock->seq, seq + 2, __ATOMIC_RELEASE);
+        return (seq + 2) / 2;
+    }
+
+    // copies the data to `out` which has room for `capacity` bytes, returns the version of the data
+    static uint64_t shared_seqlock_read(shared_seqlock *lock, char *out, uint32_t *size) {
+        for (;;) {
+            uint64_t seq = __atomic_load_n(&lock->seq, __ATOMIC_ACQUIRE);
+            if (seq & 1) {
+                sched_yield();
+                continue;
+            }
+            uint32_t n = __atomic_load_n(&lock->size, __ATOMIC_RELAXED);
+            if (n > lock->capacity) {
+                continue;
+            }
+            memcpy(out, shared_seqlock_data(lock), n);
+            __atomic_thread_fence(__ATOMIC_ACQUIRE);
+            if (__atomic_load_n(&lock->seq, __ATOMIC_RELAXED) == seq) {
+                *size = n;
+                return seq / 2;
+            }
+        }
+    }
+    """
+    ctypedef struct shared_seqlock:
+        uint64_t seq
+        uint32_t size
+        uint32_t capacity
+
+    uint64_t shared_seqlock_write(shared_seqlock *lock, const char *data, uint32_t size) nogil
+    uint64_t shared_seqlock_read(shared_seqlock *lock, char *out, uint32_t *size) nogil
+
+cdef shared_seqlock *shared_seq(uint64_t ptr) noexcept nogil:
+    return <shared_seqlock*>ptr
+
+def seqlock_header_size():
+    return sizeof(shared_seqlock)
+
+def seqlock_init(unsigned char[::1] buffer) -> uint64_t:
+    """
+    Initializes a sequence lock at the start of `buffer`, the rest of the buffer holds the data.
+    Returns the address of the lock
+    """
+    assert buffer.shape[0] > sizeof(shared_seqlock), 'buffer is too small'
+    cdef shared_seqlock *lock = <shared_seqlock*>&buffer[0]
+    memset(lock, 0, sizeof(shared_seqlock))
+    lock.capacity = <uint32_t>min(buffer.shape[0] - sizeof(shared_seqlock), 0xffffffff)
+    return <uint64_t>lock
+
+def seqlock_attach(unsigned char[::1] buffer) -> uint64_t:
+    assert buffer.shape[0] > sizeof(shared_seqlock), 'buffer is too small'
+    return <uint64_t>&buffer[0]
+
+def seqlock_capacity(uint64_t ptr) -> int:
+    return shared_seq(ptr).capacity
+
+def seqlock_write(uint64_t ptr, const unsigned char[::1] data) -> uint64_t:
+    """
+    Replaces the data, returns the new version. Only one process may write.
+    """
+    cdef shared_seqlock *lock = shared_seq(ptr)
+    cdef uint32_t size = <uint32_t>data.shape[0]
+    if data.shape[0] > lock.capacity:
+        raise ValueError(f'data size {data.shape[0]} exceeds capacity {lock.capacity}')
+    if size == 0:
+        return shared_seqlock_write(lock, NULL, 0)
+    return shared_seqlock_write(lock, <const char *>&data[0], size)
+
+def seqlock_read(uint64_t ptr):
+    """
+    Returns the version and a copy of the data, version 0 means that nothing has been written yet.
+    """
+    cdef shared_seqlock *lock = shared_seq(ptr)
+    cdef vector[char] out
+    cdef uint32_t size = 0
+    cdef uint64_t version
+    out.resize(lock.capacity)
+    with nogil:
+        version = shared_seqlock_read(lock, out.data(), &size)
+    return version, PyBytes_FromStringAndSize(out.data(), size)
@@ -13,14 +13,14 @@ cdef extern from "_ipyeos.hpp":
         uint32_t block_num()
         vector[char] pack()
         size_t transactions_size()
-        vector[char] get_transaction_id(int index)
+        vector[char] get_transaction_id(int index) nogil
         bool is_packed_transaction(int index)
         packed_transaction_proxy *get_packed_transaction(int index)
         string to_json()
 
     ctypedef struct ipyeos_proxy:
         signed_block_proxy *signed_block_proxy_new(signed_block_ptr *_signed_block_ptr)
-        signed_block_proxy *signed_block_proxy_new_ex(const char *raw_signed_block, size_t raw_signed_block_size)
+        signed_block_proxy *signed_block_proxy_new_ex(const char *raw_signed_block, size_t raw_signed_block_size) nogil
         signed_block_proxy *signed_block_proxy_attach(signed_block_ptr *_signed_block_ptr)
         bool signed_block_proxy_free(signed_block_ptr *signed_block_proxy_ptr)
 
@@ -34,9 +34,17 @@ def new(uint64_t signed_block_proxy_ptr):
     return <uint64_t>_proxy.signed_block_proxy_new(<signed_block_ptr *>signed_block_proxy_ptr)
 
 # signed_block_proxy *signed_block_proxy_new_ex(const char *raw_signed_block, size_t raw_signed_block_size)
-def new_ex(raw_signed_block: bytes):
+# raw_signed_block can be any object that supports the buffer protocol, the GIL is released while the block is unpacked
+def new_ex(const unsigned char[::1] raw_signed_block):
     cdef ipyeos_proxy *_proxy = get_ipyeos_proxy()
-    return <uint64_t>_proxy.signed_block_proxy_new_ex(<char *>raw_signed_block, len(raw_signed_block))
+    cdef signed_block_proxy *ret
+    cdef size_t raw_signed_block_size = raw_signed_block.shape[0]
+    if raw_signed_block_size == 0:
+        return 0
+    cdef const char *_raw_signed_block = <const char *>&raw_signed_block[0]
+    with nogil:
+        ret = _proxy.signed_block_proxy_new_ex(_raw_signed_block, raw_signed_block_size)
+    return <uint64_t>ret
 
 def attach(uint64_t signed_block_proxy_ptr):
     cdef ipyeos_proxy *_proxy = get_ipyeos_proxy()
@@ -58,7 +66,10 @@ def transactions_size(uint64_t ptr):
 
 # vector<char> get_transaction_id(int index)
 def get_transaction_id(uint64_t ptr, int index):
-    ret = proxy(ptr).get_transaction_id(index)
+    cdef vector[char] ret
+    cdef signed_block_proxy *_proxy = proxy(ptr)
+    with nogil:
+        ret = _proxy.get_transaction_id(index)
     return PyBytes_FromStringAndSize(<char *>ret.data(), ret.size())
 # bool is_packed_transaction(int index)
 def is_packed_transaction(uint64_t ptr, int index):
@@ -164,14 +164,18 @@ def set_apply_callback(fn):
     global apply_callback
     apply_callback = fn
 
-cdef extern int python_native_apply(uint64_t a, uint64_t b, uint64_t c):
-    try:
-        return apply(a, b, c)
-    except Exception as e:
-        print('++++++apply return exception:', e)
-        import traceback
-        traceback.print_exc()
-        _eosio_assert(0, str(e))
+# called by the chain while it applies a block, push_block and push_raw_block release the GIL
+cdef extern int python_native_apply(uint64_t a, uint64_t b, uint64_t c) noexcept nogil:
+    with gil:
+        try:
+            return apply(a, b, c)
+        except Exception as e:
+            print('++++++apply return exception:', e)
+            import traceback
+            traceback.print_exc()
+            # saves the exception, native_apply rethrows it after the callback returns
+            _eosio_assert(0, str(e))
+    return 0
 
 
 #chain.h
@@ -0,0 +1,146 @@
+"""
+Round trip benchmark of the StructCodec based pack/unpack against the per field Encoder/Decoder calls.
+
+    python3 tests/bench_codec.py [count]
+"""
+import sys
+import time
+
+from ipyeos.bases.packer import Decoder, Encoder
+from ipyeos.bases.structs import TimePoint
+from ipyeos.bases.types import Checksum256, I64, PublicKey, Signature
+from ipyeos.core import database
+from ipyeos.core.database_objects import GeneratedTransactionObject, ResourceUsageObject, UsageAccumulator
+from ipyeos.node.messages import HandshakeMessage
+
+def per_field_pack_handshake(msg: HandshakeMessage, enc: Encoder):
+    enc.pack_u16(msg.network_version)
+    enc.pack(msg.chain_id)
+    enc.pack(msg.node_id)
+    enc.pack(msg.key)
+    enc.pack_i64(msg.time)
+    enc.pack(msg.token)
+    enc.pack(msg.sig)
+    enc.pack_string(msg.p2p_address)
+    enc.pack_u32(msg.last_irreversible_block_num)
+    enc.pack(msg.last_irreversible_block_id)
+    enc.pack_u32(msg.head_num)
+    enc.pack(msg.head_id)
+    enc.pack_string(msg.os)
+    enc.pack_string(msg.agent)
+    enc.pack_i16(msg.generation)
+
+def per_field_unpack_handshake(dec: Decoder):
+    return HandshakeMessage(
+        dec.unpack_u16(),
+        Checksum256.unpack(dec),
+        Checksum256.unpack(dec),
+        PublicKey.unpack(dec),
+        dec.unpack_i64(),
+        Checksum256.unpack(dec),
+        Signature.unpack(dec),
+        dec.unpack_string(),
+        dec.unpack_u32(),
+        Checksum256.unpack(dec),
+        dec.unpack_u32(),
+        Checksum256.unpack(dec),
+        dec.unpack_string(),
+        dec.unpack_string(),
+        dec.unpack_i16(),
+    )
+
+def per_field_pack_generated_transaction(obj: GeneratedTransactionObject, enc: Encoder):
+    enc.pack(obj.trx_id)
+    enc.pack_name(obj.sender)
+    enc.pack_u128(obj.sender_id)
+    enc.pack_name(obj.payer)
+    enc.pack_i64(obj.delay_until.time)
+    enc.pack_i64(obj.expiration.time)
+    enc.pack_i64(obj.published.time)
+    enc.pack_bytes(obj.packed_trx)
+
+def per_field_unpack_generated_transaction(dec: Decoder):
+    return GeneratedTransactionObject(
+        dec.unpack_i64(),
+        dec.unpack_checksum256(),
+        dec.unpack_name(),
+        dec.unpack_u128(),
+        dec.unpack_name(),
+        TimePoint(dec.unpack_i64()),
+        TimePoint(dec.unpack_i64()),
+        TimePoint(dec.unpack_i64()),
+        dec.unpack_bytes(),
+    )
+
+def per_field_pack_usage(usage: UsageAccumulator, enc: Encoder):
+    enc.pack_u32(usage.last_ordinal)
+    enc.pack_u64(usage.value_ex)
+    enc.pack_u64(usage.consumed)
+
+def per_field_unpack_usage(dec: Decoder):
+    return UsageAccumulator(dec.unpack_u32(), dec.unpack_u64(), dec.unpack_u64())
+
+def per_field_pack_resource_usage(obj: ResourceUsageObject, enc: Encoder):
+    enc.pack_name(obj.owner)
+    per_field_pack_usage(obj.net_usage, enc)
+    per_field_pack_usage(obj.cpu_usage, enc)
+    enc.pack_u64(obj.ram_usage)
+
+def per_field_unpack_resource_usage(dec: Decoder):
+    return ResourceUsageObject(
+        dec.unpack_i64(),
+        dec.unpack_name(),
+        per_field_unpack_usage(dec),
+        per_field_unpack_usage(dec),
+        dec.unpack_u64(),
+    )
+
+def new_handshake():
+    return HandshakeMessage(
+        network_version=0x04b5 + 7,
+        chain_id=Checksum256(bytes(range(32))),
+        node_id=Checksum256(bytes(range(1, 33))),
+        key=PublicKey.empty(),
+        time=int(time.time()*1e9),
+        token=Checksum256.empty(),
+        sig=Signature(bytes(66)),
+        p2p_address='127.0.0.1:9876',
+        last_irreversible_block_num=1000,
+        last_irreversible_block_id=Checksum256(bytes(32)),
+        head_num=1100,
+        head_id=Checksum256(bytes(32)),
+        os='linux',
+        agent='ipyeos',
+        generation=1,
+    )
+
+def new_generated_transaction():
+    return GeneratedTransactionObject(1, Checksum256(bytes(32)), 'alice', 1 << 100, 'bob',
+                TimePoint(1), TimePoint(2), TimePoint(3), bytes(200))
+
+def new_resource_usage():
+    return ResourceUsageObject(1, 'alice', UsageAccumulator(1, 2, 3), UsageAccumulator(4, 5, 6), 1024)
+
+def bench(name, count, obj, pack, unpack, prefix: bytes):
+    start = time.monotonic()
+    for _ in range(count):
+        enc = Encoder()
+        pack(obj, enc)
+        unpack(Decoder(prefix + enc.get_bytes()))
+    duration = time.monotonic() - start
+    print(f'{name:>40}: {round(count/duration)} round trips/s')
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    table_id = int.to_bytes(1, 8, 'little')
+    cases = [
+        ('HandshakeMessage', new_handshake(), per_field_pack_handshake, per_field_unpack_handshake, HandshakeMessage, b''),
+        ('GeneratedTransactionObject', new_generated_transaction(), per_field_pack_generated_transaction, per_field_unpack_generated_transaction, GeneratedTransactionObject, table_id),
+        ('ResourceUsageObject', new_resource_usage(), per_field_pack_resource_usage, per_field_unpack_resource_usage, ResourceUsageObject, table_id),
+    ]
+    for name, obj, pack, unpack, cls, prefix in cases:
+        bench(f'{name} per field', count, obj, pack, unpack, prefix)
+        bench(f'{name} StructCodec', count, obj, cls.pack, cls.unpack, prefix)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares the frame rate of the old `readexactly` based message reader with `FrameReader`.
+
+The sync traffic is built from the blocks in tests/data/push_block/blocks, every block is sent as
+a signed_block message.
+
+    python3 tests/bench_frame_reader.py [repeat]
+"""
+import asyncio
+import os
+import sys
+import time
+
+from ipyeos.node.frame_reader import FrameReader
+from ipyeos.node.messages import signed_block_message
+
+dir_name = os.path.dirname(__file__)
+max_package_size = 5*1024*1024
+
+def load_raw_blocks():
+    blocks_dir = os.path.join(dir_name, 'data/push_block/blocks')
+    with open(os.path.join(blocks_dir, 'blocks.log'), 'rb') as f:
+        log_data = f.read()
+    with open(os.path.join(blocks_dir, 'blocks.index'), 'rb') as f:
+        index_data = f.read()
+    positions = [int.from_bytes(index_data[i:i+8], 'little') for i in range(0, len(index_data), 8)]
+    # every block is followed by its 8 bytes position
+    ends = positions[1:] + [len(log_data)]
+    return [log_data[start:end-8] for start, end in zip(positions, ends)]
+
+def build_traffic(raw_blocks, repeat: int):
+    frames = []
+    for raw_block in raw_blocks:
+        frames.append(int.to_bytes(len(raw_block) + 1, 4, 'little'))
+        frames.append(bytes([signed_block_message]))
+        frames.append(raw_block)
+    return b''.join(frames) * repeat
+
+def new_reader(traffic: bytes):
+    reader = asyncio.StreamReader(limit=100*1024*1024)
+    # feed in socket sized pieces
+    for i in range(0, len(traffic), 64*1024):
+        reader.feed_data(traffic[i:i+64*1024])
+    reader.feed_eof()
+    return reader
+
+async def read_readexactly(reader: asyncio.StreamReader):
+    count = 0
+    while True:
+        try:
+            msg_len = await reader.readexactly(4)
+        except asyncio.IncompleteReadError:
+            return count
+        msg_len = int.from_bytes(msg_len, 'little')
+        await reader.readexactly(1)
+        await reader.readexactly(msg_len-1)
+        count += 1
+
+async def read_frame_reader(reader: asyncio.StreamReader):
+    frame_reader = FrameReader(reader, max_package_size)
+    count = 0
+    while True:
+        try:
+            await frame_reader.read_frame()
+        except asyncio.IncompleteReadError:
+            return count
+        count += 1
+
+async def bench(name, fn, traffic):
+    reader = new_reader(traffic)
+    start = time.monotonic()
+    count = await fn(reader)
+    duration = time.monotonic() - start
+    print(f'{name:>12}: {count} frames, {round(count/duration)} frames/s, {round(len(traffic)/duration/1024/1024, 1)} MB/s')
+
+async def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    raw_blocks = load_raw_blocks()
+    traffic = build_traffic(raw_blocks, repeat)
+    await bench('readexactly', read_readexactly, traffic)
+    await bench('FrameReader', read_frame_reader, traffic)
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Per request overhead of the rate limiting step of `rate_limit_middleware`: the old aiocache based
+request counter against `TokenBucketLimiter`. aiocache is no longer a dependency, the baseline
+is skipped if it is not installed.
+
+    python3 tests/bench_rate_limit.py [requests] [clients]
+"""
+import asyncio
+import sys
+import time
+
+from ipyeos.bases import rate_limit
+
+try:
+    from aiocache import Cache
+    from aiocache.serializers import PickleSerializer
+    cache = Cache(Cache.MEMORY, serializer=PickleSerializer())
+except ImportError:
+    cache = None
+
+async def aiocache_check(client_ip: str) -> bool:
+    current_time = time.time()
+    client_data = await cache.get(client_ip)
+    if client_data is None:
+        client_data = {
+            'request_count': 1,
+            'start_time': current_time,
+            'block_until': 0
+        }
+    else:
+        if current_time < client_data['block_until']:
+            return False
+        elif current_time - client_data['start_time'] < 60:
+            client_data['request_count'] += 1
+            if client_data['request_count'] > rate_limit.REQUESTS_PER_MINUTE:
+                client_data['block_until'] = current_time + rate_limit.BLOCK_INTERVAL
+                return False
+        else:
+            client_data['request_count'] = 1
+            client_data['start_time'] = current_time
+    await cache.set(client_ip, client_data)
+    return True
+
+async def token_bucket_check(client_ip: str) -> bool:
+    return rate_limit.limiter.acquire(rate_limit.client_key(client_ip))
+
+def new_clients(count: int):
+    return [f'10.{(i >> 16) & 0xff}.{(i >> 8) & 0xff}.{i & 0xff}' for i in range(count)]
+
+async def bench(name, check, requests: int, clients):
+    allowed = 0
+    start = time.monotonic()
+    for i in range(requests):
+        if await check(clients[i % len(clients)]):
+            allowed += 1
+    duration = time.monotonic() - start
+    print(f'{name:>12}: {round(duration/requests*1e6, 2)} us/request, {allowed} of {requests} allowed')
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    clients = new_clients(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+    if cache:
+        await bench('aiocache', aiocache_check, requests, clients)
+    await bench('token bucket', token_bucket_check, requests, clients)
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+import pytest
+import struct
+
+from ipyeos.core import abi as abi_module
+from ipyeos.core.abi import AbiCache, CompiledAbi, pack_abi, unpack_abi
+
+token_abi = {
+    'version': 'eosio::abi/1.2',
+    'types': [{'new_type_name': 'account_name', 'type': 'name'}],
+    'structs': [
+        {'name': 'transfer', 'base': '', 'fields': [
+            {'name': 'from', 'type': 'account_name'},
+            {'name': 'to', 'type': 'name'},
+            {'name': 'quantity', 'type': 'asset'},
+            {'name': 'memo', 'type': 'string'},
+        ]},
+        {'name': 'account', 'base': '', 'fields': [{'name': 'balance', 'type': 'asset'}]},
+        {'name': 'stats', 'base': 'account', 'fields': [
+            {'name': 'ids', 'type': 'uint64[]'},
+            {'name': 'owner', 'type': 'name?'},
+            {'name': 'value', 'type': 'value_type'},
+            {'name': 'created', 'type': 'time_point_sec'},
+            {'name': 'extended', 'type': 'extended_asset'},
+            {'name': 'note', 'type': 'string$'},
+        ]},
+    ],
+    'actions': [{'name': 'transfer', 'type': 'transfer', 'ricardian_contract': ''}],
+    'tables': [{'name': 'stat', 'index_type': 'i64', 'key_names': [], 'key_types': [], 'type': 'stats'}],
+    'ricardian_clauses': [],
+    'error_messages': [],
+    'abi_extensions': [],
+    'variants': [{'name': 'value_type', 'types': ['uint32', 'string']}],
+    'action_results': [],
+}
+
+def test_compiled_abi():
+    abi = CompiledAbi(token_abi)
+    args = {'from': 'alice', 'to': 'bob', 'quantity': '-1.0050 EOS', 'memo': 'hello'}
+    raw = abi.encode_action('transfer', args)
+    assert raw[16:32] == struct.pack('<qQ', -10050, 4 | int.from_bytes(b'EOS', 'little') << 8)
+    assert abi.decode_action('transfer', raw) == args
+
+    row = {
+        'balance': '10 CNT',
+        'ids': [1, 2, 3],
+        'owner': None,
+        'value': ['string', 'abc'],
+        'created': '2023-01-02T03:04:05',
+        'extended': {'quantity': '0.01 EOS', 'contract': 'eosio.token'},
+        'note': 'x',
+    }
+    raw = abi.encode_table_row('stat', row)
+    assert abi.decode_table_row('stat', raw) == row
+
+    # binary extension missing in old rows
+    del row['note']
+    raw = abi.encode_table_row('stat', row)
+    assert abi.decode_table_row('stat', raw) == row
+
+    # fields of a derived struct after a missing binary extension of its base
+    derived_abi = dict(token_abi, structs=token_abi['structs'] + [
+        {'name': 'extstats', 'base': 'stats', 'fields': [{'name': 'extra', 'type': 'uint32$'}]},
+        {'name': 'badstats', 'base': 'stats', 'fields': [{'name': 'extra', 'type': 'uint32'}]},
+    ])
+    abi = CompiledAbi(derived_abi)
+    assert abi.decode('extstats', abi.encode('extstats', row)) == row
+    with pytest.raises(ValueError):
+        abi.encode('extstats', dict(row, extra=1))
+    with pytest.raises(ValueError):
+        abi.encode('badstats', dict(row, extra=1))
+    row['note'] = 'x'
+    assert abi.decode('extstats', abi.encode('extstats', dict(row, extra=1))) == dict(row, extra=1)
+    assert abi.decode('badstats', abi.encode('badstats', dict(row, extra=1))) == dict(row, extra=1)
+
+def test_binary_abi():
+    raw = pack_abi(token_abi)
+    assert unpack_abi(raw) == token_abi
+    # an old ABI without variants and action results
+    old_abi = dict(token_abi)
+    del old_abi['variants']
+    del old_abi['action_results']
+    assert unpack_abi(pack_abi(old_abi)) == old_abi
+
+def test_abi_cache(monkeypatch):
+    class Metadata(object):
+        abi_sequence = 1
+
+    class Account(object):
+        abi = pack_abi(token_abi)
+
+    class FakeMetadataIndex(object):
+        def __init__(self, db):
+            pass
+        def find_by_name(self, name):
+            return Metadata() if name == 'eosio.token' else None
+
+    class FakeAccountIndex(object):
+        def __init__(self, db):
+            pass
+        def find_by_name(self, name):
+            return Account()
+
+    monkeypatch.setattr(abi_module, 'AccountMetadataObjectIndex', FakeMetadataIndex)
+    monkeypatch.setattr(abi_module, 'AccountObjectIndex', FakeAccountIndex)
+
+    cache = AbiCache(None)
+    assert cache.get('unknown') is None
+    args = {'from': 'alice', 'to': 'bob', 'quantity': '1.0000 EOS', 'memo': ''}
+    raw = cache.encode_action('eosio.token', 'transfer', args)
+    assert cache.decode_action('eosio.token', 'transfer', raw) == args
+    assert cache.compiled == 1
+
+    # setabi increments abi_sequence
+    Metadata.abi_sequence = 2
+    abi = cache.get('eosio.token')
+    assert cache.compiled == 2
+    assert cache.get('eosio.token') is abi
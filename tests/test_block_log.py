@@ -153,3 +153,80 @@ def test_push_block():
     assert raw == SignedBlock.unpack(raw).pack()
 
 
+
+def test_raw_block_log():
+    from ipyeos.core.block_log import RawBlockLog
+    from ipyeos.core.blocks import BlockHeader
+
+    blog = BlockLog('./data/push_block/blocks')
+    raw_log = RawBlockLog('./data/push_block/blocks')
+    assert raw_log.first_block_num == blog.first_block_num()
+    assert raw_log.head_block_num() == blog.head_block_num()
+    for block_num in range(blog.first_block_num(), blog.head_block_num()+1):
+        raw_block = blog.read_raw_block_by_num(block_num)
+        assert raw_block == blog.read_block_by_num(block_num).pack()
+        assert BlockHeader.unpack_bytes(raw_block).block_num() == block_num
+    assert raw_log.read_block(blog.head_block_num() + 1) is None
+
+def test_raw_block_log_remap(tmp_path):
+    from ipyeos.core.block_log import RawBlockLog
+
+    log_data = bytearray(int.to_bytes(4, 4, 'little') + int.to_bytes(10, 4, 'little'))
+    index_data = bytearray()
+    def append_block(body, compression=0):
+        pos = len(log_data)
+        log_data.extend(int.to_bytes(len(body) + 13, 4, 'little') + bytes([compression]) + body + int.to_bytes(pos, 8, 'little'))
+        index_data.extend(int.to_bytes(pos, 8, 'little'))
+        (tmp_path / 'blocks.log').write_bytes(log_data)
+        (tmp_path / 'blocks.index').write_bytes(index_data)
+
+    append_block(b'block 10')
+    append_block(b'block 11', 1)
+    raw_log = RawBlockLog(str(tmp_path))
+    assert raw_log.head_block_num() == 11
+    assert raw_log.read_block(10) == b'block 10'
+    # compressed blocks are left to the chain
+    assert raw_log.read_block(11) is None
+    assert raw_log.read_block(12) is None
+
+    mapping = raw_log.mapping
+    assert not raw_log.remap()
+    assert raw_log.mapping is mapping
+
+    append_block(b'block 12')
+    assert raw_log.read_block(12) == b'block 12'
+    assert raw_log.head_block_num() == 12
+    assert list(raw_log.iter_blocks(10, 12)) == [b'block 10']
+
+def test_block_log_iter_range():
+    blog = BlockLog('./data/push_block/blocks')
+    first_block_num = blog.first_block_num()
+    head_block_num = blog.head_block_num()
+
+    raw_blocks = list(blog.iter_range(first_block_num, head_block_num))
+    assert len(raw_blocks) == head_block_num - first_block_num + 1
+    assert raw_blocks[0] == blog.read_block_by_num(first_block_num).pack()
+
+    blocks = list(blog.iter_range(first_block_num, head_block_num + 100, raw=False, stride=10))
+    assert [block.block_num() for block in blocks] == list(range(first_block_num, head_block_num + 1, 10))
+
+def test_replay_block_log():
+    if os.path.exists('./data/ddd'):
+        shutil.rmtree('./data/ddd')
+
+    state_size = 10*1024*1024
+    data_name = './data'
+
+    snapshot_file = './data/push_block/snapshot-0000003b83662343c208e965654f4d906ed7fad0372e13c246981cd076d379bb.bin'
+    t = ChainTester(True, data_dir=os.path.join(data_name, 'ddd'), config_dir=os.path.join(data_name, 'cd'), state_size=state_size, snapshot_file=snapshot_file)
+    t.free()
+
+    t = ChainTester(True, data_dir=os.path.join(data_name, 'ddd'), config_dir=os.path.join(data_name, 'cd'), state_size=state_size)
+    t.chain.abort_block()
+
+    head_block_num = t.api.get_info()['head_block_num']
+    blog = BlockLog('./data/push_block/blocks')
+    applied = t.chain.replay_block_log(blog, head_block_num+1, blog.head_block_num(), workers=2, read_ahead=8)
+    assert applied == blog.head_block_num() - head_block_num
+    assert t.api.get_info()['head_block_num'] == blog.head_block_num()
+    t.free()
@@ -1678,6 +1678,102 @@ def test_resource_usage_object(tester: ChainTester):
     logger.info(obj2)
     assert obj == obj2
 
+@chain_test(True)
+def test_resource_usage_scan_columns(tester: ChainTester):
+    pytest.importorskip('numpy')
+    tester.produce_block()
+    idx = ResourceUsageObjectIndex(tester.db)
+
+    objs = []
+    def on_obj(obj, user_data):
+        objs.append(obj)
+        return 1
+    idx.walk_by_id(on_obj)
+
+    columns = idx.scan_columns(['table_id', 'owner', 'cpu_usage.value_ex', 'ram_usage'])
+    assert len(columns['owner']) == len(objs) == idx.row_count()
+    assert [eos.n2s(int(owner)) for owner in columns['owner']] == [obj.owner for obj in objs]
+    assert columns['cpu_usage.value_ex'].tolist() == [obj.cpu_usage.value_ex for obj in objs]
+    assert columns['ram_usage'].tolist() == [obj.ram_usage for obj in objs]
+
+    columns = idx.scan_columns(['table_id'], 1, 2)
+    assert columns['table_id'].tolist() == [1, 2]
+
+    with pytest.raises(ValueError):
+        idx.scan_columns(['cpu_usage'])
+
+    kv_idx = KeyValueObjectIndex(tester.db)
+    columns = kv_idx.scan_columns(['t_id', 'primary_key', 'payer'])
+    assert len(columns['primary_key']) == kv_idx.row_count()
+
+@chain_test(True)
+def test_lazy_object_views(tester: ChainTester):
+    tester.produce_block()
+    for index_class in [AccountObjectIndex, PermissionObjectIndex, ResourceUsageObjectIndex, CodeObjectIndex]:
+        objs = []
+        views = []
+        index_class(tester.db).walk_by_id(lambda obj, _: objs.append(obj) or 1)
+        index_class(tester.db, lazy=True).walk_by_id(lambda view, _: views.append(view) or 1)
+        assert len(objs) == len(views) > 0
+        for obj, view in zip(objs, views):
+            assert view.table_id == obj.table_id
+            assert view.to_object() == obj
+            assert view == obj
+
+    idx = AccountObjectIndex(tester.db, lazy=True)
+    account = idx.find_by_name('eosio')
+    assert account.name == 'eosio'
+    assert account.abi == AccountObjectIndex(tester.db).find_by_name('eosio').abi
+
+    idx = PermissionObjectIndex(tester.db, lazy=True)
+    perm = idx.find_by_owner('eosio', 'active')
+    assert perm.owner == 'eosio' and perm.name == 'active'
+    assert perm.auth.threshold == 1
+    # a view is packed as the object it views
+    assert idx.modify(perm)
+
+@chain_test(True)
+def test_iter_index(tester: ChainTester):
+    tester.produce_block()
+    idx = AccountObjectIndex(tester.db)
+    accounts = []
+    idx.walk_range_by_name('', 'zzzzzzzzzzzzj', lambda obj, _: accounts.append(obj.name) or 1)
+    assert len(accounts) > 3
+
+    names = [obj.name for obj in idx.iter_by_name('', 'zzzzzzzzzzzzj', batch_size=2)]
+    assert names == accounts
+    names = [obj.name for obj in idx.iter_by_name('', 'zzzzzzzzzzzzj', reverse=True, batch_size=2)]
+    assert names == accounts[::-1]
+
+    it = PermissionObjectIndex(tester.db, lazy=True).iter_by_owner(('eosio', ''), ('eosio', 'zzzzzzzzzzzzj'), batch_size=1)
+    assert [perm.name for perm in it] == ['active', 'owner']
+
+    raw = list(idx.iter_by_id(0, 1000, raw_data=True))
+    assert len(raw) == len(accounts)
+    with pytest.raises(ValueError):
+        next(idx.iter_by_id(0, 1000, batch_size=0))
+
+@chain_test(True)
+def test_count_range(tester: ChainTester):
+    tester.produce_block()
+    idx = AccountObjectIndex(tester.db)
+    assert idx.count_range_by_id(0, 0xffffffffffffffff >> 1) == idx.row_count()
+    accounts = []
+    idx.walk_range_by_name('eosio', 'eosio.zzzzzzzz', lambda obj, _: accounts.append(obj) or 1)
+    assert idx.count_range_by_name('eosio', 'eosio.zzzzzzzz') == len(accounts)
+
+    perm_idx = PermissionObjectIndex(tester.db)
+    assert perm_idx.count_range_by_owner(('eosio', ''), ('eosio', 'zzzzzzzzzzzzj')) == 2
+
+    table_idx = TableIdObjectIndex(tester.db)
+    kv_idx = KeyValueObjectIndex(tester.db)
+    tables = []
+    table_idx.walk_by_id(lambda obj, _: tables.append(obj) or 1)
+    for table in tables:
+        count, packed_size = kv_idx.stats_by_table(table.table_id)
+        assert count == table.count
+        assert packed_size > 0 or count == 0
+
 #    class resource_limits_state_object : public chainbase::object<resource_limits_state_object_type, resource_limits_state_object> {
 #       OBJECT_CTOR(resource_limits_state_object);
 #       id_type id;
@@ -1,3 +1,4 @@
+import contextlib
 import os
 import asyncio
 import secrets
@@ -7,6 +8,8 @@ import pickle
 import yaml
 import pytest
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from ipyeos import eos
 from ipyeos.node import net
@@ -26,6 +29,7 @@ from ipyeos.node.net import Network
 from ipyeos.bases.packer import Encoder, Decoder
 from ipyeos.bases import utils
 from ipyeos.core.blocks import BlockHeader
+from ipyeos.core.chain_exceptions import UnlinkableBlockException
 from ipyeos.bases.structs import Symbol, Asset, Transfer
 from ipyeos.extensions.trace_api import TraceAPI
 from ipyeos.core.database import TableIdObjectIndex, KeyValueObjectIndex
@@ -360,3 +364,328 @@ async def test_some_function(mock_open_connection):
     reader, writer = await asyncio.open_connection('host', 'port')
     # Use the reader and writer here as you would in your application
     # writer.write.assert_called_once()  # Example assertion
+
+def make_raw_block_header(block_num):
+    enc = Encoder()
+    enc.pack_u32(block_num)
+    enc.write_bytes(bytes(8))
+    enc.pack_u16(0)
+    enc.write_bytes((block_num - 1).to_bytes(4, 'big') + bytes(28))
+    enc.write_bytes(bytes(32))
+    enc.write_bytes(bytes(32))
+    enc.pack_u32(0)
+    enc.pack_u8(0)
+    enc.pack_length(0)
+    return enc.get_bytes()
+
+class FakeChain(object):
+    def __init__(self, head_block_num):
+        self.head = head_block_num
+
+    def head_block_num(self):
+        return self.head
+
+class FakeConnection(object):
+    def __init__(self, chain, peer, lib):
+        self.chain = chain
+        self.peer = peer
+        self.connected = True
+        self.closed = False
+        self.last_handshake = MagicMock(last_irreversible_block_num=lib)
+        self.sync_requests = []
+        self.reset_requests = 0
+        self.unlinkable_blocks = set()
+
+    async def send_sync_request_message(self, start_block, end_block):
+        self.sync_requests.append((start_block, end_block))
+        return True
+
+    async def send_reset_sync_request_message(self):
+        self.reset_requests += 1
+        return True
+
+    def push_block(self, raw_block, return_statistics=False):
+        header = BlockHeader.unpack_bytes(raw_block)
+        if header.block_num() in self.unlinkable_blocks:
+            raise UnlinkableBlockException('{"stack": [{"format": "unlinkable block"}]}')
+        assert header.block_num() == self.chain.head + 1
+        self.chain.head += 1
+
+    def calculate_block_sync_info(self, header, block_size):
+        pass
+
+@pytest.mark.asyncio
+async def test_sync_scheduler():
+    from ipyeos.node.sync_scheduler import SyncScheduler
+    chain = FakeChain(100)
+    scheduler = SyncScheduler(chain)
+    scheduler.sync_fetch_span = 10
+    conn1 = FakeConnection(chain, 'peer1', 130)
+    conn2 = FakeConnection(chain, 'peer2', 130)
+    assert scheduler.needs_sync([conn1, conn2])
+    chain.head = 120
+    # caught up to within one chunk
+    assert not scheduler.needs_sync([conn1, conn2])
+    conn1.last_handshake = conn2.last_handshake = None
+    assert scheduler.needs_sync([conn1, conn2])
+    conn1.last_handshake = conn2.last_handshake = MagicMock(last_irreversible_block_num=130)
+    chain.head = 100
+    scheduler.connections = [conn1, conn2]
+    scheduler.reset()
+    scheduler.applier.start()
+
+    async def wait_for_head(head):
+        for _ in range(100):
+            if chain.head >= head and not scheduler.queued_blocks:
+                return
+            await asyncio.sleep(0.01)
+
+    await scheduler.schedule()
+    assert conn1.sync_requests == [(101, 110)]
+    assert conn2.sync_requests == [(111, 120)]
+
+    # blocks from the second peer are buffered until the first chunk arrives
+    for num in range(111, 121):
+        raw = make_raw_block_header(num)
+        await scheduler.on_signed_block_message(conn2, BlockHeader.unpack_bytes(raw), raw)
+    await wait_for_head(100)
+    assert chain.head == 100
+    assert conn2 not in scheduler.assignments
+
+    for num in range(101, 111):
+        raw = make_raw_block_header(num)
+        await scheduler.on_signed_block_message(conn1, BlockHeader.unpack_bytes(raw), raw)
+    await wait_for_head(120)
+    assert chain.head == 120
+
+    # a stalled peer loses its chunk to an idle peer
+    await scheduler.schedule()
+    assert conn1.sync_requests[-1] == (121, 130)
+    scheduler.assignments[conn1].last_progress_time -= scheduler.sync_stall_timeout + 1
+    await scheduler.check_stalled_chunks()
+    assert conn1 not in scheduler.assignments
+    await scheduler.schedule()
+    assert conn2.sync_requests[-1] == (121, 130)
+    # an unlinkable block restarts the sync from the head, the peer stops sending its chunk
+    conn2.unlinkable_blocks.add(125)
+    reset_requests = conn2.reset_requests
+    for num in range(121, 131):
+        raw = make_raw_block_header(num)
+        await scheduler.on_signed_block_message(conn2, BlockHeader.unpack_bytes(raw), raw)
+    await wait_for_head(124)
+    await asyncio.sleep(0.05)
+    assert chain.head == 124
+    assert scheduler.next_block == 125
+    assert conn2.reset_requests == reset_requests + 1
+    assert not scheduler.is_finished()
+
+    conn2.unlinkable_blocks.clear()
+    # conn1 lost its chunk to the stall above
+    del scheduler.penalties[conn1]
+    await scheduler.schedule()
+    assert conn1.sync_requests[-1] == (125, 130)
+    for num in range(125, 131):
+        raw = make_raw_block_header(num)
+        await scheduler.on_signed_block_message(conn1, BlockHeader.unpack_bytes(raw), raw)
+    await scheduler.applier.stop()
+    assert chain.head == 130
+    assert scheduler.is_finished()
+
+@pytest.mark.asyncio
+async def test_block_applier():
+    from ipyeos.node.block_applier import BlockApplier
+
+    class FakeApplyConnection(object):
+        peer = 'peer'
+        def __init__(self):
+            self.applied = []
+            self.results = []
+
+        def apply_block(self, header, raw_block):
+            time.sleep(0.01)
+            self.applied.append(header)
+            if header == 5:
+                raise Exception('invalid block')
+            return True
+
+        async def on_block_applied(self, header, raw_block, result):
+            self.results.append((header, result))
+
+    conn = FakeApplyConnection()
+    applier = BlockApplier(conn, 3)
+    applier.start()
+    # more blocks than slots, put returns only after applied blocks free their slots
+    for i in range(10):
+        await asyncio.wait_for(applier.put(i, b''), 1.0)
+    await applier.stop()
+    # blocks queued after the failed block are discarded
+    assert conn.applied[:6] == [0, 1, 2, 3, 4, 5]
+    assert 6 not in conn.applied
+    # the results are handled in order and all of them before stop returns
+    assert [header for header, _ in conn.results] == conn.applied
+    assert isinstance(conn.results[5][1], Exception)
+    assert applier.pending_blocks() == 0
+
+def test_locked_chain():
+    from ipyeos.node.locked_chain import LockedChain
+
+    class FakeLock(object):
+        def __init__(self):
+            self.calls = []
+
+        @contextlib.contextmanager
+        def rlock(self):
+            self.calls.append('r')
+            yield
+
+        @contextlib.contextmanager
+        def wlock(self):
+            self.calls.append('w')
+            yield
+
+    class FakeChain(object):
+        def head_block_num(self):
+            return 10
+
+    rwlock = FakeLock()
+    chain = LockedChain(FakeChain(), rwlock)
+    assert chain.head_block_num() == 10
+    with chain.write_lock():
+        # not locked again by the thread that holds the write lock
+        with chain.write_lock():
+            assert chain.head_block_num() == 10
+    assert chain.head_block_num() == 10
+    assert rwlock.calls == ['r', 'w', 'r']
+    assert LockedChain(FakeChain()).head_block_num() == 10
+
+def test_process_lock():
+    from ipyeos.node.locked_chain import ProcessReadWriteLock
+
+    lock = ProcessReadWriteLock()
+    events = []
+    reading = threading.Barrier(2)
+    def read(i):
+        with lock.read():
+            # both readers hold the lock at the same time
+            reading.wait(timeout=5)
+            events.append(f'r{i}')
+    readers = [threading.Thread(target=read, args=(i,)) for i in range(2)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+
+    with lock.read():
+        def write():
+            with lock.write():
+                events.append('w')
+        writer = threading.Thread(target=write)
+        writer.start()
+        time.sleep(0.1)
+        assert 'w' not in events
+    writer.join()
+    assert sorted(events[:2]) == ['r0', 'r1'] and events[2] == 'w'
+
+@pytest.mark.asyncio
+async def test_frame_reader():
+    from ipyeos.node.frame_reader import FrameReader
+
+    frames = []
+    for i, size in enumerate([1, 10, 100, 1000]):
+        body = bytes([i]) * size
+        frames.append(int.to_bytes(len(body) + 1, 4, 'little') + bytes([7]) + body)
+    data = b''.join(frames)
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    # small read size so that frames span several chunks
+    frame_reader = FrameReader(reader, 5*1024*1024, 64)
+    bodies = []
+    for i in range(4):
+        tp, body = await frame_reader.read_frame()
+        assert tp == 7
+        bodies.append(frame_reader.detach(body))
+    assert [bytes(body) for body in bodies] == [bytes([i]) * size for i, size in enumerate([1, 10, 100, 1000])]
+
+    with pytest.raises(asyncio.IncompleteReadError):
+        await frame_reader.read_frame()
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(int.to_bytes(1, 4, 'little') + b'\x07')
+    frame_reader = FrameReader(reader, 5*1024*1024)
+    with pytest.raises(ValueError):
+        await frame_reader.read_frame()
+
+@pytest.mark.asyncio
+async def test_stop_reading():
+    from ipyeos.node.frame_reader import FrameReader
+
+    reader = asyncio.StreamReader()
+    conn = Connection(FakeChain(0), peer='peer')
+    conn.frame_reader = FrameReader(reader, 5*1024*1024)
+    conn.stop_reading_event = asyncio.Event()
+
+    task = asyncio.create_task(conn.wait_for_message())
+    await asyncio.sleep(0.01)
+    conn.stop_reading()
+    assert not await task
+
+    # the next message loop gets the message the pending read receives
+    conn.stop_reading_event = asyncio.Event()
+    body = b'hello'
+    reader.feed_data(int.to_bytes(len(body) + 1, 4, 'little') + bytes([7]) + body)
+    assert await conn.wait_for_message()
+    tp, raw_msg = await conn.read_message()
+    assert tp == 7
+    assert bytes(raw_msg) == body
+
+@pytest.mark.asyncio
+async def test_block_server():
+    from ipyeos.node.block_server import BlockServer
+
+    class FakeBlockLog(object):
+        def read_block(self, num):
+            # blocks after 30 are not in the block log yet
+            if num > 30:
+                return None
+            return make_raw_block_header(num)
+
+    class FakeServeChain(object):
+        def get_raw_block_log(self):
+            return FakeBlockLog()
+
+        def last_irreversible_block_num(self):
+            return 50
+
+        def fetch_raw_block_by_number(self, num):
+            if num > 60:
+                raise Exception(f"block_num {num} not found")
+            return make_raw_block_header(num)
+
+    class FakeWriter(object):
+        def __init__(self):
+            self.frames = []
+            self.drains = 0
+
+        def writelines(self, frames):
+            self.frames.extend(frames)
+
+        async def drain(self):
+            self.drains += 1
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    writer = FakeWriter()
+    server = BlockServer(FakeServeChain(), writer, read_ahead=8, batch_size=4, executor=executor)
+    assert await server.serve(1, 40)
+    assert server.sent_blocks == 40
+    assert writer.drains == 10
+    nums = [BlockHeader.unpack_bytes(frame[5:]).block_num() for frame in writer.frames]
+    assert nums == list(range(1, 41))
+
+    # the executor is reused by the next request
+    writer = FakeWriter()
+    server = BlockServer(FakeServeChain(), writer, read_ahead=8, batch_size=4, executor=executor)
+    assert not await server.serve(41, 70)
+    assert server.sent_blocks == 20
+    executor.shutdown()
@@ -1,5 +1,6 @@
 import asyncio
 import pytest
+import time
 from ipyeos.bases import rate_limit
 
 def int_to_ip(n):
@@ -59,3 +60,69 @@ async def test_scheduler():
     assert '100' == await scheduler._process_task()
     assert '100' == await task.wait()
 
+
+@pytest.mark.asyncio
+async def test_concurrent_scheduler():
+    async def test_task(delay, return_value):
+        await asyncio.sleep(delay)
+        return return_value
+
+    async def run(max_concurrent_tasks):
+        scheduler = rate_limit.WeightedFairScheduler(max_concurrent_tasks=max_concurrent_tasks)
+        process_task = asyncio.create_task(scheduler.process_task())
+        start = time.monotonic()
+        tasks = [scheduler.add_task(int_to_ip(i % 2 + 1), f'https://{i}', test_task(0.2, i)) for i in range(4)]
+        assert [await task.wait() for task in tasks] == [0, 1, 2, 3]
+        duration = time.monotonic() - start
+        process_task.cancel()
+        await asyncio.gather(process_task, return_exceptions=True)
+        return duration
+
+    assert await run(1) >= 0.8
+    assert await run(4) < 0.4
+
+def test_scheduler_in_new_loop():
+    scheduler = rate_limit.WeightedFairScheduler()
+
+    async def test_task(return_value):
+        return return_value
+
+    async def run(return_value):
+        process_task = asyncio.create_task(scheduler.process_task())
+        task = scheduler.add_task('127.0.0.1', 'https://127.0.0.1/v1/chain/get_info', test_task(return_value))
+        ret = await asyncio.wait_for(task.wait(), 1.0)
+        process_task.cancel()
+        await asyncio.gather(process_task, return_exceptions=True)
+        return ret
+
+    assert asyncio.run(run(1)) == 1
+    # the state left by the first loop is dropped, the event is created in the new loop
+    scheduler.running = 3
+    scheduler.running_tasks.add(object())
+    assert asyncio.run(run(2)) == 2
+    assert scheduler.running == 0
+    assert not scheduler.running_tasks
+
+def test_token_bucket():
+    limiter = rate_limit.TokenBucketLimiter(requests_per_minute=60, block_interval=10)
+    client = rate_limit.client_key('127.0.0.1')
+    assert client == 0x7f000001
+    assert rate_limit.client_key('::1') == 1
+
+    # burst
+    for _ in range(60):
+        assert limiter.acquire(client, 100.0)
+    assert not limiter.acquire(client, 100.0)
+    # blocked even after the bucket is refilled
+    assert not limiter.acquire(client, 105.0)
+    # one token per second after the block
+    assert limiter.acquire(client, 110.0)
+    assert limiter.acquire(client, 111.0)
+
+    other = rate_limit.client_key('127.0.0.2')
+    assert limiter.acquire(other, 111.0)
+    assert limiter.sweep(111.0) == 0
+    assert limiter.sweep(150.0) == 1
+    assert list(limiter.buckets) == [client]
+    assert limiter.sweep(300.0) == 1
+    assert not limiter.buckets
@@ -1,6 +1,8 @@
 import time
 import multiprocessing as mp
-from ipyeos.bases.read_write_lock import ReadWriteLock
+from multiprocessing import shared_memory
+from ipyeos.bases.read_write_lock import ReadWriteLock, SharedReadWriteLock
+from ipyeos.bases.shared_snapshot import SharedSnapshot
 
 
 def read_lock_worker(proc_id):
@@ -38,3 +40,84 @@ def test_rw_lock():
 
     p1.join()
     p2.join()
+
+def shared_writer_worker(lock, name, count):
+    shm = shared_memory.SharedMemory(name)
+    for _ in range(count):
+        with lock.wlock():
+            value = int.from_bytes(shm.buf[0:8], 'little') + 1
+            shm.buf[0:8] = value.to_bytes(8, 'little')
+            shm.buf[8:16] = value.to_bytes(8, 'little')
+    shm.close()
+
+def shared_reader_worker(lock, name, count, results):
+    shm = shared_memory.SharedMemory(name)
+    torn_reads = 0
+    for _ in range(count):
+        with lock.rlock():
+            if bytes(shm.buf[0:8]) != bytes(shm.buf[8:16]):
+                torn_reads += 1
+    shm.close()
+    results.put(torn_reads)
+
+def test_shared_rw_lock():
+    lock = SharedReadWriteLock()
+    with lock.rlock():
+        with lock.rlock():
+            assert lock.get_statistics()['readers'] == 2
+    with lock.wlock():
+        assert lock.get_statistics()['writer']
+
+    shm = shared_memory.SharedMemory(create=True, size=16)
+    shm.buf[0:16] = bytes(16)
+    results = mp.Queue()
+    processes = [mp.Process(target=shared_writer_worker, args=(lock, shm.name, 10000)) for _ in range(2)]
+    processes += [mp.Process(target=shared_reader_worker, args=(lock, shm.name, 10000, results)) for _ in range(2)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+    assert int.from_bytes(shm.buf[0:8], 'little') == 20000
+    assert [results.get(), results.get()] == [0, 0]
+    statistics = lock.get_statistics()
+    assert statistics['read_acquires'] == 20002
+    assert statistics['write_acquires'] == 20001
+    assert statistics['readers'] == 0 and not statistics['writer'] and statistics['writers_waiting'] == 0
+
+    shm.close()
+    shm.unlink()
+    lock.free()
+
+def snapshot_reader_worker(snapshot, results):
+    torn_reads = 0
+    last_version = 0
+    while last_version < 10000:
+        version, data = snapshot.read()
+        assert version >= last_version
+        last_version = version
+        if data and data != data[:1] * len(data):
+            torn_reads += 1
+    results.put(torn_reads)
+
+def test_shared_snapshot():
+    snapshot = SharedSnapshot(capacity=1024)
+    assert snapshot.read() == (0, b'')
+    assert snapshot.capacity == 1024
+    try:
+        snapshot.publish(b'x' * 1025)
+        assert False, 'should not reach here'
+    except ValueError:
+        pass
+
+    results = mp.Queue()
+    processes = [mp.Process(target=snapshot_reader_worker, args=(snapshot, results)) for _ in range(2)]
+    for p in processes:
+        p.start()
+    for i in range(1, 10001):
+        assert snapshot.publish(bytes([i % 256]) * (i % 1024)) == i
+    for p in processes:
+        p.join()
+    assert [results.get(), results.get()] == [0, 0]
+    assert snapshot.read() == (10000, bytes([10000 % 256]) * (10000 % 1024))
+    snapshot.free()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import pytest
@@ -79,6 +80,268 @@ def test_get_table_rows():
         ret = requests.post(url, json=args)
         logger.info(ret.text)
 
+def test_response_cache():
+    from ipyeos.node.response_cache import ResponseCache
+    cache = ResponseCache(100)
+    cache.set_head('1')
+    generation = cache.get_generation()
+    assert cache.get(b'a') is None
+    assert cache.put(b'a', 'x'*39, generation)
+    assert cache.put(b'b', 'x'*39, generation)
+    assert cache.get(b'a') == 'x'*39
+    # b is the least recently used entry
+    assert cache.put(b'c', 'x'*39, generation)
+    assert cache.get(b'b') is None
+    assert cache.get(b'c') == 'x'*39
+    assert cache.size == 80
+    assert not cache.put(b'd', 'x'*100, generation)
+
+    stats = cache.get_statistics()
+    assert stats['hits'] == 2 and stats['misses'] == 2
+
+    cache.set_head('1')
+    assert cache.get(b'a') == 'x'*39
+    cache.set_head('2')
+    assert cache.get(b'a') is None
+    assert cache.size == 0
+    # computed before the head changed
+    assert not cache.put(b'a', 'x', generation)
+    assert cache.put(b'a', 'x', cache.get_generation())
+
+    # sizes are counted in encoded bytes
+    cache.clear()
+    assert not cache.put(b'a', '\u00e9'*60, cache.get_generation())
+    assert cache.put(b'a', '\u00e9'*40, cache.get_generation())
+    assert cache.size == 81
+
+@pytest.mark.asyncio
+async def test_chain_executor():
+    from ipyeos.node.chain_executor import ChainExecutor, ChainExecutorBusy, ChainExecutorTimeout
+    executor = ChainExecutor(max_workers=2, max_pending=3, timeout=0.5)
+
+    start = time.monotonic()
+    ret = await asyncio.gather(*[executor.run(time.sleep, 0.2) for _ in range(4)], return_exceptions=True)
+    assert ret[:3] == [None, None, None]
+    assert isinstance(ret[3], ChainExecutorBusy)
+    assert time.monotonic() - start < 0.6
+
+    with pytest.raises(ChainExecutorTimeout):
+        await executor.run(time.sleep, 1.0)
+    # the timed out call still holds its place until it returns
+    assert executor.get_statistics()['pending'] == 1
+    await asyncio.sleep(0.6)
+    assert executor.get_statistics() == {'pending': 0, 'max_pending': 3, 'rejected': 1, 'timeouts': 1}
+
+@pytest.mark.asyncio
+async def test_table_rows_batch(monkeypatch):
+    from ipyeos.bases.read_write_lock import SharedReadWriteLock
+    from ipyeos.node import chain_executor, table_rows_batch
+
+    class FakeApi(object):
+        def __init__(self, lock):
+            self.lock = lock
+        def get_table_rows_ex(self, params, return_json=True):
+            assert self.lock.get_statistics()['readers'] == 1
+            params = json.loads(params)
+            if params['scope'] == 'bad':
+                raise Exception('unknown scope')
+            return json.dumps({'rows': [params['scope']], 'more': False, 'next_key': ''})
+
+    with pytest.raises(ValueError):
+        table_rows_batch.parse_batch(b'{"code": "eosio"}')
+    queries = table_rows_batch.parse_batch(json.dumps([{'code': 'eosio', 'scope': s} for s in ('a', 'bad', 'c')]).encode())
+
+    lock = SharedReadWriteLock()
+    results = table_rows_batch.get_table_rows_batch(FakeApi(lock), queries, lock)
+    assert lock.get_statistics()['read_acquires'] == 1
+    response = table_rows_batch.generate_batch_response(results)
+    ret = json.loads(response.body)
+    assert [r['rows'] for r in ret[::2]] == [['a'], ['c']]
+    assert ret[1]['code'] == 500 and ret[1]['error']['what'] == 'unknown scope'
+
+
+    # a timed out batch stops after the running query and releases the lock
+    class SlowApi(FakeApi):
+        def get_table_rows_ex(self, params, return_json=True):
+            time.sleep(0.2)
+            return super().get_table_rows_ex(params, return_json)
+
+    monkeypatch.setattr(chain_executor, "_read_executor", chain_executor.ChainExecutor(1, 4, 0.3))
+    queries = table_rows_batch.parse_batch(json.dumps([{'code': 'eosio', 'scope': 'a'}] * 10).encode())
+    start = time.monotonic()
+    with pytest.raises(chain_executor.ChainExecutorTimeout):
+        await table_rows_batch.run_table_rows_batch(SlowApi(lock), queries, lock)
+    await asyncio.sleep(0.3)
+    assert time.monotonic() - start < 1.0
+    assert chain_executor.get_read_executor().get_statistics()['pending'] == 0
+    assert lock.get_statistics()['readers'] == 0
+    lock.free()
+
+@pytest.mark.asyncio
+async def test_table_stream(monkeypatch):
+    from ipyeos.bases.read_write_lock import SharedReadWriteLock
+    from ipyeos.node import table_stream
+
+    keys = list(range(25))
+    class FakeApi(object):
+        def get_table_rows_ex(self, params, return_json=True):
+            params = json.loads(params)
+            lower = int(params.get('lower_bound') or 0)
+            upper = int(params.get('upper_bound') or keys[-1])
+            rows = [k for k in keys if lower <= k <= upper]
+            if params.get('reverse'):
+                rows.reverse()
+            more = len(rows) > params['limit']
+            result = {'rows': [{'key': k} for k in rows[:params['limit']]], 'more': more, 'next_key': str(rows[params['limit']]) if more else ''}
+            return json.dumps(result)
+
+    async def read_stream(params, rwlock=None):
+        response = table_stream.stream_table_rows(FakeApi(), table_stream.parse_params(json.dumps(params).encode()), rwlock)
+        lines = [line async for line in response.body_iterator]
+        return [json.loads(line)['key'] for line in ''.join(lines).splitlines()]
+
+    monkeypatch.setattr(table_stream, 'default_rpc_stream_page_size', 10)
+    lock = SharedReadWriteLock()
+    assert await read_stream({'code': 'eosio', 'limit': 100}, lock) == keys
+    # one read lock per page
+    assert lock.get_statistics()['read_acquires'] == 3
+    assert await read_stream({'code': 'eosio', 'limit': 12, 'lower_bound': '5'}) == keys[5:17]
+    assert await read_stream({'code': 'eosio', 'limit': 100, 'reverse': True}) == keys[::-1]
+    with pytest.raises(ValueError):
+        table_stream.parse_params(b'[]')
+    lock.free()
+
+def test_table_rows_binary(monkeypatch):
+    import struct
+    from ipyeos.bases.packer import pack_length
+    from ipyeos.node import table_rows_binary
+
+    class FakeTableId(object):
+        table_id = 7
+
+    class FakeTableIdObjectIndex(object):
+        def __init__(self, db):
+            pass
+        def find_by_code_scope_table(self, code, scope, table):
+            return FakeTableId() if (code, scope, table) == ('hello', 'alice', 'counter') else None
+
+    # raw key_value_objects in by_scope_primary order, the next table follows
+    objects = [struct.pack('<qqQQ', i, 7, i * 10, 100 + i) + pack_length(i) + bytes([i]) * i for i in range(5)]
+    objects.append(struct.pack('<qqQQ', 5, 8, 0, 0) + pack_length(0))
+    class FakeKeyValueObjectIndex(object):
+        def __init__(self, db):
+            pass
+        def walk_range_by_scope_primary(self, lower_bound, upper_bound, cb, user_data=None, raw_data=False):
+            assert raw_data and lower_bound[0] == upper_bound[0] == 7
+            for raw in objects:
+                if struct.unpack_from('<QQ', raw, 8) >= lower_bound and not cb(raw, user_data):
+                    break
+
+    monkeypatch.setattr(table_rows_binary, 'TableIdObjectIndex', FakeTableIdObjectIndex)
+    monkeypatch.setattr(table_rows_binary, 'KeyValueObjectIndex', FakeKeyValueObjectIndex)
+
+    def parse_rows(rows):
+        ret = []
+        pos = 0
+        while pos < len(rows):
+            primary_key, payer, size = table_rows_binary.row_header.unpack_from(rows, pos)
+            pos += table_rows_binary.row_header.size
+            ret.append((primary_key, payer, rows[pos:pos + size]))
+            pos += size
+        return ret
+
+    params = table_rows_binary.parse_params(b'{"code": "hello", "scope": "alice", "table": "counter", "lower_bound": "10", "limit": 2}')
+    rows, more, next_key = table_rows_binary.get_table_rows_binary(None, **params)
+    assert parse_rows(rows) == [(10, 101, b'\x01'), (20, 102, b'\x02\x02')]
+    assert more and next_key == 30
+
+    params['lower_bound'] = next_key
+    params['limit'] = 10
+    rows, more, next_key = table_rows_binary.get_table_rows_binary(None, **params)
+    assert [row[0] for row in parse_rows(rows)] == [30, 40]
+    assert not more
+
+    params['table'] = 'unknown'
+    assert table_rows_binary.get_table_rows_binary(None, **params) == (b'', False, 0)
+    with pytest.raises(ValueError):
+        table_rows_binary.parse_params(b'{"code": "hello"}')
+
+def messenger_echo_worker(messenger):
+    while True:
+        msg = messenger.get()
+        if not msg:
+            break
+        messenger.put(msg + '!')
+
+@pytest.mark.asyncio
+async def test_messenger():
+    import multiprocessing as mp
+    from ipyeos.node.worker import new_messenger_pair
+    messenger, worker_messenger = new_messenger_pair()
+    p = mp.Process(target=messenger_echo_worker, args=(worker_messenger,))
+    p.start()
+    assert messenger.get_timeout(0.1) is None
+    # concurrent requests get their own replies
+    ret = await asyncio.gather(*[messenger.request(f'get_info{i}') for i in range(10)])
+    assert ret == [f'get_info{i}!' for i in range(10)]
+    messenger.put(None)
+    p.join()
+
+def test_chain_info_snapshot():
+    import pickle
+    from ipyeos.node.chain_info import ChainInfoSnapshot
+    info = {
+        'server_version': 'd133c641',
+        'chain_id': '8a34ec7df1b8cd06ff4a8abbaa7cc50300823350cadc59ab296cb00d104d2b8f',
+        'head_block_num': 100,
+        'last_irreversible_block_num': 99,
+        'last_irreversible_block_id': '00000063' + '11' * 28,
+        'head_block_id': '00000064' + '22' * 28,
+        'head_block_time': '2023-01-01T00:00:50.000',
+        'head_block_producer': 'eosio',
+        'virtual_block_cpu_limit': 200000000,
+        'virtual_block_net_limit': 1048576000,
+        'block_cpu_limit': 199900,
+        'block_net_limit': 1048576,
+        'server_version_string': 'v3.1.0',
+        'fork_db_head_block_num': 100,
+        'fork_db_head_block_id': '00000064' + '22' * 28,
+        'server_full_version_string': 'v3.1.0-d133c6413ce8ce2e96096a0513ec25b4a8dbe837',
+        'total_cpu_weight': '10000000000000',
+        'total_net_weight': 0,
+        'earliest_available_block_num': 1,
+        'last_irreversible_block_time': '2023-01-01T00:00:49.500',
+    }
+    snapshot = ChainInfoSnapshot()
+    assert snapshot.get_info() is None
+    assert snapshot.publish(json.dumps(info)) == 1
+    # a worker process receives a pickled snapshot
+    reader = pickle.loads(pickle.dumps(snapshot))
+    assert json.loads(reader.get_info()) == info
+    assert reader.read() == (1, info)
+
+    del info['earliest_available_block_num']
+    info['head_block_num'] = 101
+    snapshot.publish(json.dumps(info))
+    assert json.loads(reader.get_info()) == info
+
+    # published as JSON text if a string does not fit or a field is unknown
+    info['server_full_version_string'] = 'v' * 200
+    raw = json.dumps(info)
+    snapshot.publish(raw)
+    assert reader.get_info() == raw
+    assert reader.read() == (3, info)
+    del info['server_full_version_string']
+    info['new_field'] = 1
+    snapshot.publish(json.dumps(info))
+    assert json.loads(reader.get_info()) == info
+    del info['new_field']
+    snapshot.publish(json.dumps(info))
+    assert json.loads(reader.get_info()) == info
+    assert len(snapshot.snapshot.read()[1]) < 1024
+    reader.free()
+    snapshot.free()
+
 def test_push_transaction():
     port = 8820
     ret = requests.get(f'http://127.0.0.1:{port}/v1/chain/get_info')
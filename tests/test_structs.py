@@ -16,3 +16,41 @@ def test_transfer():
     dec = Decoder(enc.get_bytes())
     t2 = Transfer.unpack(dec)
     assert t == t2
+
+def test_struct_codec():
+    from ipyeos.bases.codec import StructCodec
+    from ipyeos.bases.types import I64, U32, U64, U128, Checksum256, PublicKey, Signature
+    from ipyeos.core import database
+    from ipyeos.core.database_objects import ResourceUsageObject, UsageAccumulator
+
+    # nested fixed width structs are packed with one struct.Struct
+    assert [st.format for st in ResourceUsageObject.codec.structs] == ['<QIQQIQQQ', '<qQIQQIQQQ']
+
+    obj = ResourceUsageObject(7, 'alice', UsageAccumulator(1, 2, 3), UsageAccumulator(4, 5, 6), 1024)
+    enc = Encoder()
+    assert obj.pack(enc) == 8 + 20 + 20 + 8
+    raw = enc.get_bytes()
+    assert raw[:8] == eos.s2b('alice')
+    obj2 = ResourceUsageObject.unpack(Decoder(int.to_bytes(7, 8, 'little') + raw))
+    assert obj2 == obj
+    assert obj2.table_id == 7
+
+    msg = HandshakeMessage(
+        network_version=0x04b5 + 7,
+        chain_id=Checksum256(bytes(range(32))),
+        node_id=Checksum256(bytes(32)),
+        key=PublicKey.empty(),
+        time=int(time.time()*1e9),
+        token=Checksum256.empty(),
+        sig=Signature(bytes(66)),
+        p2p_address='127.0.0.1:9876',
+        last_irreversible_block_num=1000,
+        last_irreversible_block_id=Checksum256(bytes(32)),
+        head_num=1100,
+        head_id=Checksum256(bytes(32)),
+        os='linux',
+        agent='ipyeos',
+        generation=1,
+    )
+    raw = msg.pack_message()
+    assert HandshakeMessage.unpack_bytes(memoryview(raw)[5:]) == msg
@@ -33,6 +33,21 @@ def test_name():
     end = time.monotonic()
     logger.info("%s", count/(end - start))
 
+def test_names():
+    from ipyeos.bases import names
+    ss = ['', 'a', 'eosio', 'eosio.token', 'hello', 'zzzzzzzzzzzzj', '.a', 'eosio', 'a.b.c']
+    ns = [eos.s2n(s) for s in ss]
+    assert names.s2n_array(ss).tolist() == ns
+    assert names.n2s_array(ns) == [eos.n2s(n) for n in ns]
+    assert names.n2s(eos.s2n('eosio')) is names.n2s(eos.s2n('eosio'))
+    assert names.b2s(names.s2b('eosio.token')) == 'eosio.token'
+    for s in ['A', 'eosio.', 'zzzzzzzzzzzzz', 'a' * 14, 'eosio6']:
+        try:
+            names.s2n_array(['eosio', s])
+            assert False, s
+        except Exception as e:
+            assert 'invalid name' in str(e)
+
 def test_checksum256():
     a = Checksum256(b'\x00' * 32)
     print(a.to_string())
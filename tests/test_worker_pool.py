@@ -0,0 +1,73 @@
+import multiprocessing as mp
+import socket
+import time
+
+from ipyeos.node.worker_pool import WorkerPool, WorkerStatistics, new_reuse_port_socket
+
+def fake_worker(statistics, exit_event, load):
+    while not exit_event.wait(0.05):
+        statistics.publish(load.value, 0.1, 0)
+
+def wait_for(condition, timeout=5.0):
+    start = time.monotonic()
+    while not condition():
+        assert time.monotonic() - start < timeout, 'timeout'
+        time.sleep(0.05)
+
+def test_worker_pool():
+    load = mp.Value('d', 0.1)
+    def start_worker(rpc_address, statistics):
+        exit_event = mp.Event()
+        p = mp.Process(target=fake_worker, args=(statistics, exit_event, load))
+        p.start()
+        return p, None, exit_event
+
+    pool = WorkerPool('127.0.0.1:8810', start_worker, min_workers=1, max_workers=3, interval=0.2)
+    assert pool.start()
+    # busy workers
+    wait_for(lambda: len(pool.workers) == 3)
+    assert pool.get_statistics()['latency'] > pool.scale_up_latency
+
+    pool.workers[0].process.kill()
+    wait_for(lambda: pool.restarts == 1)
+    assert len(pool.workers) == 3
+
+    # idle workers
+    load.value = 0.0
+    wait_for(lambda: len(pool.workers) == 1)
+    pool.stop()
+    assert not pool.workers
+
+def test_worker_pool_min_workers():
+    load = mp.Value('d', 0.0)
+    failures = [1]
+    def start_worker(rpc_address, statistics):
+        # the restart of the crashed worker fails once
+        if len(processes) == 2 and failures:
+            failures.pop()
+            return None
+        exit_event = mp.Event()
+        p = mp.Process(target=fake_worker, args=(statistics, exit_event, load))
+        p.start()
+        processes.append(p)
+        return p, None, exit_event
+
+    processes = []
+    pool = WorkerPool('127.0.0.1:8811', start_worker, min_workers=2, max_workers=3, interval=0.2)
+    assert pool.start()
+    pool.workers[0].process.kill()
+    wait_for(lambda: len(processes) == 3)
+    assert not failures
+    assert len(pool.workers) == 2
+    pool.stop()
+
+def test_reuse_port_socket():
+    sock1 = new_reuse_port_socket('127.0.0.1', 0)
+    port = sock1.getsockname()[1]
+    sock2 = new_reuse_port_socket('127.0.0.1', port)
+    sock1.listen()
+    sock2.listen()
+    with socket.create_connection(('127.0.0.1', port)):
+        pass
+    sock1.close()
+    sock2.close()